@@ -14,7 +14,8 @@ from typing import Any, Dict, List, Optional, Union
 import pandas as pd
 
 from legacy.reader import Reader
-from xds.utils import df_pytypes, icf, xlate, xlation_map
+from xds.utils import df_pytypes, icf, xlate, xlate_index, xlation_map
+from xds.utils.tracing import current_span, traced
 
 
 class DSExtra:
@@ -39,7 +40,7 @@ class DSExtra:
         self.df = refs['df']
         self.children = refs['children']
 
-        self.xlations = xlation_map(self.df.columns)
+        self.xlations = refs['xlations']
         if self.xlations.get('var'):
             del self.xlations['var']
 
@@ -60,11 +61,11 @@ class DSExtra:
 
     def _to_df(self, data: SourceTypeVar) -> None:
         xp, xdf = Reader().to_df(data)
-        xlations = xlation_map(list(xdf.columns))
-        xdf.columns = [xlations['var'].get(col) for col in xdf.columns]
+        xdf.columns = xlate_index(xdf.columns)
         self.protocol: str = xp
         self._odf: pd.DataFrame = xdf
 
+    @traced('dsextra.xdf')
     def _xdf(
         self,
         keys: Optional[List[str]] = None,
@@ -74,9 +75,9 @@ class DSExtra:
             children = {}
         if keys is None:
             keys = []
+        schema = df_pytypes(self._odf)
         df: pd.DataFrame = self._odf.copy()
         self.keys = [xlate(var)[0] for var in keys]
-        schema = df_pytypes(df)
         nested = [col for col, ptype in schema.items() if ptype == 'pd']
         for col, ptype in schema.items():
             if ptype == 'datex':
@@ -107,11 +108,14 @@ class DSExtra:
 
         for child in nested:
             df.drop(child, axis=1, inplace=True)
+        current_span().set_attributes(
+            keys=','.join(self.keys), rows=len(df), children=len(nodes)
+        )
 
         return {
-            'schema': df_pytypes(df),
+            'schema': {c: t for c, t in schema.items() if c in df.columns},
             'df': df,
-            'xlations': xlation_map(list(df.columns)),
+            'xlations': xlation_map(df.columns),
             'children': nodes,
             'kv': df.to_dict(orient='index'),
         }
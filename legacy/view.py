@@ -1,6 +1,7 @@
 import base64
 import io
-from typing import Any, Callable, Dict, List, Optional, Tuple
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple
 
 import matplotlib.pyplot as plt
 import numpy as np
@@ -8,24 +9,42 @@ import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 import seaborn as sns
-from jinja2 import Environment, Template
 
-from legacy.ds_extras import DSExtra
-from xds.utils.helpers import is_pivot
-from xds.utils.io import io_buffer
+from xds.utils.helpers import is_pivot, jinja_env
+from xds.utils.io import io_buffer, parser
 from xds.utils.logger import ic
+from xds.utils.metrics import METRICS
+from xds.utils.tracing import TRACER
+
+if TYPE_CHECKING:
+    from jinja2 import Template
+    from pandas.io.formats.style import Styler
+
+    from legacy.ds_extras import DSExtra
+
+RENDER_SECS = METRICS.histogram('xds_view_render_seconds', 'View render time')
+ELEMENT_SECS = METRICS.histogram(
+    'xds_view_element_seconds', 'View element build time', ('kind',)
+)
 
 
 class View:
-    def __init__(self, report_spec: str, ds: DSExtra):
-        self.spec: Dict[str, Any] = io_buffer(report_spec)
+    def __init__(self, report_spec: str, ds: 'DSExtra'):
+        buffer = io_buffer(file=report_spec)
+        self.spec: Dict[str, Any] = parser(buffer=buffer)
         self.df: pd.DataFrame = ds.df_humanized
-        self.jenv: Environment = Environment()
         sns.set_theme(style='darkgrid')
 
     def render(self, jtmpl: str) -> str:
+        with RENDER_SECS.time(), TRACER.span('view.render', template=jtmpl):
+            return self._render(jtmpl)
+
+    def _render(self, jtmpl: str) -> str:
         layout = 'layout'
-        template: Template = self.jenv.from_string(str(io_buffer(jtmpl)))
+        tpath = Path(jtmpl)
+        template: 'Template' = jinja_env(str(tpath.parent)).get_template(
+            tpath.name
+        )
         names = [i['name'] for i in self.spec[layout]]
         elements = {}
         items: List[Tuple[str, Callable[[Dict[str, Any]], Any]]] = [
@@ -36,7 +55,7 @@ class View:
         for k, v in items:
             if self.spec.get(k):
                 elements[k] = {
-                    name: v(spc)
+                    name: self._element(k, name, v, spc)
                     for name, spc in self.spec[k].items()
                     if name in names
                 }
@@ -58,6 +77,13 @@ class View:
             layout=self.spec[layout],
         )
 
+    def _element(self, kind: str, name: str, build: Callable, spec: Any) -> Any:
+        with (
+            ELEMENT_SECS.labels(kind).time(),
+            TRACER.span('view.element', kind=kind, element=name),
+        ):
+            return build(spec)
+
     def _df_pivot(self, spec: Dict[str, Any]) -> pd.DataFrame:
         return pd.pivot_table(self.df, **spec)
 
@@ -306,7 +332,7 @@ class View:
 
     def df_style(
         self, df: pd.DataFrame, is_table: bool = False
-    ) -> pd.io.formats.style.Styler:
+    ) -> 'Styler':
         def _color_negative_red(val: Any) -> str:
             return f"color: {'red' if val < 0 else 'black'}"
 
@@ -0,0 +1,178 @@
+import operator
+from datetime import date, datetime
+from functools import reduce
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+
+from xds.utils.logger import log
+from xds.utils.metrics import METRICS
+from xds.utils.predicates import TEXT_PATTERNS, Tree, predicate
+from xds.utils.storage import is_local, resolve
+from xds.utils.tracing import TRACER
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.dataset as pads
+    from pyarrow.fs import LocalFileSystem
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+
+FORMATS = {
+    '.parquet': 'parquet',
+    '.pq': 'parquet',
+    '.arrow': 'ipc',
+    '.ipc': 'ipc',
+    '.feather': 'ipc',
+}
+HEAD_ROWS = 10
+
+SCANNED = METRICS.counter(
+    'xds_arrow_rows_scanned_total', 'Rows read by Arrow DS proxies', ('ns',)
+)
+
+
+class DSArrow:
+    # Columnar DS over local Parquet/Arrow IPC files or hive-partitioned
+    # directories. Nothing is read until asked for: scans project columns and
+    # push predicates down to partitions and row-group statistics, and IPC
+    # files are memory-mapped so their buffers are zero-copy.
+    reload_on = ('ns', 'uri', 'columns', 'format')
+    exports = ('df', 'scan', 'filter', 'stats', 'create')
+
+    def __init__(self, **kwargs):
+        if pa is None:
+            raise ImportError('DSArrow requires pyarrow')
+        self.kwargs = kwargs
+        self.ns = kwargs.get('ns')
+        self.columns: Optional[List[str]] = kwargs.get('columns')
+        self.path = _local_path(kwargs.get('uri'))
+        self.dataset = _dataset(self.path, kwargs.get('format'))
+        self._df: Optional[pd.DataFrame] = None
+
+    @classmethod
+    def create(cls, **kwargs):
+        log.debug('Calling proxy create with args: {}', kwargs)
+        return cls(**kwargs)
+
+    @property
+    def df(self) -> pd.DataFrame:
+        if self._df is None:
+            self._df = self.scan()
+        return self._df
+
+    def scan(
+        self,
+        columns: Optional[List[str]] = None,
+        condition: Any = None,
+        limit: Optional[int] = None,
+    ) -> pd.DataFrame:
+        columns = columns or self.columns
+        pred = predicate(condition) if condition is not None else None
+        expr = None
+        if pred is not None and pred.tree is not None:
+            missing = pred.columns - set(self.dataset.schema.names)
+            if missing:
+                raise ValueError(f'Unknown columns {sorted(missing)} in {pred}')
+            expr = _expression(pred.tree, self.dataset.schema)
+        post = pred if pred is not None and expr is None else None
+        read = None if post is not None else columns
+        with TRACER.span(
+            'ds.scan', ns=self.ns, pushdown=expr is not None
+        ) as span:
+            if limit is not None and post is None:
+                table = self.dataset.head(limit, columns=read, filter=expr)
+            else:
+                table = self.dataset.to_table(columns=read, filter=expr)
+            span.set_attribute('rows', table.num_rows)
+        SCANNED.labels(self.ns).inc(table.num_rows)
+        df = table.to_pandas()
+        if post is None:
+            return df
+        df = df[post(df)]
+        if columns:
+            df = df[columns]
+        return df if limit is None else df.head(limit)
+
+    def filter(self, condition):
+        if callable(condition):
+            return self.df[self.df.apply(condition, axis=1)]
+        return self.scan(condition=condition)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'rows': self.dataset.count_rows(),
+            'columns': self.dataset.schema.names,
+            'files': len(self.dataset.files),
+            'head': self.scan(limit=HEAD_ROWS),
+        }
+
+
+def _local_path(uri: Optional[str]) -> Path:
+    if not uri:
+        raise ValueError('DSArrow requires a uri')
+    if not is_local(uri):
+        raise ValueError(f'DSArrow only reads local files, got {uri}')
+    return Path(resolve(uri)[1]).resolve()
+
+
+def _dataset(path: Path, fmt: Optional[str]) -> Any:
+    if not path.exists():
+        raise FileNotFoundError(f'{path} not found')
+    return pads.dataset(
+        str(path),
+        format=fmt or _format(path),
+        partitioning='hive',
+        filesystem=LocalFileSystem(use_mmap=True),
+    )
+
+
+def _format(path: Path) -> str:
+    files = sorted(path.rglob('*')) if path.is_dir() else [path]
+    fmt = next((FORMATS[f.suffix] for f in files if f.suffix in FORMATS), None)
+    if fmt is None:
+        raise ValueError(f'No Parquet or Arrow files found at {path}')
+    return fmt
+
+
+def _expression(tree: Tree, schema: Any) -> Any:
+    kind, *args = tree
+    if kind == 'not':
+        return ~_expression(args[0], schema)
+    if kind in ('and', 'or'):
+        combine = operator.and_ if kind == 'and' else operator.or_
+        return reduce(combine, [_expression(t, schema) for t in args[0]])
+    # Settle nulls before any not/and/or the way pandas does: a null compares
+    # unequal to everything and matches nothing else.
+    return pc.coalesce(_clause(*args, schema), pa.scalar(args[1] == 'ne'))
+
+
+def _clause(column: str, op: str, value: Any, schema: Any) -> Any:
+    field = pc.field(column)
+    ftype = schema.field(column).type
+    value = _coerce(ftype, value)
+    if op in TEXT_PATTERNS:
+        if not pa.types.is_string(ftype):
+            field = field.cast(pa.string())
+        return pc.match_substring_regex(
+            field, pattern=TEXT_PATTERNS[op].format(value)
+        )
+    if op == 'range':
+        return (field >= value[0]) & (field <= value[1])
+    if op in ('in', 'enum'):
+        return field.isin(value if isinstance(value, list) else [value])
+    return getattr(operator, op)(field, value)
+
+
+def _coerce(ftype: Any, value: Any) -> Any:
+    if isinstance(value, list):
+        return [_coerce(ftype, v) for v in value]
+    if not isinstance(value, str):
+        return value
+    if pa.types.is_date(ftype):
+        return date.fromisoformat(value)
+    if pa.types.is_timestamp(ftype):
+        return datetime.fromisoformat(value)
+    return value
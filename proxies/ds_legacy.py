@@ -1,28 +1,52 @@
+import weakref
+from typing import Iterator
+
 import pandas as pd
-from icecream import ic
 
-from tests.df_mocks_fixtures import FAKE_DFS
+from xds.core import protocols
+from xds.core.datasets import DATASETS
+from xds.core.protocols import CHUNK_ROWS
+from xds.utils.helpers import fingerprint
+from xds.utils.logger import log
+from xds.utils.metrics import METRICS
+from xds.utils.predicates import predicate
+from xds.utils.tracing import TRACER
+
+FRAMES = METRICS.gauge('xds_ds_frames', 'DataFrames held by DS proxies')
+LOAD_SECS = METRICS.histogram('xds_ds_load_seconds', 'DS load time', ('ns',))
+ROWS = METRICS.counter('xds_ds_rows_loaded_total', 'DS rows loaded', ('ns',))
+LOAD_OPTIONS = ('rows', 'chunksize', 'dtypes', 'columns')
 
 
 class DSLegacy:
+    reload_on = ('ns', 'uri', *LOAD_OPTIONS)
+    exports = ('df', 'chunks', 'increment', 'filter', 'stats', 'create')
+
     def __init__(self, **kwargs):
         self.kwargs = kwargs
-        self.df = self._mock_df(**kwargs)
-        self.exports = [
-            'df',
-            'increment',
-            'filter',
-            'stats',
-            'create',
-        ]
+        ns = kwargs.get('ns')
+        self.uri = self._uri(**kwargs)
+        self.options = {k: kwargs[k] for k in LOAD_OPTIONS if kwargs.get(k)}
+        self.key = (
+            self.uri,
+            protocols.version(self.uri),
+            fingerprint(self.options),
+        )
+        with TRACER.span('ds.load', ns=ns, nsid=kwargs.get('nsid')) as span:
+            self.df = DATASETS.get(self.key, lambda: self._load(ns))
+            span.set_attribute('rows', len(self.df))
+        FRAMES.inc()
+        weakref.finalize(self, FRAMES.dec)
 
     @classmethod
     def create(cls, **kwargs):
-        ic(f'Calling proxy Create with args: {kwargs}')
+        log.debug('Calling proxy create with args: {}', kwargs)
         return cls(**kwargs)
 
     def filter(self, condition):
-        return self.df[self.df.apply(condition, axis=1)]
+        if callable(condition):
+            return self.df[self.df.apply(condition, axis=1)]
+        return self.df[predicate(condition)(self.df)]
 
     def stats(self):
         return {
@@ -32,23 +56,37 @@ class DSLegacy:
         }
 
     def save(self, **kwargs):
-        ic(f'Saving DF and adding {kwargs}')
+        log.debug('Saving DF and adding {}', kwargs)
         return self.df
 
     def delete(self, **kwargs):
-        ic(f'Deleting DF and adding {kwargs}')
+        log.debug('Deleting DF and adding {}', kwargs)
         return self.df
 
     def increment(self):
-        self.df['processed'] = self.df['storypoint'] * 2
+        # Frames are shared through DATASETS: assign, never write in place.
+        self.df = self.df.assign(processed=self.df['storypoint'] * 2)
         return self.df
 
-    def _mock_df(self, **kwargs) -> pd.DataFrame:
-        ns = kwargs.get('ns', None)
+    def chunks(self, chunksize: int = CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+        return protocols.chunks(
+            self.uri, **{**self.options, 'chunksize': chunksize}
+        )
+
+    def _load(self, ns: str) -> pd.DataFrame:
+        with LOAD_SECS.labels(ns).time():
+            df = protocols.load(self.uri, **self.options)
+        ROWS.labels(ns).inc(len(df))
+        return df
+
+    @staticmethod
+    def _uri(**kwargs) -> str:
+        # txf mocks are keyed by namespace; the blueprint's txf uri is only a
+        # placeholder default.
+        ns = kwargs.get('ns')
         if ns is None:
             raise ValueError('Namespace for DS not provided')
-        ns_df = FAKE_DFS.get(ns)
-        if ns_df is None:
-            raise ValueError(f'No DS could be found for {ns_df}')
-        df = ns_df(kwargs.get('rows', 50))
-        return df
+        uri = kwargs.get('uri')
+        if not uri or uri.startswith('txf://'):
+            return f'txf://{ns}'
+        return uri
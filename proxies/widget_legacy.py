@@ -1,14 +1,15 @@
-from icecream import ic
+from xds.utils.logger import log
 
 
 class WidgetLegacy:
+    exports = ('render',)
+
     def __init__(self, **kwargs):
         self.kwargs = kwargs
-        self.exports = ['render']
 
     @classmethod
     def create(cls, **kwargs):
-        ic(f'Calling proxy Create with args: {kwargs}')
+        log.debug('Calling proxy create with args: {}', kwargs)
         return cls(**kwargs)
 
     def render(self, condition):
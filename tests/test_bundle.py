@@ -0,0 +1,67 @@
+from datetime import date, datetime
+
+import pytest
+
+from xds.core.dynamo import BLUEPRINTS, CONFIGS, Dynamo
+from xds.utils import bundle
+from xds.utils.bundle import build_bundle, catalogue_entries, load_bundle
+from xds.utils.helpers import SingletonMeta
+
+
+@pytest.fixture
+def bundle_file(tmp_path):
+    path = tmp_path / 'catalogue.xdsb'
+    build_bundle(path, BLUEPRINTS, CONFIGS, version='1.2')
+    return path
+
+
+def test_bundle_roundtrip(bundle_file):
+    bundle = load_bundle(bundle_file)
+    assert bundle.version == '1.2'
+    assert dict(bundle) == catalogue_entries(BLUEPRINTS, CONFIGS)
+    assert bundle['envs/bootstrap']['kind'] == 'Env'
+    assert bundle['models/ds'] is not bundle['models/ds']
+
+
+def test_bundle_rejects_tampering(bundle_file):
+    raw = bytearray(bundle_file.read_bytes())
+    raw[-2] ^= 0xFF
+    bundle_file.write_bytes(bytes(raw))
+    with pytest.raises(ValueError, match='hash mismatch'):
+        load_bundle(bundle_file)
+
+
+def test_dynamo_boots_from_bundle(bundle_file, monkeypatch):
+    monkeypatch.setattr(SingletonMeta, '_instances', {})
+    dynamo = Dynamo(bundle=str(bundle_file))
+    assert dynamo.env.ns == 'Env/bootstrap'
+    assert dynamo.model('DS')
+
+
+def test_bundle_keeps_yaml_timestamps(tmp_path):
+    models, configs = tmp_path / 'models', tmp_path / 'configs'
+    models.mkdir()
+    configs.mkdir()
+    (models / 'dated.yaml').write_text(
+        'kind: Dated\nasof: 2024-11-10\nstamp: 2024-11-10 09:30:00\n'
+        'dates:\n  - 2024-01-31\n'
+    )
+    (configs / 'env.test.yaml').write_text('kind: Env\n')
+    path = tmp_path / 'dated.xdsb'
+    build_bundle(path, str(models), str(configs))
+    bundle = load_bundle(path)
+    assert bundle['models/dated'] == {
+        'kind': 'Dated',
+        'asof': date(2024, 11, 10),
+        'stamp': datetime(2024, 11, 10, 9, 30),
+        'dates': [date(2024, 1, 31)],
+        'path': str(models / 'dated.yaml'),
+    }
+
+
+def test_bundle_rejects_non_yaml_entries(tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        bundle, 'catalogue_entries', lambda *_: {'models/x': {'x': object()}}
+    )
+    with pytest.raises(ValueError, match='models/x is not YAML/JSON data'):
+        build_bundle(tmp_path / 'bad.xdsb', 'models', 'configs')
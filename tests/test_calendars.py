@@ -0,0 +1,110 @@
+from datetime import date
+
+import numpy as np
+import pytest
+
+from xds.utils.calendars import (
+    CALENDARS,
+    CALENDARS_FILE,
+    BusinessCalendar,
+    Calendars,
+    calendar,
+)
+from xds.utils.dates import date_modifier, date_modifier_vec
+from xds.utils.io import parser
+
+
+@pytest.fixture
+def us() -> BusinessCalendar:
+    return calendar('us')
+
+
+@pytest.mark.parametrize(
+    ('op', 'args', 'expected'),
+    [
+        ('next', ('2024-07-04',), date(2024, 7, 5)),
+        ('next', ('2024-07-05',), date(2024, 7, 5)),
+        ('prev', ('2024-07-04',), date(2024, 7, 3)),
+        ('prev', ('2024-07-07',), date(2024, 7, 5)),
+        ('add', ('2024-07-03', 1), date(2024, 7, 5)),
+        ('add', ('2024-07-06', 1), date(2024, 7, 8)),
+        ('add', ('2024-07-06', -1), date(2024, 7, 5)),
+        ('add', ('2024-07-06', 0), date(2024, 7, 8)),
+        ('add', ('2024-12-20', 5), date(2024, 12, 30)),
+        ('count', ('2024-07-01', '2024-07-08'), 4),
+        ('count', ('2024-07-08', '2024-07-01'), -4),
+        ('is_busday', ('2024-07-04',), False),
+        ('is_busday', ('2024-07-05',), True),
+    ],
+)
+def test_calendar_scalars(us, op, args, expected):
+    assert getattr(us, op)(*args) == expected
+
+
+def test_calendar_arrays(us):
+    days = np.array(['2024-12-24', 'NaT', '2024-11-28'], dtype='M8[D]')
+    shifted = us.add(days, 2)
+    assert [str(d) for d in shifted] == ['2024-12-27', 'NaT', '2024-12-02']
+    ends = np.array(['2024-12-31', '2024-12-31', '2024-12-31'], dtype='M8[D]')
+    counts = us.count(days, ends)
+    assert counts[0] == 4  # noqa: PLR2004
+    assert np.isnan(counts[1])
+    assert list(us.is_busday(days)) == [True, False, False]
+    np.testing.assert_array_equal(
+        us.next(days[[0, 2]]),
+        np.busday_offset(days[[0, 2]], 0, 'forward', holidays=us.holidays),
+    )
+
+
+def test_calendars_registry(tmp_path):
+    cfg = tmp_path / 'calendars.yaml'
+    cfg.write_text(
+        'kind: Calendars\n'
+        'calendars:\n'
+        '  mideast:\n'
+        '    weekmask: Sun Mon Tue Wed Thu\n'
+        '    holidays: [2024-04-10]\n'
+    )
+    cals = Calendars(str(cfg))
+    assert cals.names == ['mideast']
+    assert cals['mideast'] is cals['mideast']
+    assert cals['mideast'].next('2024-04-12') == date(2024, 4, 14)
+    with pytest.raises(ValueError, match='Unknown calendar'):
+        cals['us']
+    with pytest.raises(ValueError, match='outside calendar'):
+        cals['mideast'].next('1900-01-01')
+
+
+@pytest.mark.parametrize(
+    ('modifier', 'base', 'cal', 'expected'),
+    [
+        ('-2B', '2024-07-06', None, '2024-07-04'),
+        ('-2B', '2024-07-06', 'us', '2024-07-03'),
+        ('BD+3', '2024-12-22', 'us', '2024-12-26'),
+        ('BD+3', '2024-12-22', 'uk', '2024-12-27'),
+    ],
+)
+def test_date_modifier_calendar(modifier, base, cal, expected):
+    assert date_modifier(modifier, base, calendar=cal) == expected
+    vec = date_modifier_vec(modifier, [base], calendar=cal)
+    assert str(vec[0]) == expected
+
+
+def test_date_modifier_sees_calendar_reload():
+    spec = {'calendars': {'c': {'holidays': []}}}
+    CALENDARS.load(spec)
+    try:
+        assert date_modifier('T+B', '2024-07-04', calendar='c') == '2024-07-04'
+        spec['calendars']['c']['holidays'] = ['2024-07-04']
+        CALENDARS.load(spec)
+        assert CALENDARS['c'].next('2024-07-04') == date(2024, 7, 5)
+        assert date_modifier('T+B', '2024-07-04', calendar='c') == '2024-07-05'
+    finally:
+        CALENDARS.load(parser(CALENDARS_FILE))
+
+
+@pytest.mark.parametrize('name', ['us', 'uk'])
+@pytest.mark.parametrize('day', ['2023-12-29', '2027-01-04'])
+def test_calendar_holiday_coverage(name, day):
+    with pytest.raises(ValueError, match='outside calendar'):
+        calendar(name).next(day)
@@ -0,0 +1,109 @@
+from collections import Counter
+
+import pandas as pd
+import pytest
+
+from xds.core.callables import CALLABLES
+from xds.core.dag import CallableDag
+
+CALLS: Counter = Counter()
+SPECS = {
+    'const': {'value': 'int'},
+    'add': {'a': 'xref=num', 'b': 'xref=num'},
+}
+
+
+@pytest.fixture
+def arith(monkeypatch):
+    def const(value):
+        CALLS['const'] += 1
+        return value
+
+    def add(a, b):
+        CALLS['add'] += 1
+        return a + b
+
+    monkeypatch.setitem(CALLABLES, 'const', const)
+    monkeypatch.setitem(CALLABLES, 'add', add)
+    CALLS.clear()
+    return {
+        'x': {'fn': 'const', 'value': 2},
+        'y': {'fn': 'const', 'value': 3},
+        'xy': {'fn': 'add', 'a': 'x', 'b': 'y'},
+        'total': {'fn': 'add', 'a': 'xy', 'b': 'y'},
+    }
+
+
+def test_dag_runs_and_memoizes(arith):
+    dag = CallableDag(arith, specs=SPECS, workers=2)
+    assert dag.run() == {'x': 2, 'y': 3, 'xy': 5, 'total': 8}
+    assert CALLS == {'const': 2, 'add': 2}
+
+    assert dag.run()['total'] == 8  # noqa: PLR2004
+    assert CALLS == {'const': 2, 'add': 2}
+    assert dag.stats == {'computed': 4, 'memoized': 4}
+
+    dag.update('x', value=10)
+    assert dag.run()['total'] == 16  # noqa: PLR2004
+    assert CALLS == {'const': 3, 'add': 4}
+
+
+@pytest.mark.parametrize(
+    ('pipeline', 'error'),
+    [
+        (
+            {
+                'a': {'fn': 'add', 'a': 'b', 'b': 1},
+                'b': {'fn': 'add', 'a': 'a', 'b': 1},
+            },
+            'cycle',
+        ),
+        ({'a': {'fn': 'nope'}}, 'not registered'),
+        ({'a': {'fn': 'const', 'value': 1, 'extra': 2}}, 'takes no'),
+    ],
+)
+def test_dag_rejects(arith, pipeline, error):
+    with pytest.raises(ValueError, match=error):
+        CallableDag(pipeline, specs=SPECS)
+
+
+@pytest.mark.parametrize(
+    'fn', ['ds_concat', 'ds_render', 'ds_vxform', 'ds_cxform']
+)
+def test_dag_rejects_unimplemented_catalogue_callables(fn):
+    pipeline = {
+        'src': {'fn': 'ds_humanize', 'ds': pd.DataFrame({'a': [1]})},
+        'out': {'fn': fn, 'ds': 'src'},
+    }
+    with pytest.raises(ValueError, match=f'{fn} is not implemented'):
+        CallableDag(pipeline)
+
+
+def test_dag_node_failure(arith):
+    pipeline = {
+        'x': {'fn': 'const', 'value': 'text'},
+        'bad': {'fn': 'add', 'a': 'x', 'b': 1},
+    }
+    with pytest.raises(RuntimeError, match='Node bad failed'):
+        CallableDag(pipeline, specs=SPECS).run()
+
+
+@pytest.mark.parametrize('executor', ['thread', 'process'])
+def test_dag_catalogue_callables(executor):
+    left = pd.DataFrame({'Lob Name': ['RATES', 'FX'], 'Score': [1, 2]})
+    right = pd.DataFrame({'LOB Name': ['RATES'], 'Owner': ['AN']})
+    pipeline = {
+        'human': {'fn': 'ds_humanize', 'ds': left},
+        'joined': {
+            'fn': 'ds_join',
+            'dsl': 'human',
+            'dsr': right,
+            'dslkey': ['LOB Name'],
+            'type': 'strict',
+        },
+    }
+    out = CallableDag(pipeline, executor=executor).run()
+    assert list(out['human'].columns) == ['LOB Name', 'Score']
+    assert out['joined'].to_dict(orient='records') == [
+        {'LOB Name': 'RATES', 'Score': 1, 'Owner': 'AN'}
+    ]
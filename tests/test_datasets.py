@@ -0,0 +1,95 @@
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from proxies import ds_legacy
+from xds.core.datasets import DatasetCache
+from xds.core.protocols import PROTOCOLS
+
+LOADS: Counter = Counter()
+ROWS = 1000
+
+
+def loader(name, rows=ROWS):
+    def load():
+        LOADS[name] += 1
+        return pd.DataFrame({'v': range(rows)})
+
+    return load
+
+
+@pytest.fixture
+def datasets():
+    LOADS.clear()
+    return DatasetCache(budget=10 * ROWS * 8)
+
+
+@pytest.mark.parametrize('cow', [True, False])
+def test_shared_and_isolated(datasets, cow):
+    with pd.option_context('mode.copy_on_write', cow):
+        first = datasets.get('a', loader('a'))
+        second = datasets.get('a', loader('a'))
+        shared = np.shares_memory(first['v'].values, second['v'].values)
+        assert shared == cow
+        first.loc[0, 'v'] = -1
+        first['w'] = 1
+        third = datasets.get('a', loader('a'))
+    assert LOADS == {'a': 1}
+    assert second['v'][0] == third['v'][0] == 0
+    assert list(third.columns) == ['v']
+    assert datasets.peek('a').frame['v'][0] == 0
+
+
+def test_lru_eviction(datasets):
+    for name in 'abcd':
+        datasets.get(name, loader(name, 3 * ROWS))
+    assert datasets.peek('a') is None
+    datasets.get('b', loader('b'))
+    datasets.get('e', loader('e', 3 * ROWS))
+    assert [datasets.peek(k) is not None for k in 'bcde'] == [
+        True,
+        False,
+        True,
+        True,
+    ]
+    stats = datasets.stats()
+    assert stats['resident'] <= stats['budget']
+    datasets.resize(0)
+    assert datasets.stats()['datasets'] == 0
+
+
+def test_oversized_not_admitted(datasets):
+    frame = datasets.get('big', loader('big', 100 * ROWS))
+    assert len(frame) == 100 * ROWS
+    assert datasets.peek('big') is None
+
+
+def test_ds_proxies_share(monkeypatch, datasets):
+    monkeypatch.setattr(ds_legacy, 'DATASETS', datasets)
+    one = ds_legacy.DSLegacy(ns='xait', rows=20)
+    two = ds_legacy.DSLegacy(ns='xait', rows=20)
+    other = ds_legacy.DSLegacy(ns='xait', rows=30)
+    assert one.df.equals(two.df)
+    assert one.df is not two.df
+    with pd.option_context('mode.copy_on_write', False):
+        one.df.loc[0, 'Desk'] = 'ZZZ'
+    assert two.df.loc[0, 'Desk'] != 'ZZZ'
+    assert ds_legacy.DSLegacy(ns='xait', rows=20).df.loc[0, 'Desk'] != 'ZZZ'
+    assert datasets.peek(one.key).frame.loc[0, 'Desk'] != 'ZZZ'
+    assert len(other.df) == 30  # noqa: PLR2004
+    assert datasets.stats()['datasets'] == 2  # noqa: PLR2004
+
+
+def test_ds_increment_leaves_shared_frame(monkeypatch, datasets):
+    monkeypatch.setattr(ds_legacy, 'DATASETS', datasets)
+    PROTOCOLS['memory'].put('sp', pd.DataFrame({'storypoint': [1, 2]}))
+    try:
+        one = ds_legacy.DSLegacy(ns='sp', uri='memory://sp')
+        two = ds_legacy.DSLegacy(ns='sp', uri='memory://sp')
+        assert one.increment()['processed'].tolist() == [2, 4]
+        assert 'processed' not in two.df
+        assert list(datasets.peek(one.key).frame.columns) == ['storypoint']
+    finally:
+        PROTOCOLS['memory'].remove('sp')
@@ -5,7 +5,15 @@ from typing import Any, Dict, List, Tuple
 import pytest
 from icecream import ic
 
-from xds.utils.dates import date_modifier
+import numpy as np
+import pandas as pd
+
+from xds.utils.dates import (
+    DateExpr,
+    as_of,
+    date_modifier,
+    date_modifier_vec,
+)
 
 
 @pytest.mark.parametrize(
@@ -52,3 +60,57 @@ def test_date_patterns(
             f'Failed on {base_date} {test_name}:'
             f'Expected {expected}, Got {date_modifier(modifier, base_date)}'
         )
+
+
+@pytest.mark.parametrize(
+    'modifier',
+    [
+        *('T', '1', '-1', '-2B', 'S', 'ME', '1M', '-13M', '3ME', 'M-1E'),
+        *('BD+5', '2W', 'Q', 'Q1', '3Q', 'YE', 'YS', 'me', 'ys', 'm-1e'),
+    ],
+)
+def test_date_modifier_vec_matches_scalar(modifier: str) -> None:
+    days = pd.date_range('2023-12-25', '2024-03-05', freq='D')
+    isodays = [d.strftime('%Y-%m-%d') for d in days]
+    expected = [date_modifier(modifier, d) for d in isodays]
+    shifted = date_modifier_vec(modifier, np.array(isodays, dtype='M8[D]'))
+    assert [str(d) for d in shifted] == expected
+
+
+def test_date_modifier_vec_series() -> None:
+    col = pd.Series(
+        [pd.Timestamp('2024-11-10'), None], name='Start Date', index=[7, 9]
+    )
+    shifted = date_modifier_vec('-2B', col)
+    assert shifted.name == 'Start Date'
+    assert list(shifted.index) == [7, 9]
+    assert shifted[7] == pd.Timestamp('2024-11-08')
+    assert pd.isna(shifted[9])
+
+
+@pytest.mark.parametrize(
+    ('modifier', 'error'),
+    [
+        ('MSE', 'both E and S'),
+        ('B', 'Invalid period unit'),
+        ('Q5', 'Invalid quarter'),
+        ('1MX', 'Unparsed'),
+        ('XYZ', 'Unparsed'),
+    ],
+)
+def test_date_expr_rejects(modifier: str, error: str) -> None:
+    with pytest.raises(ValueError, match=error):
+        DateExpr.compile(modifier)
+    with pytest.raises(ValueError, match=error):
+        date_modifier_vec(modifier, np.array(['2024-03-16'], dtype='M8[D]'))
+
+
+def test_date_expr_as_of() -> None:
+    expr = DateExpr.compile('3ME')
+    assert expr is DateExpr.compile('3ME')
+    with as_of('2024-11-10') as day:
+        assert expr.iso() == '2025-02-28'
+        assert date_modifier('-2B') == '2024-11-08'
+        assert expr(datetime(2024, 2, 29).date()).isoformat() == '2024-05-31'
+        assert expr() == expr(day)
+    assert expr.vec(['2024-11-10'])[0] == np.datetime64('2025-02-28')
@@ -0,0 +1,104 @@
+import pandas as pd
+import pytest
+
+from proxies.ds_arrow import DSArrow
+from xds.core.fakes import fake_ait_df
+from xds.utils.predicates import predicate
+
+pa = pytest.importorskip('pyarrow')
+pq = pytest.importorskip('pyarrow.parquet')
+feather = pytest.importorskip('pyarrow.feather')
+
+AIT = fake_ait_df(300)
+LIMIT = 200
+
+
+@pytest.fixture(params=['hive', 'parquet', 'ipc'])
+def uri(request, tmp_path):
+    table = pa.Table.from_pandas(AIT, preserve_index=False)
+    if request.param == 'hive':
+        root = tmp_path / 'ait'
+        pq.write_to_dataset(table, root, partition_cols=['Country'])
+        return f'file://{root}'
+    if request.param == 'parquet':
+        path = tmp_path / 'ait.parquet'
+        pq.write_table(table, path, row_group_size=50)
+        return str(path)
+    path = tmp_path / 'ait.arrow'
+    feather.write_feather(table, path, compression='uncompressed')
+    return f'file://{path}'
+
+
+def _sorted(df):
+    cols = sorted(df.columns)
+    return df[cols].sort_values(cols).reset_index(drop=True)
+
+
+@pytest.mark.parametrize(
+    'condition',
+    [
+        {'Country': ['China', 'India'], 'Score': {'gt': LIMIT}},
+        'Country eq Japan or not Score le 0',
+        "Application start 'AIT1' and Desk in RATES,TSY",
+        'Score > 100 and Desk == "LCT"',
+    ],
+)
+def test_filter_pushdown(uri, condition):
+    ds = DSArrow(ns='ait', uri=uri)
+    got = ds.filter(condition)
+    expected = AIT[predicate(condition)(AIT)]
+    assert _sorted(got.astype({'Country': str})).equals(_sorted(expected))
+
+
+@pytest.mark.parametrize(
+    'condition',
+    [
+        'not a gt 2',
+        'a ne 2',
+        'not (a in 1,2 or b has x)',
+        {'not': {'a': {'range': [1, 2]}}},
+    ],
+)
+def test_filter_nulls_match_pandas(tmp_path, condition):
+    df = pd.DataFrame({'a': [1.0, None, 3.0, 2.0], 'b': ['x', None, 'y', 'x']})
+    path = tmp_path / 'nulls.parquet'
+    df.to_parquet(path, index=False)
+    got = DSArrow(ns='n', uri=str(path)).filter(condition)
+    assert got.equals(df[predicate(condition)(df)].reset_index(drop=True))
+
+
+def test_projection_and_stats(uri):
+    ds = DSArrow(ns='ait', uri=uri, columns=['Desk', 'Score'])
+    assert list(ds.df.columns) == ['Desk', 'Score']
+    assert len(ds.df) == len(AIT)
+    scan = ds.scan(columns=['Score'], condition={'Score': {'ge': 0}}, limit=5)
+    assert list(scan.columns) == ['Score']
+    assert len(scan) == 5  # noqa: PLR2004
+    stats = ds.stats()
+    assert stats['rows'] == len(AIT)
+    assert set(stats['columns']) == set(AIT.columns)
+    assert len(stats['head']) == 10  # noqa: PLR2004
+
+
+def test_callable_filter(uri):
+    ds = DSArrow(ns='ait', uri=uri)
+    got = ds.filter(lambda r: r['Score'] > LIMIT)
+    assert len(got) == (AIT['Score'] > LIMIT).sum()
+
+
+@pytest.mark.parametrize(
+    ('kwargs', 'error'),
+    [
+        ({}, 'requires a uri'),
+        ({'uri': 'memory://ait'}, 'only reads local files'),
+        ({'uri': '/no/such/ait.parquet'}, 'not found'),
+    ],
+)
+def test_rejects(kwargs, error):
+    with pytest.raises((ValueError, FileNotFoundError), match=error):
+        DSArrow(ns='ait', **kwargs)
+
+
+def test_unknown_column(uri):
+    with pytest.raises(ValueError, match='Unknown columns'):
+        DSArrow(ns='ait', uri=uri).filter({'Nope': 1})
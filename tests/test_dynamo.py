@@ -4,8 +4,9 @@ from typing import TYPE_CHECKING, Any
 import pandas as pd
 import pytest
 
-from tests.df_mocks_fixtures import FAKE_DFS
+from xds.core.fakes import FAKE_DFS
 from xds.core.dynamo import Dynamo
+from xds.core.proxies import PROXY_MAP
 from xds.utils.helpers import po
 from xds.utils.io import parser
 from xds.utils.logger import ic, log
@@ -106,3 +107,102 @@ def test_ds_model_v1(setup):
     df: pd.DataFrame = ds.df
     assert not df.empty, 'DS/DF should be created'
     ic('Stats\n', ds.stats())
+
+
+@pytest.mark.usefixtures('setup')
+def test_register_instances_stream(setup, tmp_path):
+    fpath = tmp_path / 'callables.jsonl'
+    fpath.write_text(
+        '{"ns": "stream1"}\n'
+        '["not", "a", "record"]\n'
+        '{"ns": "stream3"}\n'
+    )
+    dynamo = Dynamo()
+    results = dynamo.register_instances('Callable', str(fpath))
+    assert results['count'] == 2  # noqa: PLR2004
+    assert list(results['errors']) == [1]
+    assert results['offset'] == fpath.stat().st_size
+    assert dynamo.obj('instances/callable/stream3')
+
+
+class _CountingProxy:
+    reload_on = ('rows',)
+    exports = ('size', 'double')
+    created = 0
+
+    def __init__(self, **kwargs):
+        self.size = kwargs.get('rows')
+
+    @classmethod
+    def create(cls, **kwargs):
+        cls.created += 1
+        return cls(**kwargs)
+
+    def double(self):
+        return self.size * 2
+
+
+@pytest.mark.usefixtures('setup')
+def test_patch(setup, monkeypatch):
+    monkeypatch.setitem(PROXY_MAP, 'CountingProxy', _CountingProxy)
+    monkeypatch.setattr(_CountingProxy, 'created', 0)
+    dynamo = Dynamo()
+    dynamo.register_model(
+        {'kind': 'Patched', 'proxy': 'str', 'rows': 'int', 'label': 'str'}
+    )
+    inst = dynamo.register_instance(
+        'Patched', data={'ns': 'p1', 'proxy': 'CountingProxy', 'rows': 5}
+    )
+    other = dynamo.register_instance(
+        'Patched', data={'ns': 'p0', 'proxy': 'CountingProxy', 'rows': 3}
+    )
+    assert _CountingProxy.created == 0
+    assert (inst.size, other.double()) == (5, 6)
+    assert _CountingProxy.created == 2  # noqa: PLR2004
+    dynamo.patch(inst.nsid, {'label': 'relabel'}, by='tester')
+    assert inst.label == 'relabel'
+    assert inst.updated_by == 'tester'
+    assert inst.size == 5  # noqa: PLR2004
+    assert _CountingProxy.created == 2  # noqa: PLR2004
+    dynamo.patch(inst.nsid, {'rows': '7'})
+    assert inst.rows == 7  # noqa: PLR2004
+    assert (inst.double(), other.size) == (14, 3)
+    assert _CountingProxy.created == 3  # noqa: PLR2004
+    with pytest.raises(ValueError, match='not found'):
+        dynamo.patch(inst.nsid, {'proxy': 'NoSuchProxy'})
+    assert inst.proxy == 'CountingProxy'
+
+
+@pytest.mark.usefixtures('setup')
+@pytest.mark.parametrize(
+    ('changes', 'error'),
+    [
+        ({'nested1.aint': 'NaN'}, 'validation error'),
+        ({'bstr': None}, 'validation error'),
+        ({'missing': 1}, 'has no field'),
+        ({'ns': 'other'}, 'cannot be patched'),
+        ({'uid': 'other'}, 'cannot be patched'),
+    ],
+)
+def test_patch_rejected(setup, changes, error):
+    dynamo = Dynamo()
+    inst = dynamo.register_instance(
+        'ComplexModel2',
+        data={'ns': 'p2', 'bstr': 'X', 'nested1': {'aint': 1, 'bstr': 'y'}},
+    )
+    before = inst.model_dump()
+    with pytest.raises(ValueError, match=error):
+        dynamo.patch(inst.nsid, changes)
+    assert inst.model_dump() == before
+
+
+@pytest.mark.usefixtures('setup')
+def test_patch_nested(setup):
+    dynamo = Dynamo()
+    inst = dynamo.register_instance(
+        'ComplexModel2',
+        data={'ns': 'p3', 'bstr': 'X', 'nested1': {'aint': 1, 'bstr': 'y'}},
+    )
+    dynamo.patch(inst.nsid, {'nested1.aint': '3', 'nested1.xy': 20})
+    assert (inst.nested1.aint, inst.nested1.xy) == (3, 20)
+    assert inst.nested1.bstr == 'y'
@@ -0,0 +1,129 @@
+from datetime import date
+
+import pandas as pd
+import pytest
+from pydantic import BaseModel
+
+from xds.utils import helpers
+from xds.utils.helpers import (
+    ACRONYMS,
+    XLATIONS_FILE,
+    Xlator,
+    df_pytypes,
+    jinja_env,
+    jinja_preload,
+    jinja_render,
+    jinja_template,
+    load_acronyms,
+    xlate,
+    xlate_index,
+    xlation_map,
+)
+
+
+@pytest.mark.parametrize(
+    ('val', 'expected'),
+    [
+        ('Start Date', ('start_date', 'Start Date')),
+        ('fx-rate', ('fx_rate', 'FX Rate')),
+        ('nsid', ('nsid', 'NSID')),
+        ('Is Waiting', ('is_waiting', 'Is Waiting')),
+    ],
+)
+def test_xlate(val, expected):
+    assert xlate(val) == expected
+
+
+def test_xlation_map_shared_and_isolated():
+    cols = ['Start Date', 'LOB Name']
+    xmap = xlation_map(cols)
+    assert xmap == {
+        'human': {'start_date': 'Start Date', 'lob_name': 'LOB Name'},
+        'var': {
+            'Start Date': 'start_date',
+            'LOB Name': 'lob_name',
+        },
+    }
+    del xmap['var']
+    assert 'var' in xlation_map(cols)
+    assert xlate_index(cols) == ['start_date', 'lob_name']
+
+
+def test_xlator_acronyms():
+    xlator = Xlator(acronyms=['ds'])
+    assert xlator.xlate('ds_name') == ('ds_name', 'DS Name')
+    xlator.set_acronyms(['api'])
+    assert xlator.xlate('api_ds') == ('api_ds', 'API DS')
+    xlator.set_acronyms(['api'], replace=True)
+    assert xlator.xlate('api_ds') == ('api_ds', 'API Ds')
+    names = xlator.xlate_index(['api_ds'])
+    xlator.set_acronyms(['API'], replace=True)
+    assert xlator.xlate_index(['api_ds']) is names
+    xlator.set_acronyms(['ds'], replace=True)
+    assert xlator.xlate('api_ds') == ('api_ds', 'Api DS')
+    assert xlator.acronyms == {'DS'}
+
+
+def test_acronyms_from_xlations(tmp_path):
+    assert ACRONYMS == load_acronyms(XLATIONS_FILE)
+    assert {'LOB', 'FX', 'NSID'} <= ACRONYMS
+    xlations = tmp_path / 'xlations.yaml'
+    xlations.write_text('kind: Xlations\nacronyms: [api, Ds]\n')
+    assert load_acronyms(xlations) == {'API', 'DS'}
+
+
+@pytest.mark.parametrize(
+    ('values', 'expected'),
+    [
+        ([1, 2, 3], 'int'),
+        ([1.5, None, 2.0], 'float'),
+        ([True, False, True], 'bool'),
+        (['a', None, 'c'], 'str'),
+        (pd.Categorical(['x', 'y', 'x']), 'str'),
+        (pd.array([1, None, 3], dtype='Int64'), 'int'),
+        ([date(2024, 1, 1), None, date(2024, 1, 2)], 'date'),
+        (
+            pd.date_range('2024-01-01', periods=3),
+            'pandas._libs.tslibs.timestamps.Timestamp',
+        ),
+        ([pd.DataFrame(), None, pd.DataFrame({'a': [1]})], 'pd'),
+        ([1, 'a', 2.0], 'mixed'),
+        ([None, None, None], 'NoneType'),
+    ],
+)
+def test_df_pytypes(values, expected):
+    assert df_pytypes(pd.DataFrame({'col': values})) == {'col': expected}
+
+
+def test_df_pytypes_cached_by_frame():
+    df = pd.DataFrame({'a': ['x'] * 500 + [None] * 500})
+    assert df_pytypes(df) == {'a': 'str'}
+    df_pytypes(df)['a'] = 'int'
+    assert df_pytypes(df) == {'a': 'str'}
+    df['b'] = 1
+    assert df_pytypes(df) == {'a': 'str', 'b': 'int'}
+
+
+def test_jinja_env_shared_and_preloaded(tmp_path, monkeypatch):
+    monkeypatch.setattr(helpers, '_JINJA_ENVS', {})
+    monkeypatch.setattr(helpers, 'JINJA_CACHE_DIR', str(tmp_path / 'bcc'))
+    (tmp_path / 'tpl').mkdir()
+    (tmp_path / 'tpl' / 'hello.jinja2').write_text('Hi {{ who }}\n')
+    (tmp_path / 'tpl' / 'notes.txt').write_text('skipped')
+    tdir = str(tmp_path / 'tpl')
+
+    templates = jinja_preload(tdir)
+    assert list(templates) == ['hello']
+    assert jinja_env(tdir) is jinja_env(f'{tdir}/')
+    assert jinja_template('hello', tdir) is templates['hello']
+    assert templates['hello'].render(who='there') == 'Hi there\n'
+    assert list((tmp_path / 'bcc').iterdir())
+
+
+def test_jinja_render_default_templates():
+    assert set(jinja_preload()) >= {'model', 'classgen'}
+
+    class Sample(BaseModel):
+        name: str = 'x'
+
+    assert 'name: <TYPE' in jinja_render('model', model=Sample)
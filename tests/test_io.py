@@ -6,7 +6,13 @@ import pytest
 import yaml
 from icecream import ic
 
-from xds.utils.io import parser
+from xds.utils.io import (
+    ParseCache,
+    parse_dir,
+    parse_stream,
+    parser,
+    sniff_mime,
+)
 
 
 @pytest.fixture(scope='session')
@@ -134,3 +140,127 @@ def test_parser_yamlstr_fail():
 def test_parser_url_fail(io_data):
     malformed_url = io_data['wrong_url']
     parser(url=malformed_url)
+
+
+@pytest.fixture
+def catalogue_dir(tmp_path):
+    files = {
+        'a.yaml': 'kind: A\n',
+        'sub/b.yaml': 'kind: B\n',
+        'sub/deep/c.json': '{"kind": "C"}',
+        'sub/skip.yaml': 'kind: Skip\n',
+        'notes.txt': 'not parsed',
+        'sub/broken.json': '{"kind": ',
+        'sub/multi.yaml': 'kind: D\n---\nkind: E\n',
+        'sub/scalars.yaml': '- 1\n- 2\n',
+    }
+    for name, content in files.items():
+        fpath = tmp_path / name
+        fpath.parent.mkdir(parents=True, exist_ok=True)
+        fpath.write_text(content)
+    return tmp_path
+
+
+@pytest.mark.parametrize('executor', ['thread', 'process'])
+def test_parser_dir_recursive(catalogue_dir, executor, monkeypatch):
+    monkeypatch.setattr('xds.utils.io.PARALLEL_MIN_FILES', 1)
+    parsed = parser(
+        str(catalogue_dir),
+        exclude=['*skip*'],
+        workers=2,
+        executor=executor,
+    )
+    kinds = [(i['kind'], i['path']) for i in parsed['contents']]
+    multi = str(catalogue_dir / 'sub/multi.yaml')
+    assert [k for k, _ in kinds] == ['A', 'B', 'C', 'D', 'E']
+    assert [p for k, p in kinds if k in ('D', 'E')] == [multi, multi]
+    assert sorted(parsed['errors']) == [
+        str(catalogue_dir / 'sub/broken.json'),
+        str(catalogue_dir / 'sub/scalars.yaml'),
+    ]
+
+
+def test_parser_dir_flat(catalogue_dir):
+    parsed = parse_dir(catalogue_dir, recursive=False)
+    assert [i['kind'] for i in parsed['contents']] == ['A']
+    assert not parsed['errors']
+
+
+def test_parse_cache(tmp_path):
+    cache = ParseCache(tmp_path / 'parse.cache')
+    fpath = tmp_path / 'cfg.yaml'
+    fpath.write_text('kind: Cached\nwhen: 2024-11-10\n')
+    assert cache.parse(fpath)['kind'] == 'Cached'
+    assert cache.parse(fpath)['kind'] == 'Cached'
+    assert cache.stats()['rehashed'] + cache.stats()['hits'] == 1
+    assert cache.parse(f'file://{fpath}')['kind'] == 'Cached'
+    assert cache.stats()['entries'] == 1
+
+    cache.save()
+    reloaded = ParseCache(tmp_path / 'parse.cache')
+    assert reloaded.get(fpath)[0]
+
+    (tmp_path / 'parse.cache').chmod(0o666)
+    assert not ParseCache(tmp_path / 'parse.cache').get(fpath)[0]
+    (tmp_path / 'parse.cache').chmod(0o600)
+
+    fpath.write_text('kind: Changed\nwhen: 2024-11-10\n')
+    assert not reloaded.get(fpath)[0]
+    assert reloaded.parse(fpath)['kind'] == 'Changed'
+
+    reloaded.clear()
+    assert reloaded.stats()['entries'] == 0
+    assert not (tmp_path / 'parse.cache').exists()
+
+
+@pytest.mark.parametrize(
+    ('buffer', 'expected'),
+    [
+        ('{"a": 1}', 'json'),
+        (b'\xef\xbb\xbf  [1, 2]', 'json'),
+        ('\n  [1, 2]', 'json'),
+        ('a: 1\nb: [1, 2]', 'yaml'),
+        ('---\na: 1', 'yaml'),
+    ],
+)
+def test_sniff_mime(buffer, expected):
+    assert sniff_mime(buffer) == expected
+
+
+def test_parser_multidoc_yaml():
+    docs = parser(buffer='kind: A\n---\nkind: B\n---\n')
+    assert docs == [{'kind': 'A'}, {'kind': 'B'}]
+    assert parser(buffer='---\nkind: A\n') == {'kind': 'A'}
+
+
+def test_parser_yaml_flow_mapping_falls_back():
+    assert parser(buffer='{a: 1, b: x}') == {'a': 1, 'b': 'x'}
+
+
+@pytest.mark.parametrize(
+    ('name', 'content'),
+    [
+        ('recs.jsonl', '{"id": 0}\n\n{"id": 1, "n": "é"}\n{"id": 2}\n'),
+        ('recs.json', '﻿[ {"id": 0},\n {"id": 1, "n": "é"}, {"id": 2} ]'),
+        ('concat.json', '{"id": 0} {"id": 1, "n": "é"}\n{"id": 2}'),
+        ('recs.yaml', 'id: 0\n---\nid: 1\nn: é\n---\nid: 2\n...\n'),
+    ],
+)
+def test_parse_stream_resume(tmp_path, name, content):
+    fpath = tmp_path / name
+    fpath.write_text(content, encoding='utf-8')
+    seen = []
+    records = list(
+        parse_stream(
+            fpath,
+            chunk_size=4,
+            progress=lambda n, off: seen.append(n),
+            progress_every=2,
+        )
+    )
+    assert [r.data['id'] for r in records] == [0, 1, 2]
+    assert seen == [2, 3]
+
+    resumed = list(parse_stream(fpath, offset=records[0].offset))
+    assert [r.data['id'] for r in resumed] == [1, 2]
+    assert resumed[-1].offset == records[-1].offset
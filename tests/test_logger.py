@@ -0,0 +1,44 @@
+import pytest
+from icecream import ic
+from loguru import logger
+
+from xds.utils.logger import AppLogger, log
+
+
+@pytest.fixture
+def restore_log():
+    yield
+    ic.enable()
+    log.configure_logger()
+
+
+@pytest.mark.parametrize(
+    ('env', 'override', 'level'),
+    [
+        ('development', None, 'DEBUG'),
+        ('production', None, 'WARNING'),
+        ('production', 'info', 'INFO'),
+    ],
+)
+def test_level_from_env(monkeypatch, restore_log, env, override, level):
+    monkeypatch.setenv('env', env)
+    if override:
+        monkeypatch.setenv('XDS_LOG_LEVEL', override)
+    else:
+        monkeypatch.delenv('XDS_LOG_LEVEL', raising=False)
+    applog = AppLogger()
+    assert applog.levelno == logger.level(level).no
+    assert applog.enabled(level)
+    assert not applog.enabled('TRACE')
+    assert ic.enabled == (env != 'production')
+
+
+def test_lazy_args_skipped_below_level(monkeypatch, restore_log):
+    monkeypatch.setenv('env', 'production')
+    monkeypatch.delenv('XDS_LOG_LEVEL', raising=False)
+    applog = AppLogger(enqueue=False)
+    calls = []
+    applog.debug('never {}', lambda: calls.append('debug'), lazy=True)
+    applog.error('shown {}', lambda: calls.append('error'), lazy=True)
+    applog.complete()
+    assert calls == ['error']
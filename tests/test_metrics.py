@@ -0,0 +1,62 @@
+import threading
+
+import pytest
+
+from xds.utils.metrics import Metrics
+
+
+def test_metrics_snapshot_and_prometheus():
+    metrics = Metrics()
+    hits = metrics.counter('lookups_total', 'Lookups', ('result',))
+    size = metrics.gauge('resident', 'Resident frames')
+    secs = metrics.histogram('load_seconds', 'Load', buckets=(0.1, 1.0))
+    hits.labels('hit').inc()
+    hits.labels('hit').inc(2)
+    hits.labels('miss').inc()
+    size.set(4)
+    size.dec()
+    secs.observe(0.05)
+    secs.observe(0.5)
+    secs.observe(3)
+
+    snap = metrics.snapshot()
+    assert snap['lookups_total']['samples'] == {
+        'result="hit"': 3,
+        'result="miss"': 1,
+    }
+    assert snap['resident']['samples'] == {'': 3}
+    assert snap['load_seconds']['samples'][''] == {
+        'count': 3,
+        'sum': 3.55,
+        'buckets': {'0.1': 1, '1': 2, '+Inf': 3},
+    }
+    text = metrics.prometheus()
+    assert '# TYPE lookups_total counter' in text
+    assert 'lookups_total{result="hit"} 3' in text
+    assert 'load_seconds_bucket{le="+Inf"} 3' in text
+    assert 'load_seconds_count 3' in text
+
+
+def test_metrics_registry_rules():
+    metrics = Metrics()
+    counter = metrics.counter('jobs_total', labelnames=('kind',))
+    assert metrics.counter('jobs_total') is counter
+    with pytest.raises(ValueError, match='already a counter'):
+        metrics.gauge('jobs_total')
+    with pytest.raises(ValueError, match='expects'):
+        counter.labels()
+
+
+def test_counter_threadsafe():
+    counter = Metrics().counter('hits_total')
+
+    def work():
+        for _ in range(10000):
+            counter.inc()
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert counter.labels().value == 40000  # noqa: PLR2004
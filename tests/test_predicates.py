@@ -0,0 +1,81 @@
+from datetime import date
+
+import pytest
+
+from proxies.ds_legacy import DSLegacy
+from xds.core.fakes import fake_bow_df
+from xds.utils.predicates import predicate
+
+BOW = fake_bow_df(120)
+LOW, MID, HIGH, TOP, SCORE = 5, 10, 50, 90, 100
+
+
+@pytest.mark.parametrize(
+    ('expr', 'slow'),
+    [
+        ('Effort gt 10', lambda r: r['Effort'] > MID),
+        (
+            'Lead in AN,BZ and not Effort lt 5',
+            lambda r: r['Lead'] in ('AN', 'BZ') and r['Effort'] >= LOW,
+        ),
+        (
+            '(Lead eq AN or Group eq RISK) and Errors range 10,50',
+            lambda r: (
+                (r['Lead'] == 'AN' or r['Group'] == 'RISK')
+                and MID <= r['Errors'] <= HIGH
+            ),
+        ),
+        (
+            '`Start Date` ge 2023-06-01',
+            lambda r: r['Start Date'] >= date(2023, 6, 1),
+        ),
+        (
+            "Headline has '^[A-M]'",
+            lambda r: r['Headline'][0] in 'ABCDEFGHIJKLM',
+        ),
+        ('Assignee end DIR1', lambda r: r['Assignee'].endswith('DIR1')),
+        (
+            'Effort > 10 and Errors < 50',
+            lambda r: MID < r['Effort'] and r['Errors'] < HIGH,
+        ),
+        (
+            {'Lead': ['AN', 'KL'], 'Effort': {'ge': 3, 'ne': 7}},
+            lambda r: (
+                r['Lead'] in ('AN', 'KL') and r['Effort'] not in (1, 2, 7)
+            ),
+        ),
+        (
+            {'or': [{'Car': 'DMO'}, {'not': {'Errors': {'le': 90}}}]},
+            lambda r: r['Car'] == 'DMO' or r['Errors'] > TOP,
+        ),
+    ],
+)
+def test_predicate_matches_slow_path(expr, slow):
+    expected = BOW.apply(slow, axis=1)
+    assert predicate(expr)(BOW).tolist() == expected.tolist()
+    assert predicate(expr) is predicate(expr)
+
+
+@pytest.mark.parametrize(
+    ('expr', 'error'),
+    [
+        ('Nope gt 3', 'Unknown columns'),
+        ('Effort +', 'Cannot evaluate'),
+        ('Errors range 10', 'requires two values'),
+        ({'Effort': {'bigger': 3}}, 'Invalid operation'),
+        ('Effort + 1', 'boolean mask'),
+        (42, 'Unsupported predicate'),
+    ],
+)
+def test_predicate_rejects(expr, error):
+    with pytest.raises(ValueError, match=error):
+        predicate(expr)(BOW)
+
+
+def test_ds_filter():
+    ds = DSLegacy(ns='xait', rows=200)
+    fast = ds.filter({'Score': {'gt': 100}, 'Country': ['China', 'India']})
+    slow = ds.filter(
+        lambda r: r['Score'] > SCORE and r['Country'] in ('China', 'India')
+    )
+    assert fast.equals(slow)
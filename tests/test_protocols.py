@@ -0,0 +1,119 @@
+import pandas as pd
+import pytest
+
+from proxies.ds_legacy import DSLegacy
+from xds.core import protocols
+from xds.core.datasets import DatasetCache
+from xds.core.dynamo import Dynamo
+from xds.core.fakes import fake_ait_df
+from xds.core.protocols import PROTOCOLS, Protocol, register_protocol
+
+AIT = fake_ait_df(120).assign(Since=pd.Timestamp('2024-01-31'))
+DTYPES = {'Score': 'float64', 'Since': 'datetime64[ns]'}
+
+
+def _write(tmp_path, suffix):
+    path = tmp_path / f'ait{suffix}'
+    if suffix == '.csv':
+        AIT.to_csv(path, index=False)
+    elif suffix == '.jsonl':
+        AIT.to_json(path, orient='records', lines=True, date_format='iso')
+    elif suffix == '.json':
+        AIT.to_json(path, orient='records', date_format='iso')
+    else:
+        pytest.importorskip('pyarrow')
+        AIT.to_parquet(path, index=False)
+    return path
+
+
+@pytest.mark.parametrize('suffix', ['.csv', '.jsonl', '.json', '.parquet'])
+@pytest.mark.parametrize('chunksize', [7, 1000])
+def test_file_chunks(tmp_path, suffix, chunksize):
+    uri = f'file://{_write(tmp_path, suffix)}'
+    parts = list(protocols.chunks(uri, chunksize=chunksize, dtypes=DTYPES))
+    assert len(parts) == -(-len(AIT) // chunksize)
+    df = protocols.load(uri, chunksize=chunksize, dtypes=DTYPES)
+    assert df['Score'].dtype == 'float64'
+    assert df['Since'].dt.tz is None
+    assert df['Since'].eq(pd.Timestamp('2024-01-31')).all()
+    assert df.drop(columns='Since').equals(
+        AIT.drop(columns='Since').astype({'Score': 'float64'})
+    )
+
+
+@pytest.mark.parametrize(
+    ('uri', 'options', 'shape'),
+    [
+        ('memory://ait', {}, (120, 10)),
+        ('memory://ait', {'rows': 25, 'chunksize': 10}, (25, 10)),
+        ('memory://ait', {'columns': ['Desk', 'Score']}, (120, 2)),
+        ('txf://xcomp', {'rows': 12}, (12, 16)),
+    ],
+)
+def test_memory_and_txf(uri, options, shape):
+    PROTOCOLS['memory'].put('ait', AIT)
+    try:
+        assert protocols.load(uri, **options).shape == shape
+    finally:
+        PROTOCOLS['memory'].remove('ait')
+
+
+@pytest.mark.parametrize(
+    ('uri', 'error'),
+    [
+        ('kudu://table', 'No protocol registered'),
+        ('memory://nope', 'not found'),
+        ('/no/such/file.csv', 'not found'),
+        ('txf://nope', 'No DS could be found'),
+    ],
+)
+def test_protocol_rejects(uri, error):
+    with pytest.raises((ValueError, FileNotFoundError), match=error):
+        protocols.load(uri)
+
+
+def test_register_and_ds_load(monkeypatch, tmp_path):
+    class Constant(Protocol):
+        scheme = 'const'
+
+        def chunks(self, location, chunksize=10, **_):
+            yield pd.DataFrame({'v': [location] * chunksize})
+
+    monkeypatch.setitem(PROTOCOLS, 'const', Constant())
+    register_protocol('const', PROTOCOLS['const'])
+    monkeypatch.setattr('proxies.ds_legacy.DATASETS', DatasetCache())
+    path = _write(tmp_path, '.csv')
+    assert len(DSLegacy(ns='ait', uri=f'file://{path}', rows=30).df) == 30  # noqa: PLR2004
+    assert DSLegacy(ns='x', uri='const://hi').df['v'].tolist() == ['hi'] * 10
+    ds = DSLegacy(ns='xait', uri='txf://xbow', rows=15)
+    assert ds.uri == 'txf://xait'
+    assert [len(c) for c in ds.chunks(chunksize=10)] == [10, 5]
+
+
+def test_ds_cache_keys(monkeypatch):
+    monkeypatch.setattr('proxies.ds_legacy.DATASETS', DatasetCache())
+    memory = PROTOCOLS['memory']
+    memory.put('u', pd.DataFrame({'a': [1, 2, 3], 'b': [4, 5, 6]}))
+    try:
+        full = DSLegacy(ns='x', uri='memory://u').df
+        assert list(full.columns) == ['a', 'b']
+        some = DSLegacy(ns='x', uri='memory://u', columns=['a']).df
+        assert list(some.columns) == ['a']
+        memory.put('u', pd.DataFrame({'a': [9], 'b': [0]}))
+        assert DSLegacy(ns='x', uri='memory://u').df['a'].tolist() == [9]
+    finally:
+        memory.remove('u')
+
+
+def test_ds_blueprint_load_options(monkeypatch):
+    monkeypatch.setattr('proxies.ds_legacy.DATASETS', DatasetCache())
+    model = Dynamo().model('DS')
+    ds = model(
+        ns='xait',
+        nsid='ds/opts',
+        rows=5,
+        columns=['Desk', 'Score'],
+        dtypes={'Score': 'float64'},
+    )
+    assert ds.df.shape == (5, 2)
+    assert ds.df['Score'].dtype == 'float64'
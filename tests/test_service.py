@@ -0,0 +1,102 @@
+import asyncio
+import json
+
+from xds.core.dynamo import Dynamo
+from xds.core.service import Service
+
+
+async def _request(reader, writer, method, path, body=b'', *, headers=None):
+    head = [f'{method} {path} HTTP/1.1', 'Host: test']
+    head += [f'{k}: {v}' for k, v in (headers or {}).items()]
+    head.append(f'Content-Length: {len(body)}')
+    writer.write(('\r\n'.join(head) + '\r\n\r\n').encode() + body)
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    resp_headers = {}
+    while (line := await reader.readline()) != b'\r\n':
+        key, _, val = line.decode().partition(':')
+        resp_headers[key.lower()] = val.strip()
+    if resp_headers.get('transfer-encoding') == 'chunked':
+        data = b''
+        while size := int((await reader.readline()).strip(), 16):
+            data += await reader.readexactly(size)
+            await reader.readline()
+        await reader.readline()
+    else:
+        data = await reader.readexactly(int(resp_headers['content-length']))
+    return status, resp_headers, data
+
+
+async def _session(service):
+    await service.start()
+    reader, writer = await asyncio.open_connection(service.host, service.port)
+    results = {}
+    status, headers, body = await _request(reader, writer, 'GET', '/models/Env')
+    results['model'] = (status, json.loads(body)['kind'])
+    results['cached'] = (
+        await _request(
+            reader,
+            writer,
+            'GET',
+            '/models/Env',
+            headers={'If-None-Match': headers['etag']},
+        )
+    )[0]
+    payload = json.dumps([{'ns': 'svc1'}, {'ns': 'svc2'}]).encode()
+    status, _, body = await _request(
+        reader, writer, 'POST', '/instances/Callable', payload
+    )
+    results['post'] = (status, json.loads(body))
+    status, _, body = await _request(
+        reader, writer, 'GET', '/instances/callable/svc1'
+    )
+    results['instance'] = (status, json.loads(body)['ns'])
+    status, headers, body = await _request(
+        reader, writer, 'GET', '/ds/ds/svcrows/rows?limit=7'
+    )
+    results['rows'] = (status, len(body.splitlines()))
+    results['badlimit'] = (
+        await _request(reader, writer, 'GET', '/ds/ds/svcrows/rows?limit=x')
+    )[0]
+    results['bad'] = (
+        await _request(reader, writer, 'POST', '/instances/Callable', b'[1]')
+    )[0]
+    results['missing'] = (
+        await _request(reader, writer, 'GET', '/instances/nope/none')
+    )[0]
+    status, _, body = await _request(reader, writer, 'GET', '/metrics')
+    results['metrics'] = (status, body.decode())
+    writer.close()
+    reader, writer = await asyncio.open_connection(service.host, service.port)
+    writer.write(
+        b'POST /instances/Callable HTTP/1.1\r\nContent-Length: x\r\n\r\n'
+    )
+    results['badlength'] = int((await reader.readline()).split()[1])
+    writer.close()
+    await service.close()
+    return results
+
+
+def test_service_roundtrip():
+    dynamo = Dynamo()
+    ds = dynamo.model('DS')(ns='xbow', nsid='ds/svcrows')
+    dynamo._ns_init('instances', 'DS', ds)
+    results = asyncio.run(_session(Service(dynamo, port=0, row_chunk=3)))
+    assert results['model'] == (200, 'Env')
+    assert results['cached'] == 304  # noqa: PLR2004
+    assert results['post'] == (
+        201,
+        {
+            'created': ['instances/callable/svc1', 'instances/callable/svc2'],
+            'errors': {},
+        },
+    )
+    assert results['bad'] == 400  # noqa: PLR2004
+    assert results['instance'] == (200, 'Callable/svc1')
+    assert results['rows'] == (200, 7)
+    assert results['badlimit'] == results['badlength'] == 400  # noqa: PLR2004
+    assert results['missing'] == 404  # noqa: PLR2004
+    status, metrics = results['metrics']
+    assert status == 200  # noqa: PLR2004
+    assert 'xds_instances_total{model="Callable",result="ok"}' in metrics
+    assert 'xds_ds_rows_loaded_total{ns="xbow"}' in metrics
@@ -0,0 +1,92 @@
+import tarfile
+import zipfile
+
+import pytest
+
+from xds.utils import storage
+from xds.utils.io import io_buffer, io_bytes, parser
+from xds.utils.storage import (
+    STORAGES,
+    MemoryStorage,
+    OverlayStorage,
+    is_private,
+    private_dir,
+    register_storage,
+)
+
+CATALOGUE = {
+    'blueprints/a.yaml': 'kind: A\nsource: base\n',
+    'blueprints/b.yaml': 'kind: B\n',
+    'configs/c.json': '{"kind": "C"}',
+}
+
+
+@pytest.fixture
+def archives(tmp_path):
+    zpath = tmp_path / 'catalogue.zip'
+    with zipfile.ZipFile(zpath, 'w') as zf:
+        for name, content in CATALOGUE.items():
+            zf.writestr(name, content)
+    tpath = tmp_path / 'catalogue.tar'
+    src = tmp_path / 'src'
+    for name, content in CATALOGUE.items():
+        (src / name).parent.mkdir(parents=True, exist_ok=True)
+        (src / name).write_text(content)
+    with tarfile.open(tpath, 'w') as tf:
+        for name in CATALOGUE:
+            tf.add(src / name, arcname=name)
+    return {'zip': zpath, 'tar': tpath}
+
+
+@pytest.mark.parametrize('scheme', ['zip', 'tar'])
+def test_archive_storage(archives, scheme):
+    root = f'{scheme}://{archives[scheme]}!'
+    parsed = parser(f'{root}blueprints')
+    assert [i['kind'] for i in parsed['contents']] == ['A', 'B']
+    assert parser(f'{root}configs/c.json') == {'kind': 'C'}
+    assert io_buffer(file='b.yaml', dir=f'{root}blueprints') == 'kind: B\n'
+
+
+def test_tar_reads_are_zero_copy(archives):
+    data = io_bytes(file=f'tar://{archives["tar"]}!blueprints/b.yaml')
+    assert isinstance(data, memoryview)
+    assert bytes(data) == b'kind: B\n'
+
+
+def test_memory_and_overlay_storage(archives, monkeypatch):
+    memory = MemoryStorage({'env/blueprints/a.yaml': 'kind: A\nsource: env\n'})
+    monkeypatch.setitem(STORAGES, 'memory', memory)
+    overlay = OverlayStorage([f'zip://{archives["zip"]}!', 'memory://env'])
+    monkeypatch.setitem(STORAGES, 'catalogue', overlay)
+    parsed = parser('catalogue://blueprints')
+    assert [i['source'] for i in parsed['contents'] if i['kind'] == 'A'] == [
+        'env'
+    ]
+    assert len(parsed['contents']) == 2  # noqa: PLR2004
+    assert parser('catalogue://configs/c.json') == {'kind': 'C'}
+
+
+def test_register_storage(monkeypatch):
+    monkeypatch.setattr(storage, 'STORAGES', dict(STORAGES))
+    store = register_storage('scratch', MemoryStorage({'a.yaml': 'a: 1'}))
+    assert storage.resolve('scratch://a.yaml') == (store, 'a.yaml')
+    assert 'scratch' not in STORAGES
+
+
+def test_memory_storage_missing():
+    store = MemoryStorage({'x/y.yaml': 'a: 1'})
+    assert store.is_dir('x')
+    assert store.listdir('') == ['x/y.yaml']
+    with pytest.raises(FileNotFoundError):
+        store.read('x/z.yaml')
+
+
+def test_private_dir(tmp_path):
+    assert private_dir(tmp_path / 'a' / 'b') == tmp_path / 'a' / 'b'
+    assert not (tmp_path / 'a' / 'b').stat().st_mode & 0o077
+    shared = tmp_path / 'shared'
+    shared.mkdir()
+    shared.chmod(0o777)
+    assert private_dir(shared / 'cache') is None
+    (tmp_path / 'link').symlink_to(tmp_path / 'a')
+    assert not is_private(tmp_path / 'link')
@@ -0,0 +1,79 @@
+import json
+
+import pytest
+
+from xds.core.dynamo import Dynamo
+from xds.utils.helpers import SingletonMeta
+from xds.utils.tracing import NOOP_SPAN, TRACER, Tracer, current_span, traced
+
+
+@pytest.fixture
+def tracer():
+    yield TRACER.configure(ring=64)
+    TRACER.configure()
+
+
+def test_disabled_tracer_is_noop():
+    tracer = Tracer()
+    assert tracer.span('anything', a=1) is NOOP_SPAN
+    with tracer.span('anything') as span:
+        span.set_attribute('ignored', True)
+    assert tracer.ring == []
+
+
+def test_nested_spans_and_errors(tracer):
+    @traced('work')
+    def work():
+        current_span().set_attribute('rows', 3)
+        raise KeyError('boom')
+
+    with tracer.span('root', model='DS') as root:
+        with pytest.raises(KeyError):
+            work()
+    child, parent = tracer.ring
+    assert parent is root
+    assert (child.name, child.parent_id) == ('work', root.span_id)
+    assert child.trace_id == root.trace_id
+    assert child.attributes == {'rows': 3}
+    assert child.to_otel()['status'] == {
+        'code': 2,
+        'message': "KeyError: 'boom'",
+    }
+    assert root.to_otel()['attributes'] == [
+        {'key': 'model', 'value': {'stringValue': 'DS'}}
+    ]
+
+
+def test_sampling_drops_whole_trace(tracer):
+    tracer.sample = 0.0
+    with tracer.span('root'):
+        assert current_span() is NOOP_SPAN
+        with tracer.span('child'):
+            pass
+    assert tracer.ring == []
+
+
+def test_file_exporter_otlp_json(tmp_path):
+    out = tmp_path / 'spans.jsonl'
+    tracer = Tracer().configure(file=out)
+    with tracer.span('root'), tracer.span('child', rows=5):
+        pass
+    tracer.flush()
+    doc = json.loads(out.read_text())
+    spans = doc['resourceSpans'][0]['scopeSpans'][0]['spans']
+    assert [s['name'] for s in spans] == ['child', 'root']
+    assert spans[0]['parentSpanId'] == spans[1]['spanId']
+    assert spans[0]['attributes'] == [
+        {'key': 'rows', 'value': {'intValue': '5'}}
+    ]
+
+
+def test_dynamo_boot_spans(tracer, monkeypatch):
+    monkeypatch.setattr(SingletonMeta, '_instances', {})
+    Dynamo()
+    spans = {s.name: s for s in tracer.ring}
+    boot = spans['dynamo.boot']
+    assert boot.parent_id is None
+    assert spans['dynamo.parse'].parent_id == boot.span_id
+    assert spans['dynamo.register_model'].trace_id == boot.trace_id
+    assert boot.attributes['env'] == 'bootstrap'
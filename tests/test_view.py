@@ -0,0 +1,94 @@
+from types import SimpleNamespace
+
+import pytest
+
+import pandas as pd
+
+pytest.importorskip('seaborn')
+pytest.importorskip('plotly')
+
+from legacy.view import ELEMENT_SECS, RENDER_SECS, View
+from xds.utils.tracing import TRACER
+
+SPEC = """
+header: Desk Report
+footer: End
+layout:
+  - name: by_desk
+  - name: top
+pivots:
+  by_desk:
+    index: Desk
+    values: Score
+    aggfunc: sum
+tables:
+  top:
+    columns: [Desk, Score]
+    rows: 2
+"""
+
+TEMPLATE = """<h1>{{ header }}</h1>
+{% for item in layout %}{{ styled_data[item.name] }}{% endfor %}
+<p>{{ footer }}</p>
+"""
+
+
+@pytest.fixture
+def tracer():
+    yield TRACER.configure(ring=64)
+    TRACER.configure()
+
+
+@pytest.fixture
+def report(tmp_path):
+    spec = tmp_path / 'report.yaml'
+    spec.write_text(SPEC)
+    template = tmp_path / 'report.jinja2'
+    template.write_text(TEMPLATE)
+    frame = pd.DataFrame({'Desk': ['FX', 'Rates', 'FX'], 'Score': [1, 2, 3]})
+    ds = SimpleNamespace(df_humanized=frame)
+    return View(str(spec), ds), str(template)
+
+
+def test_view_renders(report):
+    view, template = report
+    assert view.spec['header'] == 'Desk Report'
+    html = view.render(template)
+    assert '<h1>Desk Report</h1>' in html
+    assert html.count('<table') == 2  # noqa: PLR2004
+    assert 'Rates' in html
+    assert '<p>End</p>' in html
+
+
+def test_view_missing_spec(tmp_path):
+    with pytest.raises(FileNotFoundError, match='Not found'):
+        View(str(tmp_path / 'missing.yaml'), SimpleNamespace(df_humanized=None))
+
+
+def _count(hist, *labels):
+    return hist.labels(*labels).sample()['count']
+
+
+def test_view_render_metrics(report):
+    view, template = report
+    renders = _count(RENDER_SECS)
+    pivots = _count(ELEMENT_SECS, 'pivots')
+    tables = _count(ELEMENT_SECS, 'tables')
+    view.render(template)
+    assert _count(RENDER_SECS) == renders + 1
+    assert _count(ELEMENT_SECS, 'pivots') == pivots + 1
+    assert _count(ELEMENT_SECS, 'tables') == tables + 1
+
+
+def test_view_render_spans(report, tracer):
+    view, template = report
+    view.render(template)
+    *elements, root = tracer.ring
+    assert (root.name, root.parent_id) == ('view.render', None)
+    assert root.attributes == {'template': template}
+    assert [(s.name, s.attributes) for s in elements] == [
+        ('view.element', {'kind': 'pivots', 'element': 'by_desk'}),
+        ('view.element', {'kind': 'tables', 'element': 'top'}),
+    ]
+    assert {s.parent_id for s in elements} == {root.span_id}
+    assert {s.trace_id for s in elements} == {root.trace_id}
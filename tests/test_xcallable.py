@@ -0,0 +1,154 @@
+import time
+from collections import Counter
+
+import pandas as pd
+import pytest
+
+from xds.core.xcallable import XCallable
+from xds.utils.results import ResultCache
+
+CALLS: Counter = Counter()
+
+
+def scale(ns, df, factor=1):
+    CALLS[ns] += 1
+    return df.assign(v=df['v'] * factor)
+
+
+@pytest.fixture
+def results(tmp_path):
+    CALLS.clear()
+    return ResultCache(directory=tmp_path)
+
+
+def xcall(df, factor=2, **kwargs):
+    return XCallable(
+        'scale', [df], {'factor': factor}, fn=scale, cache=True, **kwargs
+    )
+
+
+def test_uncached_recomputes():
+    CALLS.clear()
+    df = pd.DataFrame({'v': [1, 2]})
+    xc = XCallable('scale', [df], fn=scale)
+    xc()
+    xc()
+    assert CALLS == {'scale': 2}
+
+
+def test_cache_tiers(results, tmp_path):
+    df = pd.DataFrame({'v': [1, 2, 3]})
+    first = xcall(df)(results)
+    first.loc[0, 'v'] = -1
+    again = xcall(pd.DataFrame({'v': [1, 2, 3]}))(results)
+    assert again['v'].tolist() == [2, 4, 6]
+    assert CALLS == {'scale': 1}
+    xcall(df, factor=3)(results)
+    assert CALLS == {'scale': 2}
+
+    cold = ResultCache(directory=tmp_path)
+    assert xcall(df)(cold)['v'].tolist() == [2, 4, 6]
+    assert CALLS == {'scale': 2}
+    assert cold.stats()['disk'] == 1
+    stats = results.stats()
+    assert (stats['memory'], stats['miss']) == (1, 2)
+    assert stats['hit_rate'] == pytest.approx(1 / 3)
+
+
+def test_cache_ttl(results):
+    df = pd.DataFrame({'v': [1]})
+    xcall(df, ttl=0.05)(results)
+    xcall(df, ttl=0.05)(results)
+    assert CALLS == {'scale': 1}
+    time.sleep(0.1)
+    xcall(df, ttl=0.05)(results)
+    assert CALLS == {'scale': 2}
+    assert results.stats()['expired'] == 1
+
+
+@pytest.mark.parametrize(
+    ('memory_bytes', 'disk_bytes', 'entries', 'files'),
+    [
+        (10**6, 10**9, 3, 3),
+        (1, 10**9, 0, 3),
+        (10**6, 1, 3, 0),
+    ],
+)
+def test_cache_eviction(tmp_path, memory_bytes, disk_bytes, entries, files):
+    results = ResultCache(tmp_path, memory_bytes, disk_bytes)
+    for n in range(3):
+        results.put(f'k{n}', list(range(100)))
+    assert results.stats()['entries'] == entries
+    assert len(list(tmp_path.glob('*.xres'))) == files
+
+
+def test_cache_lru_order(tmp_path):
+    results = ResultCache('off', memory_bytes=2500)
+    for n in range(2):
+        results.put(f'k{n}', pd.DataFrame({'v': range(100)}))
+    results.get('k0')
+    results.put('k2', pd.DataFrame({'v': range(100)}))
+    assert [results.get(k)[0] for k in ('k0', 'k1', 'k2')] == [
+        True,
+        False,
+        True,
+    ]
+
+
+def power(ns, base, exp=2, rtype=None):
+    if base < 0:
+        raise ValueError(f'{ns}: negative base {base}')
+    return base**exp if base else 'zero'
+
+
+@pytest.mark.parametrize('executor', ['thread', 'process'])
+@pytest.mark.parametrize('chunksize', [1, 3, 64])
+def test_map(executor, chunksize):
+    xc = XCallable('power', kwargs={'rtype': int}, fn=power)
+    arg_sets = [1, (2, 3), {'base': 4}, -1, 0, [5]]
+    done = xc.map(arg_sets, chunksize=chunksize, executor=executor)
+    assert [r.index for r in done] == list(range(len(arg_sets)))
+    assert [r.value for r in done] == [1, 8, 16, None, None, 25]
+    assert [type(r.error).__name__ for r in done if not r.ok] == [
+        'ValueError',
+        'TypeError',
+    ]
+
+
+def test_imap_streams_and_caches(results):
+    xc = XCallable('scale', kwargs={'factor': 2}, fn=scale, cache=True)
+    frames = [pd.DataFrame({'v': [n]}) for n in range(4)]
+    streamed = list(xc.imap(frames, chunksize=2, results=results))
+    assert sorted(r.index for r in streamed) == [0, 1, 2, 3]
+    assert CALLS == {'scale': 4}
+    again = xc.map([*frames, pd.DataFrame({'v': [9]})], results=results)
+    assert [r.value['v'][0] for r in again] == [0, 2, 4, 6, 18]
+    assert CALLS == {'scale': 5}
+    assert results.stats()['memory'] == len(frames)
+
+
+def test_map_rejects():
+    xc = XCallable('power', fn=power)
+    with pytest.raises(ValueError, match='Unknown executor'):
+        xc.map([1], executor='fork')
+    with pytest.raises(ValueError, match='chunksize'):
+        xc.map([1], chunksize=0)
+
+
+def make_scale(factor):
+    def scaled(ns, x):
+        return x * factor
+
+    return scaled
+
+
+def test_cache_keys_closures_and_lambdas(results):
+    fns = [
+        make_scale(2),
+        make_scale(10),
+        lambda ns, x: x * 2,
+        lambda ns, x: x + 0,
+    ]
+    got = [XCallable('s', [3], fn=f, cache=True)(results) for f in fns]
+    assert got == [6, 30, 6, 3]
+    assert results.stats()['miss'] == len(fns)
@@ -0,0 +1,74 @@
+from typing import Any, Callable, Dict, List, Optional
+
+import pandas as pd
+
+from xds.utils.helpers import xlate
+from xds.utils.io import parser
+from xds.utils.logger import log
+
+CALLABLES_FILE = 'xds/configs/callables.yaml'
+CALLABLES: Dict[str, Callable] = {}
+
+
+def register_callable(
+    fn: Optional[Callable] = None, *, name: Optional[str] = None
+) -> Any:
+    def decorator(func: Callable) -> Callable:
+        key = name or func.__name__
+        CALLABLES[key] = func
+        log.debug('Callable {} registered', key)
+        return func
+
+    return decorator(fn) if fn else decorator
+
+
+def callable_specs(
+    config: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Dict[str, Any]]:
+    config = config or parser(CALLABLES_FILE)
+    return {
+        c['fn']: {k: v for k, v in c.items() if k != 'fn'}
+        for c in config.get('callables', [])
+    }
+
+
+def xref_params(spec: Dict[str, Any]) -> List[str]:
+    return [
+        k for k, v in spec.items() if isinstance(v, str) and 'xref=' in v
+    ]
+
+
+def frame(ds: Any) -> pd.DataFrame:
+    df = ds if isinstance(ds, pd.DataFrame) else getattr(ds, 'df', None)
+    if not isinstance(df, pd.DataFrame):
+        raise TypeError(f'Expected a DataFrame or DS, got {type(ds).__name__}')
+    return df
+
+
+@register_callable
+def ds_humanize(ds: Any) -> pd.DataFrame:
+    return frame(ds).rename(columns=lambda col: xlate(str(col))[1])
+
+
+@register_callable
+def ds_join(
+    dsl: Any,
+    dsr: Any,
+    dslkey: List[str],
+    dsrkey: Optional[List[str]] = None,
+    type: str = 'left',
+) -> pd.DataFrame:
+    how = {'left': 'left', 'right': 'right', 'strict': 'inner'}.get(type)
+    if how is None and type != 'diff':
+        raise ValueError(f'Unknown join type {type}')
+    joined = pd.merge(
+        frame(dsl),
+        frame(dsr),
+        left_on=dslkey,
+        right_on=dsrkey or dslkey,
+        how=how or 'outer',
+        indicator=type == 'diff',
+    )
+    if type == 'diff':
+        joined = joined[joined.pop('_merge') != 'both']
+    return joined
@@ -0,0 +1,130 @@
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from graphlib import CycleError, TopologicalSorter
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+
+from xds.core.callables import CALLABLES, callable_specs, xref_params
+from xds.utils.helpers import fingerprint
+from xds.utils.logger import log
+from xds.utils.tracing import TRACER
+
+
+class DagNode(NamedTuple):
+    name: str
+    fn: str
+    inputs: Dict[str, Any]
+    deps: Dict[str, str]
+
+
+class CallableDag:
+    def __init__(
+        self,
+        pipeline: Dict[str, Dict[str, Any]],
+        specs: Optional[Dict[str, Dict[str, Any]]] = None,
+        executor: str = 'thread',
+        workers: Optional[int] = None,
+    ):
+        if executor not in ('thread', 'process'):
+            raise ValueError(f'Unknown executor {executor}')
+        self.specs = callable_specs() if specs is None else specs
+        self.executor = executor
+        self.workers = workers
+        self.nodes = {
+            name: self._node(name, cfg, pipeline)
+            for name, cfg in pipeline.items()
+        }
+        self.memo: Dict[str, Tuple[str, Any]] = {}
+        self.stats = {'computed': 0, 'memoized': 0}
+        self._sorter()
+
+    def _sorter(self) -> TopologicalSorter:
+        sorter = TopologicalSorter(
+            {n: set(node.deps.values()) for n, node in self.nodes.items()}
+        )
+        try:
+            sorter.prepare()
+        except CycleError as e:
+            raise ValueError(f'Pipeline has a cycle: {e.args[1]}') from None
+        return sorter
+
+    def _node(
+        self, name: str, cfg: Dict[str, Any], pipeline: Dict[str, Any]
+    ) -> DagNode:
+        inputs = dict(cfg)
+        fn = inputs.pop('fn', None)
+        if fn in self.specs and fn not in CALLABLES:
+            raise ValueError(f'Node {name}: callable {fn} is not implemented')
+        if fn not in CALLABLES:
+            raise ValueError(f'Node {name}: callable {fn} is not registered')
+        spec = self.specs.get(fn, {})
+        unknown = set(inputs) - set(spec) if spec else set()
+        if unknown:
+            raise ValueError(f'Node {name}: {fn} takes no {sorted(unknown)}')
+        deps = {
+            param: inputs[param]
+            for param in xref_params(spec)
+            if isinstance(inputs.get(param), str) and inputs[param] in pipeline
+        }
+        return DagNode(name, fn, inputs, deps)
+
+    def update(self, name: str, **inputs: Any) -> None:
+        node = self.nodes[name]
+        stale = set(inputs) & set(node.deps)
+        if stale:
+            raise ValueError(f'Node {name}: {sorted(stale)} are node refs')
+        self.nodes[name] = node._replace(inputs={**node.inputs, **inputs})
+
+    def run(self) -> Dict[str, Any]:
+        sorter = self._sorter()
+        results: Dict[str, Any] = {}
+        fps: Dict[str, str] = {}
+        span = TRACER.span('dag.run', nodes=len(self.nodes))
+        with span, self._pool() as pool:
+            pending: Dict[Any, Tuple[str, str]] = {}
+            while sorter.is_active():
+                for name in sorter.get_ready():
+                    node = self.nodes[name]
+                    fps[name] = fp = self._fingerprint(node, fps)
+                    cached = self.memo.get(name)
+                    if cached and cached[0] == fp:
+                        results[name] = cached[1]
+                        self.stats['memoized'] += 1
+                        sorter.done(name)
+                        continue
+                    kwargs = {
+                        **node.inputs,
+                        **{p: results[d] for p, d in node.deps.items()},
+                    }
+                    fn = CALLABLES[node.fn]
+                    pending[pool.submit(fn, **kwargs)] = (name, fp)
+                if not pending:
+                    continue
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name, fp = pending.pop(future)
+                    try:
+                        results[name] = future.result()
+                    except Exception as e:
+                        for other in pending:
+                            other.cancel()
+                        raise RuntimeError(f'Node {name} failed: {e}') from e
+                    self.memo[name] = (fp, results[name])
+                    self.stats['computed'] += 1
+                    sorter.done(name)
+        log.info(f'Pipeline ran {len(results)} nodes: {self.stats}')
+        return results
+
+    def _fingerprint(self, node: DagNode, fps: Dict[str, str]) -> str:
+        literals = {k: v for k, v in node.inputs.items() if k not in node.deps}
+        refs = {p: fps[d] for p, d in node.deps.items()}
+        return fingerprint([node.fn, CALLABLES[node.fn], literals, refs])
+
+    def _pool(self) -> Executor:
+        if self.executor == 'process':
+            return ProcessPoolExecutor(self.workers)
+        return ThreadPoolExecutor(self.workers)
@@ -0,0 +1,127 @@
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, NamedTuple, Optional
+
+import pandas as pd
+
+from xds.utils.logger import log
+from xds.utils.metrics import METRICS
+
+DATASET_BUDGET = int(os.getenv('XDS_DATASET_BUDGET', str(512 << 20)))
+
+RESIDENT = METRICS.gauge(
+    'xds_dataset_resident_bytes', 'Bytes held by the shared dataset cache'
+)
+LOOKUPS = METRICS.counter(
+    'xds_dataset_lookups_total', 'Shared dataset cache lookups', ('result',)
+)
+EVICTIONS = METRICS.counter(
+    'xds_dataset_evictions_total', 'Datasets evicted over budget'
+)
+
+
+class Dataset(NamedTuple):
+    frame: pd.DataFrame
+    nbytes: int
+
+
+class DatasetCache:
+    # One resident frame per source key, shared by every proxy that asks for
+    # it. Callers get a lazy shallow copy when pandas copy-on-write is on;
+    # without it a shallow copy would let cell writes reach the shared frame,
+    # so they get a deep copy and only the load itself is shared.
+    def __init__(self, budget: int = DATASET_BUDGET):
+        self.budget = budget
+        self._frames: OrderedDict[Hashable, Dataset] = OrderedDict()
+        self._loading: Dict[Hashable, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self.resident = 0
+
+    def get(
+        self, key: Hashable, loader: Callable[[], pd.DataFrame]
+    ) -> pd.DataFrame:
+        frame = self._lookup(key)
+        if frame is None:
+            with self._lock:
+                loading = self._loading.setdefault(key, threading.Lock())
+            try:
+                with loading:
+                    frame = self._lookup(key)
+                    if frame is None:
+                        LOOKUPS.labels('miss').inc()
+                        frame = loader()
+                        if not self._admit(key, frame):
+                            return frame
+            finally:
+                with self._lock:
+                    self._loading.pop(key, None)
+        return checkout(frame)
+
+    def peek(self, key: Hashable) -> Optional[Dataset]:
+        with self._lock:
+            return self._frames.get(key)
+
+    def evict(self, key: Hashable) -> None:
+        with self._lock:
+            self._drop(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            for key in list(self._frames):
+                self._drop(key)
+
+    def resize(self, budget: int) -> None:
+        with self._lock:
+            self.budget = budget
+            self._shrink()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'datasets': len(self._frames),
+                'resident': self.resident,
+                'budget': self.budget,
+            }
+
+    def _lookup(self, key: Hashable) -> Optional[pd.DataFrame]:
+        with self._lock:
+            dataset = self._frames.get(key)
+            if dataset is None:
+                return None
+            self._frames.move_to_end(key)
+        LOOKUPS.labels('hit').inc()
+        return dataset.frame
+
+    def _admit(self, key: Hashable, frame: pd.DataFrame) -> bool:
+        nbytes = int(frame.memory_usage(deep=True).sum())
+        if nbytes > self.budget:
+            log.warn('Dataset {} ({} bytes) exceeds the budget', key, nbytes)
+            return False
+        with self._lock:
+            self._drop(key)
+            self._frames[key] = Dataset(frame, nbytes)
+            self.resident += nbytes
+            RESIDENT.inc(nbytes)
+            self._shrink()
+        return True
+
+    def _shrink(self) -> None:
+        while self.resident > self.budget and self._frames:
+            key = next(iter(self._frames))
+            log.debug('Evicting dataset {}', key)
+            self._drop(key)
+            EVICTIONS.inc()
+
+    def _drop(self, key: Hashable) -> None:
+        dataset = self._frames.pop(key, None)
+        if dataset is not None:
+            self.resident -= dataset.nbytes
+            RESIDENT.dec(dataset.nbytes)
+
+
+def checkout(frame: pd.DataFrame) -> pd.DataFrame:
+    return frame.copy(deep=pd.options.mode.copy_on_write is not True)
+
+
+DATASETS = DatasetCache()
@@ -1,31 +1,41 @@
+import copy
 import inspect
 import re
+import threading
 from datetime import datetime
+from functools import lru_cache
 from pprint import pp
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple, get_args
 
 from pydantic import (
     UUID4,
     BaseModel,
     ConfigDict,
     Field,
+    TypeAdapter,
     create_model,
     model_validator,
 )
 
 from xds.core.proxies import PROXY_MAP
+from xds.utils.bundle import load_bundle
+from xds.utils.calendars import CALENDARS
 from xds.utils.field import field_specs
 from xds.utils.helpers import (
+    XLATOR,
     SingletonMeta,
     dict_flatten,
     dict_unflatten,
-    jinja_render,
+    jinja_preload,
     po,
     typed_list,
     xlate,
 )
-from xds.utils.io import parser
+from xds.utils.io import parse_stream, parser
 from xds.utils.logger import ic, log
+from xds.utils.metrics import METRICS
+from xds.utils.results import RESULTS
+from xds.utils.tracing import TRACER, current_span, traced
 
 
 from uuid import uuid4
@@ -40,46 +50,164 @@ BLUEPRINTS = 'xds/catalogue/blueprints'
 CONFIGS = 'xds/configs'
 TEMPLATES = 'xds/catalogue/templates'
 ENVNAME = 'bootstrap'
+SYSUID = 'fta'
+PATCH_LOCKED = ('kind', 'ns', 'nsid')
+PROXIED = '__proxied__'
+
+MODELS_COMPILED = METRICS.counter(
+    'xds_models_compiled_total', 'Dynamic models compiled'
+)
+INSTANCES = METRICS.counter(
+    'xds_instances_total',
+    'Instance registrations by result',
+    ('model', 'result'),
+)
+VALIDATE_SECS = METRICS.histogram(
+    'xds_validate_seconds', 'Instance validation time', ('model',)
+)
+PATCHES = METRICS.counter('xds_patches_total', 'Instance patches applied')
+LOOKUPS = METRICS.counter(
+    'xds_locator_lookups_total', 'Registry lookups by outcome', ('result',)
+)
+PROXY_SECS = METRICS.histogram(
+    'xds_proxy_create_seconds', 'Proxy creation time', ('proxy',)
+)
+RESIDENT = METRICS.gauge(
+    'xds_registry_objects', 'Objects held in the registry', ('what',)
+)
+
+
+@lru_cache(maxsize=None)
+def _field_names(cls: Any) -> Dict[str, str]:
+    names = {name: name for name in cls.model_fields}
+    names.update({f.alias: n for n, f in cls.model_fields.items() if f.alias})
+    return names
+
+
+@lru_cache(maxsize=None)
+def _field_adapter(cls: Any, name: str) -> TypeAdapter:
+    return TypeAdapter(cls.model_fields[name].annotation)
+
+
+def _plain(val: Any) -> Dict[str, Any]:
+    if val is None:
+        return {}
+    if isinstance(val, BaseModel):
+        return val.model_dump()
+    if isinstance(val, dict):
+        return copy.deepcopy(val)
+    raise ValueError(f'Cannot patch nested keys into {type(val).__name__}')
+
+
+class ProxyExport:
+    # Bound once per model class; resolves against each instance's own proxy,
+    # which is created on first access.
+    def __init__(self, name: str):
+        self.name = name
+
+    def __get__(self, obj: Any, owner: Any = None) -> Any:
+        if obj is None:
+            return self
+        return getattr(_proxied(obj), self.name)
+
+
+_PROXY_LOCK = threading.RLock()
+
+
+def _proxied(obj: Any) -> Any:
+    proxied = obj.__dict__.get(PROXIED)
+    if proxied is None:
+        with _PROXY_LOCK:
+            proxied = obj.__dict__.get(PROXIED)
+            if proxied is None:
+                proxied = Dynamo._make_proxy(obj.__dict__)
+                object.__setattr__(obj, PROXIED, proxied)
+    return proxied
+
+
+@lru_cache(maxsize=None)
+def _bind_exports(cls: Any, dcls: Any) -> Tuple[str, ...]:
+    fields = _field_names(cls)
+    bound = tuple(name for name in dcls.exports if name not in fields)
+    for name in bound:
+        setattr(cls, name, ProxyExport(name))
+    return bound
+
+
+def _set_path(data: Dict[str, Any], path: List[str], value: Any) -> None:
+    *parents, leaf = path
+    for key in parents:
+        data = data.setdefault(key, {})
+        if not isinstance(data, dict):
+            raise ValueError(f'Cannot patch {".".join(path)} through {key}')
+    data[leaf] = value
 
 
 class Dynamo(metaclass=SingletonMeta):
+    @traced('dynamo.boot')
     def __init__(self, **kwargs):
         self.envname: str = kwargs.get('env', ENVNAME)
         self.ns: Dict[str, Any] = kwargs.get('ns', {})
         self.blueprints: str = kwargs.get('blueprints', BLUEPRINTS)
         self.configs: str = kwargs.get('configs', CONFIGS)
         self.templates: str = kwargs.get('templates', TEMPLATES)
+        self.bundle: Optional[str] = kwargs.get('bundle')
+        current_span().set_attributes(env=self.envname, bundle=self.bundle)
 
         self.models: Dict[str, Any] = {}
         self.instances: Dict[str, Any] = {}
         self.callables: Dict[str, Any] = {}
-        self.jinjas: Dict[str, Any] = {}
+        self.jinjas: Dict[str, Any] = jinja_preload(self.templates)
         self._configs: Dict[str, Any] = {}
         self.env: Any = None
 
         self.envfile = f'{self.configs}/env.{self.envname}.yaml'
 
-        self._filecfgs('models', self.blueprints)
-        self._filecfgs('configs', self.configs)
-        assert self._filecfgs, 'No Configs seen in Registry'
+        if self.bundle:
+            self._bundlecfgs(self.bundle)
+        else:
+            self._filecfgs('models', self.blueprints)
+            self._filecfgs('configs', self.configs)
+        assert self._configs, 'No Configs seen in Registry'
+        if xlations := self._configs.get('configs/xlations'):
+            XLATOR.set_acronyms(xlations.get('acronyms', []), replace=True)
+        if calendars := self._configs.get('configs/calendars'):
+            CALENDARS.load(calendars)
 
         env_cls = 'Env'
         self.register_model(env_cls)
-        self.register_instance(env_cls, path=self.envfile)
+        if self.bundle:
+            envcfg = self._configs.get(f'envs/{self.envname}')
+            assert envcfg, f'Env {self.envname} not found in {self.bundle}'
+            self.register_instance(env_cls, data=envcfg)
+        else:
+            self.register_instance(env_cls, path=self.envfile)
         self.env = self.obj(f'instances/{env_cls}/{self.envname}')
         log.info(f'Env => {self.env.nsid}')
+        RESULTS.attach(self.env.tmp)
         for model in self.env.models:
             self.register_model(model)
         self.allowed_callees = ['register_model']
 
     def _filecfgs(self, what: str, dir: str):
-        files = parser(dir)
+        with TRACER.span('dynamo.parse', what=what, dir=dir) as span:
+            files = parser(dir)
+            span.set_attribute('files', len(files.get('contents') or []))
+        if files.get('errors'):
+            raise ValueError(f'Failed to parse {dir}: {files["errors"]}')
         if not files.get('contents'):
             raise ValueError(f'No model file contents seen in {dir}')
         fconfigs = {f"{what}/{i['kind']}".lower(): i for i in files['contents']}
         if fconfigs:
             self._configs.update(fconfigs)
 
+    def _bundlecfgs(self, path: str):
+        with TRACER.span('dynamo.bundle', path=path) as span:
+            bundle = load_bundle(path)
+            self._configs.update(bundle.items())
+            span.set_attribute('entries', len(bundle))
+        log.info(f'Configs loaded from bundle {path} v{bundle.version}')
+
     def register_model(self, model: str = None) -> Any:
         model_ref = {}
         try:
@@ -90,7 +218,8 @@ class Dynamo(metaclass=SingletonMeta):
                 assert clscfg, f'{model} Config not found'
                 model_ref = clscfg
             cls_name = model_ref.get('kind')
-            cls = self.dynamic_model(model_ref)
+            with TRACER.span('dynamo.register_model', model=cls_name):
+                cls = self.dynamic_model(model_ref)
             self._ns_init('models', cls_name, cls)
             return cls
         except Exception as e:
@@ -100,19 +229,102 @@ class Dynamo(metaclass=SingletonMeta):
     def register_instance(self, model: Optional[str] = None, **kwargs) -> Any:
         model = model or kwargs.get('kind')
         assert model, 'Model not specified'
-        vars = parser(**kwargs)
+        data = kwargs.pop('data', None)
+        vars = parser(data) if data is not None else parser(**kwargs)
         vars.update(self._get_mixings('instances', model, vars))
         try:
             cls = self.model(model)
             if not cls:
                 raise ValueError(f'Model {model} not found')
-            inst = cls(**vars)
+            with VALIDATE_SECS.labels(model).time():
+                inst = cls(**vars)
             self._ns_init('instances', model, inst)
+            INSTANCES.labels(model, 'ok').inc()
             return inst
         except Exception as e:
+            INSTANCES.labels(model, 'error').inc()
             log.error(f'Error registering instance {model}: {e}')
             raise e
 
+    def register_instances(
+        self,
+        model: str,
+        source: str,
+        offset: int = 0,
+        progress: Optional[Callable[[int, int], None]] = None,
+        **kwargs,
+    ) -> Dict[str, Any]:
+        results = {'count': 0, 'offset': offset, 'errors': {}}
+        stream = parse_stream(
+            source, offset=offset, progress=progress, **kwargs
+        )
+        for rec in stream:
+            try:
+                self.register_instance(model, data=rec.data)
+                results['count'] += 1
+            except Exception as e:
+                results['errors'][rec.index] = f'{type(e).__name__}: {e}'
+            results['offset'] = rec.offset
+        log.info(
+            f'Registered {results["count"]} {model} instances from {source}, '
+            f'{len(results["errors"])} failed'
+        )
+        return results
+
+    def patch(
+        self, nsid: str, changes: Dict[str, Any], by: Optional[str] = None
+    ) -> Any:
+        inst = self.obj(nsid)
+        if inst is None:
+            raise ValueError(f'Instance {nsid} not found')
+        cls = type(inst)
+        names = _field_names(cls)
+        staged: Dict[str, Any] = {}
+        for path, value in changes.items():
+            head, *rest = path.split('.')
+            name = names.get(head)
+            if name is None:
+                raise ValueError(f'{cls.__name__} has no field {head}')
+            flags = cls.meta[name].get('flags', {})
+            if name in PATCH_LOCKED or flags.get('sys'):
+                raise ValueError(f'{cls.__name__}.{name} cannot be patched')
+            if not rest:
+                staged[name] = value
+                continue
+            if name not in staged:
+                staged[name] = _plain(getattr(inst, name))
+            _set_path(staged[name], rest, value)
+
+        staged['updated_ts'] = datetime.now().isoformat()
+        staged['updated_by'] = by or SYSUID
+        updates = {
+            name: _field_adapter(cls, name).validate_python(val)
+            for name, val in staged.items()
+            if name in cls.model_fields
+        }
+        if 'proxy' in updates:
+            Dynamo._proxy_class(updates['proxy'])
+        stale = self._proxy_stale(inst, updates)
+        for name, val in updates.items():
+            setattr(inst, name, val)
+        if stale:
+            inst.__dict__.pop(PROXIED, None)
+            Dynamo._bind(cls, inst)
+        PATCHES.inc()
+        log.debug('Patched {}: {}', inst.nsid, changes.keys())
+        return inst
+
+    @staticmethod
+    def _proxy_stale(inst: Any, updates: Dict[str, Any]) -> bool:
+        proxy = updates.get('proxy', getattr(inst, 'proxy', None))
+        if not proxy:
+            return False
+        dcls = PROXY_MAP.get(proxy)
+        reload_on = getattr(dcls, 'reload_on', None)
+        if reload_on is None:
+            return True
+        return any(k in updates for k in ('proxy', *reload_on))
+
     def dynamic_model(
         self, data: Dict[str, Any], child: bool = False
     ) -> BaseModel:
@@ -126,7 +338,7 @@ class Dynamo(metaclass=SingletonMeta):
         cls_name, _ = self._get_class_spec(data)
         model = self.model(cls_name)
         if model:
-            log.info(f'Returning {cls_name} from model registry cache')
+            log.debug('Returning {} from model registry cache', cls_name)
             return model
         try:
             cls_name, normalized_fields = self._parse_spec(data, child, fields)
@@ -140,6 +352,7 @@ class Dynamo(metaclass=SingletonMeta):
             model.info = self._str_model_(model)
             model.__str__ = self._str_instance_
             model.meta = self._meta_model(model)
+            MODELS_COMPILED.inc()
             log.info(f'Creating model for {cls_name}')
             #log.debug(f'Pydantic Model Info:\n{model.info}')
             #log.debug(f'Metadata:\n{po(model.meta)}')
@@ -171,29 +384,37 @@ class Dynamo(metaclass=SingletonMeta):
         ns_id = f'{what}/{oid}'.lower()
         obj.nsid = ns_id
         self.ns[ns_id] = obj
-        log.info(f'Namespace => {ns_id} Initialized')
+        RESIDENT.labels(what).set(len(getattr(self, what)))
+        log.debug('Namespace => {} Initialized', ns_id)
 
     def locator(self, nskey: str) -> Any:
         obj = self.ns.get(nskey.lower())
         if obj:
+            LOOKUPS.labels('hit').inc()
             return obj
 
         parts = nskey.split('/')
         if nskey.startswith('models/'):
             obj = self.models.get(parts[1])
             if obj:
+                LOOKUPS.labels('hit').inc()
                 return obj
 
         if nskey.startswith('instances/'):
             obj = self.instances.get(f'{parts[1]}/{parts[2]}')
             if obj:
+                LOOKUPS.labels('hit').inc()
                 return obj
             else:
                 last = f'/{parts[-1]}'
                 found = [i for i in self.ns if i.endswith(last)]
                 if len(found) == 1:
-                    log.info(f'Found {found[0]} for {nskey} with fuzzy search')
+                    log.debug(
+                        'Found {} for {} with fuzzy search', found[0], nskey
+                    )
+                    LOOKUPS.labels('fuzzy').inc()
                     return self.ns[found[0]]
+        LOOKUPS.labels('miss').inc()
         return None
 
     def model(self, clstr: str) -> Any:
@@ -215,29 +436,23 @@ class Dynamo(metaclass=SingletonMeta):
         return sep.join(f'{header} ->{content}\n' for header, content in data)
 
 
-    @staticmethod
-    def proxy_callback(method):
-        def wrapper(self, *args, **kwargs):
-            return getattr(self.__proxied__, method.__name__)(*args, **kwargs)
-        return wrapper
-
     @staticmethod
     def _assign_defaults(model_cls, values):
         for name, field in model_cls.model_fields.items():
             extra = field.json_schema_extra
             if extra.get('flags', {}).get('list') and values.get(name):
-                values[name] = typed_list(extra['itype'], values[name])
+                itype = _item_type(field.annotation)
+                values[name] = typed_list(itype, values[name])
             defval = extra.get('defval')
             values[name] = values.get(name, defval)
         return values
 
-    @staticmethod
-    def _str_model_(model: BaseModel) -> str:
-        return jinja_render('model', model=model)
+    def _str_model_(self, model: BaseModel) -> str:
+        return self.jinjas['model'].render(model=model)
 
     @staticmethod
     def _str_instance_(inst) -> str:
-        log.info(f'Dumping instance {inst}')
+        log.debug('Dumping instance {}', inst.nsid)
         return po(inst.model_dump(exclude_none=True))
 
     @staticmethod
@@ -356,7 +571,7 @@ class Dynamo(metaclass=SingletonMeta):
     @staticmethod
     def _get_mixings(what: str, model: str, vars: Dict[str, Any]) -> Dict[str, Any]:
         ns = '/'.join([i for i in [model, vars.get('ns')] if i])
-        uid = 'fta'
+        uid = SYSUID
         ts = datetime.now().isoformat()
         return {
             'ns': ns,
@@ -407,7 +622,7 @@ class Dynamo(metaclass=SingletonMeta):
 
             valid_fields = list(cls.model_fields.keys())
             cleansed = {k: v for k, v in cleansed.items() if k in valid_fields}
-            log.debug(po(cleansed))
+            log.debug('{}', lambda: po(cleansed), lazy=True)
             return cleansed
 
         except Exception as e:
@@ -421,23 +636,40 @@ class Dynamo(metaclass=SingletonMeta):
     @model_validator(mode='after')
     def _after(cls, obj):
         try:
-            proxy = getattr(obj, 'proxy', None)
-            if not proxy:
-                return obj
-
-            dcls: Any = PROXY_MAP.get(proxy)
-            if not dcls:
-                raise ValueError(f'Proxy class {proxy} not found in {PROXY_MAP}')
-
-            inst = dcls.create(**obj.__dict__)
-            obj.__proxied__ = inst
-            for export in inst.exports:
-                val = getattr(inst, export)
-                setattr(
-                    cls,
-                    export,
-                    Dynamo.proxy_callback(val) if callable(val) else val,
-                )
+            Dynamo._bind(cls, obj)
         except Exception as e:
             ic(f'Error setting proxy methods for {cls}: {e}')
-        return obj
\ No newline at end of file
+        return obj
+
+    @staticmethod
+    def _proxy_class(proxy: Optional[str]) -> Any:
+        if not proxy:
+            return None
+        dcls: Any = PROXY_MAP.get(proxy)
+        if not dcls:
+            raise ValueError(f'Proxy class {proxy} not found in {PROXY_MAP}')
+        return dcls
+
+    @staticmethod
+    def _make_proxy(values: Dict[str, Any]) -> Any:
+        dcls = Dynamo._proxy_class(values.get('proxy'))
+        if dcls is None:
+            return None
+        values = {k: v for k, v in values.items() if k != PROXIED}
+        with PROXY_SECS.labels(values['proxy']).time():
+            return dcls.create(**values)
+
+    @staticmethod
+    def _bind(cls, obj):
+        dcls = Dynamo._proxy_class(obj.__dict__.get('proxy'))
+        if dcls is not None:
+            _bind_exports(cls, dcls)
+
+
+def _item_type(annotation: Any) -> Any:
+    # Optional[List[X]] -> X, the element type list fields coerce into.
+    for arg in get_args(annotation) or (annotation,):
+        inner = get_args(arg)
+        if inner:
+            return inner[0]
+    return str
@@ -0,0 +1,261 @@
+import threading
+from pathlib import Path
+from typing import Any, Dict, Hashable, Iterator, List, Optional, Tuple
+
+import pandas as pd
+
+from xds.core.fakes import FAKE_DFS
+from xds.utils.logger import log
+from xds.utils.tracing import TRACER
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - optional dependency
+    pq = None
+
+CHUNK_ROWS = 50_000
+TXF_ROWS = 50
+
+Dtypes = Dict[str, str]
+
+
+class Protocol:
+    # A DS source keyed by URI scheme. Backends only implement chunks();
+    # load() assembles them so large sources never need one blocking read.
+    scheme: str = ''
+
+    def chunks(
+        self,
+        location: str,
+        chunksize: int = CHUNK_ROWS,
+        rows: Optional[int] = None,
+        dtypes: Optional[Dtypes] = None,
+        columns: Optional[List[str]] = None,
+    ) -> Iterator[pd.DataFrame]:
+        raise NotImplementedError
+
+    def version(self, location: str) -> Hashable:
+        # Changes whenever the data at location does, so cached frames keyed
+        # on it go stale with their source instead of outliving it.
+        return None
+
+    def load(self, location: str, **options: Any) -> pd.DataFrame:
+        with TRACER.span('ds.read', scheme=self.scheme, at=location) as span:
+            parts = []
+            for part in self.chunks(location, **options):
+                parts.append(part)
+                log.debug('Read {} rows from {}', len(part), location)
+            span.set_attribute('chunks', len(parts))
+        if not parts:
+            return pd.DataFrame()
+        if len(parts) == 1:
+            return parts[0]
+        return pd.concat(parts, ignore_index=True)
+
+
+class FileProtocol(Protocol):
+    scheme = 'file'
+
+    def chunks(
+        self,
+        location: str,
+        chunksize: int = CHUNK_ROWS,
+        rows: Optional[int] = None,
+        dtypes: Optional[Dtypes] = None,
+        columns: Optional[List[str]] = None,
+    ) -> Iterator[pd.DataFrame]:
+        path = Path(location)
+        if not path.is_file():
+            raise FileNotFoundError(f'{location} not found')
+        suffix = path.suffix.lower()
+        if suffix in ('.csv', '.tsv', '.txt'):
+            reader = self._csv(path, chunksize, rows, dtypes, columns)
+        elif suffix in ('.jsonl', '.ndjson'):
+            reader = pd.read_json(path, lines=True, chunksize=chunksize)
+        elif suffix == '.json':
+            reader = _slices(pd.read_json(path), chunksize)
+        elif suffix in ('.parquet', '.pq'):
+            reader = self._parquet(path, chunksize, columns)
+        else:
+            raise ValueError(f'Unsupported file type {suffix} for {location}')
+        yield from _limited(reader, rows, dtypes, columns)
+
+    def version(self, location: str) -> Hashable:
+        try:
+            stat = Path(location).stat()
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    @staticmethod
+    def _csv(
+        path: Path,
+        chunksize: int,
+        rows: Optional[int],
+        dtypes: Optional[Dtypes],
+        columns: Optional[List[str]],
+    ) -> Iterator[pd.DataFrame]:
+        dates = [c for c, t in (dtypes or {}).items() if _is_date(t)]
+        plain = {c: t for c, t in (dtypes or {}).items() if c not in dates}
+        return pd.read_csv(
+            path,
+            sep='\t' if path.suffix.lower() == '.tsv' else ',',
+            chunksize=chunksize,
+            dtype=plain or None,
+            parse_dates=dates or None,
+            usecols=columns,
+            nrows=rows,
+        )
+
+    @staticmethod
+    def _parquet(
+        path: Path, chunksize: int, columns: Optional[List[str]]
+    ) -> Iterator[pd.DataFrame]:
+        if pq is None:
+            raise ImportError('Reading Parquet requires pyarrow')
+        source = pq.ParquetFile(path, memory_map=True)
+        for batch in source.iter_batches(batch_size=chunksize, columns=columns):
+            yield batch.to_pandas()
+
+
+class MemoryProtocol(Protocol):
+    scheme = 'memory'
+
+    def __init__(self):
+        self._frames: Dict[str, pd.DataFrame] = {}
+        self._generations: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def put(self, name: str, df: pd.DataFrame) -> None:
+        with self._lock:
+            self._frames[name] = df
+            self._bump(name)
+
+    def remove(self, name: str) -> None:
+        with self._lock:
+            self._frames.pop(name, None)
+            self._bump(name)
+
+    def version(self, location: str) -> Hashable:
+        with self._lock:
+            return self._generations.get(location, 0)
+
+    def _bump(self, name: str) -> None:
+        self._generations[name] = self._generations.get(name, 0) + 1
+
+    @property
+    def names(self) -> List[str]:
+        return sorted(self._frames)
+
+    def chunks(
+        self,
+        location: str,
+        chunksize: int = CHUNK_ROWS,
+        rows: Optional[int] = None,
+        dtypes: Optional[Dtypes] = None,
+        columns: Optional[List[str]] = None,
+    ) -> Iterator[pd.DataFrame]:
+        df = self._frames.get(location)
+        if df is None:
+            raise FileNotFoundError(f'memory://{location} not found')
+        yield from _limited(_slices(df, chunksize), rows, dtypes, columns)
+
+
+class TxfProtocol(Protocol):
+    scheme = 'txf'
+
+    def chunks(
+        self,
+        location: str,
+        chunksize: int = CHUNK_ROWS,
+        rows: Optional[int] = None,
+        dtypes: Optional[Dtypes] = None,
+        columns: Optional[List[str]] = None,
+    ) -> Iterator[pd.DataFrame]:
+        fake = FAKE_DFS.get(location)
+        if fake is None:
+            raise ValueError(f'No DS could be found for txf://{location}')
+        df = fake(TXF_ROWS if rows is None else rows)
+        yield from _limited(_slices(df, chunksize), None, dtypes, columns)
+
+
+PROTOCOLS: Dict[str, Protocol] = {
+    'file': FileProtocol(),
+    'memory': MemoryProtocol(),
+    'txf': TxfProtocol(),
+}
+
+
+def register_protocol(scheme: str, protocol: Protocol) -> Protocol:
+    PROTOCOLS[scheme] = protocol
+    log.info(f'Protocol registered for {scheme}://')
+    return protocol
+
+
+def resolve(uri: str | Path) -> Tuple[Protocol, str]:
+    uri = str(uri)
+    scheme, sep, location = uri.partition('://')
+    if not sep:
+        return PROTOCOLS['file'], uri
+    protocol = PROTOCOLS.get(scheme)
+    if protocol is None:
+        raise ValueError(f'No protocol registered for {scheme}:// in {uri}')
+    return protocol, location
+
+
+def load(uri: str | Path, **options: Any) -> pd.DataFrame:
+    protocol, location = resolve(uri)
+    return protocol.load(location, **options)
+
+
+def version(uri: str | Path) -> Hashable:
+    protocol, location = resolve(uri)
+    return protocol.version(location)
+
+
+def chunks(uri: str | Path, **options: Any) -> Iterator[pd.DataFrame]:
+    protocol, location = resolve(uri)
+    return protocol.chunks(location, **options)
+
+
+def _slices(df: pd.DataFrame, size: int) -> Iterator[pd.DataFrame]:
+    for start in range(0, max(len(df), 1), size):
+        yield df.iloc[start : start + size]
+
+
+def _limited(
+    parts: Iterator[pd.DataFrame],
+    rows: Optional[int],
+    dtypes: Optional[Dtypes],
+    columns: Optional[List[str]],
+) -> Iterator[pd.DataFrame]:
+    remaining = rows
+    for part in parts:
+        chunk = part if remaining is None else part.iloc[:remaining]
+        if columns:
+            chunk = chunk[columns]
+        yield _hinted(chunk, dtypes)
+        if remaining is not None:
+            remaining -= len(chunk)
+            if remaining <= 0:
+                return
+
+
+def _hinted(df: pd.DataFrame, dtypes: Optional[Dtypes]) -> pd.DataFrame:
+    hints = {
+        c: t
+        for c, t in (dtypes or {}).items()
+        if c in df.columns and str(df[c].dtype) != t
+    }
+    if not hints:
+        return df
+    return df.assign(
+        **{
+            c: pd.to_datetime(df[c]) if _is_date(t) else df[c].astype(t)
+            for c, t in hints.items()
+        }
+    )
+
+
+def _is_date(dtype: str) -> bool:
+    return dtype == 'date' or dtype.startswith('datetime')
@@ -1,7 +1,9 @@
+from proxies.ds_arrow import DSArrow
 from proxies.ds_legacy import DSLegacy
 from proxies.widget_legacy import WidgetLegacy
 
 PROXY_MAP = {
     'DSProxy': DSLegacy,
+    'ArrowProxy': DSArrow,
     'WidgetProxy': WidgetLegacy,
 }
@@ -0,0 +1,353 @@
+import argparse
+import asyncio
+import hashlib
+import json
+from functools import partial
+from http import HTTPStatus
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from xds.utils.io import parser
+from xds.utils.logger import log
+from xds.utils.metrics import METRICS
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+HOST = '127.0.0.1'
+PORT = 8765
+KEEPALIVE_SECS = 15.0
+ROW_CHUNK = 1000
+MAX_HEADER_LINES = 100
+
+
+class Request(NamedTuple):
+    method: str
+    path: str
+    query: Dict[str, List[str]]
+    headers: Dict[str, str]
+    body: bytes
+
+
+class Response(NamedTuple):
+    status: int
+    body: bytes | Iterable[bytes] = b''
+    headers: Optional[Dict[str, str]] = None
+    ctype: str = 'application/json'
+
+
+class HttpError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def dumps(data: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(data, default=str, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, default=str).encode('utf-8')
+
+
+def etag(body: bytes) -> str:
+    return f'"{hashlib.blake2b(body, digest_size=12).hexdigest()}"'
+
+
+class Service:
+    def __init__(
+        self,
+        dynamo: Any = None,
+        host: str = HOST,
+        port: int = PORT,
+        keepalive: float = KEEPALIVE_SECS,
+        row_chunk: int = ROW_CHUNK,
+    ):
+        if dynamo is None:
+            from xds.core.dynamo import Dynamo  # noqa: PLC0415
+
+            dynamo = Dynamo()
+        self.dynamo = dynamo
+        self.host = host
+        self.port = port
+        self.keepalive = keepalive
+        self.row_chunk = row_chunk
+        self.server: Optional[asyncio.Server] = None
+        self._schemas: Dict[str, Tuple[int, bytes, str]] = {}
+        self.routes = [
+            ('GET', 'models', self.get_model),
+            ('GET', 'instances', self.get_instance),
+            ('POST', 'instances', self.post_instances),
+            ('GET', 'ds', self.get_rows),
+            ('GET', 'metrics', self.get_metrics),
+        ]
+
+    async def start(self) -> asyncio.Server:
+        self.server = await asyncio.start_server(
+            self._client, self.host, self.port
+        )
+        self.port = self.server.sockets[0].getsockname()[1]
+        log.info(f'Dynamo service listening on http://{self.host}:{self.port}')
+        return self.server
+
+    async def serve_forever(self) -> None:
+        server = self.server or await self.start()
+        async with server:
+            await server.serve_forever()
+
+    async def close(self) -> None:
+        if self.server:
+            self.server.close()
+            await self.server.wait_closed()
+
+    async def _client(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            while True:
+                try:
+                    req = await asyncio.wait_for(
+                        self._read_request(reader), self.keepalive
+                    )
+                except (asyncio.TimeoutError, asyncio.IncompleteReadError):
+                    break
+                except HttpError as e:
+                    await self._write(writer, _UNREAD, _error(e), keep=False)
+                    break
+                if req is None:
+                    break
+                resp = await self._dispatch(req)
+                keep = req.headers.get('connection', '').lower() != 'close'
+                await self._write(writer, req, resp, keep)
+                if not keep:
+                    break
+        except (ConnectionError, HttpError, asyncio.CancelledError) as e:
+            log.debug(f'Client connection dropped: {e!r}')
+        finally:
+            writer.close()
+
+    async def _read_request(
+        self, reader: asyncio.StreamReader
+    ) -> Optional[Request]:
+        line = await reader.readline()
+        if not line.strip():
+            return None
+        try:
+            method, target, _ = line.decode('latin-1').split(' ', 2)
+        except ValueError:
+            raise HttpError(400, 'Malformed request line') from None
+        headers: Dict[str, str] = {}
+        for _ in range(MAX_HEADER_LINES):
+            hline = await reader.readline()
+            if hline in (b'\r\n', b'\n', b''):
+                break
+            key, _, val = hline.decode('latin-1').partition(':')
+            headers[key.strip().lower()] = val.strip()
+        size = _count(headers.get('content-length', '0'), 'Content-Length')
+        body = await reader.readexactly(size) if size else b''
+        url = urlsplit(target)
+        return Request(
+            method.upper(),
+            unquote(url.path),
+            parse_qs(url.query),
+            headers,
+            body,
+        )
+
+    async def _dispatch(self, req: Request) -> Response:
+        parts = [p for p in req.path.split('/') if p]
+        try:
+            if not parts:
+                raise HttpError(404, 'No resource requested')
+            handlers = [
+                fn
+                for m, res, fn in self.routes
+                if res == parts[0] and m == req.method
+            ]
+            if not handlers:
+                known = any(res == parts[0] for _, res, _ in self.routes)
+                raise HttpError(
+                    405 if known else 404, f'{req.method} {req.path}'
+                )
+            return await handlers[0](req, '/'.join(parts[1:]))
+        except HttpError as e:
+            return _error(e)
+        except Exception as e:
+            log.error(f'Error serving {req.method} {req.path}: {e}')
+            return Response(500, dumps({'error': str(e)}))
+
+    async def _write(
+        self,
+        writer: asyncio.StreamWriter,
+        req: Request,
+        resp: Response,
+        keep: bool,
+    ) -> None:
+        headers = {
+            'Content-Type': resp.ctype,
+            'Connection': 'keep-alive' if keep else 'close',
+            **(resp.headers or {}),
+        }
+        body = resp.body
+        if isinstance(body, bytes) and req.method == 'GET':
+            tag = headers.setdefault('ETag', etag(body))
+            if req.headers.get('if-none-match') == tag:
+                resp, body = resp._replace(status=304), b''
+        chunked = not isinstance(body, bytes)
+        if chunked:
+            headers['Transfer-Encoding'] = 'chunked'
+        else:
+            headers['Content-Length'] = str(len(body))
+        status = HTTPStatus(resp.status)
+        head = [f'HTTP/1.1 {status.value} {status.phrase}']
+        head += [f'{k}: {v}' for k, v in headers.items()]
+        writer.write(('\r\n'.join(head) + '\r\n\r\n').encode('latin-1'))
+        if not chunked:
+            writer.write(body)
+            await writer.drain()
+            return
+        loop = asyncio.get_running_loop()
+        chunks = iter(body)
+        while True:
+            chunk = await loop.run_in_executor(None, next, chunks, None)
+            if chunk is None:
+                break
+            writer.write(b'%x\r\n%s\r\n' % (len(chunk), chunk))
+            await writer.drain()
+        writer.write(b'0\r\n\r\n')
+        await writer.drain()
+
+    async def _run(self, fn: Any, *args: Any, **kwargs: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, partial(fn, *args, **kwargs))
+
+    async def get_model(self, req: Request, kind: str) -> Response:
+        model = self.dynamo.model(kind)
+        if model is None:
+            raise HttpError(404, f'Model {kind} not found')
+        cached = self._schemas.get(kind.lower())
+        if cached is None or cached[0] != id(model):
+            body = await self._run(self._model_doc, model)
+            cached = (id(model), body, etag(body))
+            self._schemas[kind.lower()] = cached
+        _, body, tag = cached
+        return Response(200, body, {'ETag': tag, 'Cache-Control': 'no-cache'})
+
+    @staticmethod
+    def _model_doc(model: Any) -> bytes:
+        try:
+            schema = model.model_json_schema()
+        except Exception as e:
+            log.error(f'JSON schema unavailable for {model.__name__}: {e}')
+            schema = None
+        return dumps(
+            {'kind': model.__name__, 'schema': schema, 'meta': model.meta}
+        )
+
+    async def get_instance(self, req: Request, nsid: str) -> Response:
+        inst = self._instance(nsid)
+        return Response(200, dumps(inst.model_dump(mode='json')))
+
+    async def post_instances(self, req: Request, kind: str) -> Response:
+        if not kind:
+            raise HttpError(400, 'POST /instances/<kind> requires a kind')
+        try:
+            payload = parser(buffer=req.body) if req.body.strip() else None
+        except ValueError as e:
+            raise HttpError(400, f'Invalid body: {e}') from None
+        records = payload if isinstance(payload, list) else [payload]
+        if not all(isinstance(r, dict) for r in records):
+            raise HttpError(400, 'Body must be an object or list of objects')
+        created, errors = await self._run(self._register, kind, records)
+        status = 201 if not errors else 207 if created else 400
+        return Response(status, dumps({'created': created, 'errors': errors}))
+
+    def _register(
+        self, kind: str, records: List[Dict[str, Any]]
+    ) -> Tuple[List[str], Dict[int, str]]:
+        created, errors = [], {}
+        for idx, rec in enumerate(records):
+            try:
+                created.append(
+                    self.dynamo.register_instance(kind, data=rec).nsid
+                )
+            except Exception as e:
+                errors[idx] = f'{type(e).__name__}: {e}'
+        return created, errors
+
+    async def get_rows(self, req: Request, target: str) -> Response:
+        nsid, _, leaf = target.rpartition('/')
+        if leaf != 'rows' or not nsid:
+            raise HttpError(404, 'Use GET /ds/<nsid>/rows')
+        inst = self._instance(nsid)
+        limit = req.query.get('limit')
+        limit = _count(limit[0], 'limit') if limit else None
+        # The first df access builds the proxy and loads the whole dataset.
+        df = await self._run(_head, inst, limit)
+        if df is None:
+            raise HttpError(404, f'{nsid} has no dataset')
+        return Response(200, self._rows(df), ctype='application/x-ndjson')
+
+    def _rows(self, df: Any) -> Iterable[bytes]:
+        for start in range(0, len(df), self.row_chunk):
+            chunk = df.iloc[start : start + self.row_chunk]
+            lines = chunk.to_json(
+                orient='records',
+                lines=True,
+                date_format='iso',
+                default_handler=str,
+            )
+            yield lines.rstrip('\n').encode('utf-8') + b'\n'
+
+    async def get_metrics(self, req: Request, _: str) -> Response:
+        body = METRICS.prometheus().encode('utf-8')
+        return Response(200, body, ctype='text/plain; version=0.0.4')
+
+    def _instance(self, nsid: str) -> Any:
+        key = nsid if nsid.startswith('instances/') else f'instances/{nsid}'
+        inst = self.dynamo.obj(key)
+        if inst is None:
+            raise HttpError(404, f'Instance {nsid} not found')
+        return inst
+
+
+_UNREAD = Request('', '', {}, {}, b'')
+
+
+def _error(e: HttpError) -> Response:
+    return Response(e.status, dumps({'error': str(e)}))
+
+
+def _count(value: str, what: str) -> int:
+    try:
+        count = int(value)
+    except ValueError:
+        count = -1
+    if count < 0:
+        raise HttpError(400, f'Invalid {what} {value!r}')
+    return count
+
+
+def _head(inst: Any, limit: Optional[int]) -> Any:
+    df = getattr(inst, 'df', None)
+    return df if df is None or limit is None else df.head(limit)
+
+
+async def serve(dynamo: Any = None, host: str = HOST, port: int = PORT) -> None:
+    await Service(dynamo, host=host, port=port).serve_forever()
+
+
+def main(argv: Optional[list] = None) -> None:
+    cli = argparse.ArgumentParser(description='Serve the Dynamo registry')
+    cli.add_argument('--host', default=HOST)
+    cli.add_argument('--port', type=int, default=PORT)
+    cli.add_argument('--bundle', default=None)
+    args = cli.parse_args(argv)
+    from xds.core.dynamo import Dynamo  # noqa: PLC0415
+
+    dynamo = Dynamo(bundle=args.bundle) if args.bundle else Dynamo()
+    asyncio.run(serve(dynamo, host=args.host, port=args.port))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,27 +1,191 @@
-from typing import Any, Callable, Dict, List
+from concurrent.futures import (
+    Executor,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    as_completed,
+)
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
 
+import pandas as pd
 from pydantic import BaseModel
 
+from xds.utils.helpers import fingerprint
+from xds.utils.results import RESULTS, ResultCache
+
+CHUNKSIZE = 64
+
+Call = Tuple[int, List[Any], Dict[str, Any]]
+
+
+class XResult(NamedTuple):
+    index: int
+    value: Any = None
+    error: Optional[BaseException] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
 
 class XCallable(BaseModel):
     ns: str
     args: List[Any] = []
     kwargs: Dict[str, Any] = {}
     fn: Callable = None
+    cache: bool = False
+    ttl: Optional[float] = None
 
     def __init__(
         self,
         ns: str,
         args: List[Any] | None = None,
         kwargs: Dict[str, Any] | None = None,
+        **rest: Any,
     ):
-        super().__init__(ns=ns, args=args or [], kwargs=kwargs or {})
+        super().__init__(ns=ns, args=args or [], kwargs=kwargs or {}, **rest)
+
+    @property
+    def key(self) -> str:
+        return self._key(self.args, self.kwargs)
 
-    def __call__(self) -> Any:
-        ret_type = self.kwargs.get('rtype', Any)
+    def _key(self, args: List[Any], kwargs: Dict[str, Any]) -> str:
+        return fingerprint([self.fn, self.ns, args, kwargs])
+
+    def __call__(self, results: Optional[ResultCache] = None) -> Any:
+        if not self.cache:
+            return self._invoke()
+        results = results or RESULTS
+        key = self.key
+        hit, xret = results.get(key)
+        if not hit:
+            xret = self._invoke()
+            results.put(key, xret, ttl=self.ttl)
+        return _detach(xret)
+
+    def _invoke(self) -> Any:
         xret = self.fn(self.ns, *self.args, **self.kwargs)
-        if not isinstance(xret, ret_type):
-            raise TypeError(
-                f'Expected a {ret_type.__name__}, got {type(xret).__name__}'
-            )
+        error = _type_error(self.kwargs.get('rtype', Any), type(xret))
+        if error:
+            raise error
         return xret
+
+    def map(
+        self,
+        arg_sets: Iterable[Any],
+        chunksize: int = CHUNKSIZE,
+        executor: str = 'thread',
+        workers: Optional[int] = None,
+        results: Optional[ResultCache] = None,
+    ) -> List[XResult]:
+        done = self.imap(arg_sets, chunksize, executor, workers, results)
+        return sorted(done, key=lambda r: r.index)
+
+    def imap(
+        self,
+        arg_sets: Iterable[Any],
+        chunksize: int = CHUNKSIZE,
+        executor: str = 'thread',
+        workers: Optional[int] = None,
+        results: Optional[ResultCache] = None,
+    ) -> Iterator[XResult]:
+        # Each arg set is a dict of kwargs overrides, a tuple/list of
+        # positional args, or a single positional arg. Results are yielded
+        # as their chunk completes; failures are returned, not raised.
+        if executor not in ('thread', 'process'):
+            raise ValueError(f'Unknown executor {executor}')
+        if chunksize < 1:
+            raise ValueError(f'chunksize must be positive, got {chunksize}')
+        results = results or RESULTS
+        keys: Dict[int, str] = {}
+        calls: List[Call] = []
+        for idx, arg_set in enumerate(arg_sets):
+            args, kwargs = self._bind(arg_set)
+            if self.cache:
+                keys[idx] = self._key(args, kwargs)
+                hit, xret = results.get(keys[idx])
+                if hit:
+                    yield XResult(idx, _detach(xret))
+                    continue
+            calls.append((idx, args, kwargs))
+        if not calls:
+            return
+        rtype = self.kwargs.get('rtype', Any)
+        with _pool(executor, workers) as pool:
+            chunks = {
+                pool.submit(_run_chunk, self.fn, self.ns, chunk): chunk
+                for chunk in _chunks(calls, chunksize)
+            }
+            for future in as_completed(chunks):
+                try:
+                    done = future.result()
+                except Exception as e:
+                    done = [XResult(idx, error=e) for idx, *_ in chunks[future]]
+                for res in _validate(done, rtype):
+                    if not (self.cache and res.ok):
+                        yield res
+                        continue
+                    results.put(keys[res.index], res.value, ttl=self.ttl)
+                    yield res._replace(value=_detach(res.value))
+
+    def _bind(self, arg_set: Any) -> Tuple[List[Any], Dict[str, Any]]:
+        if isinstance(arg_set, dict):
+            return self.args, {**self.kwargs, **arg_set}
+        if isinstance(arg_set, (tuple, list)):
+            return list(arg_set), self.kwargs
+        return [arg_set], self.kwargs
+
+
+def _run_chunk(fn: Callable, ns: str, chunk: List[Call]) -> List[XResult]:
+    done = []
+    for idx, args, kwargs in chunk:
+        try:
+            done.append(XResult(idx, fn(ns, *args, **kwargs)))
+        except Exception as e:
+            done.append(XResult(idx, error=e))
+    return done
+
+
+def _validate(done: List[XResult], rtype: Any) -> List[XResult]:
+    # One subclass check per distinct result type in the chunk, not per item.
+    if rtype is Any:
+        return done
+    errors = {t: _type_error(rtype, t) for t in {type(r.value) for r in done}}
+    return [
+        r._replace(value=None, error=errors[type(r.value)])
+        if r.ok and errors[type(r.value)]
+        else r
+        for r in done
+    ]
+
+
+def _type_error(rtype: Any, got: type) -> Optional[TypeError]:
+    if rtype is Any or issubclass(got, rtype):
+        return None
+    return TypeError(f'Expected a {rtype.__name__}, got {got.__name__}')
+
+
+def _chunks(calls: List[Call], size: int) -> Iterator[List[Call]]:
+    for start in range(0, len(calls), size):
+        yield calls[start : start + size]
+
+
+def _pool(executor: str, workers: Optional[int]) -> Executor:
+    if executor == 'process':
+        return ProcessPoolExecutor(workers)
+    return ThreadPoolExecutor(workers)
+
+
+def _detach(xret: Any) -> Any:
+    if isinstance(xret, (pd.DataFrame, pd.Series)):
+        return xret.copy()
+    return xret
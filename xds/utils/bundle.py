@@ -0,0 +1,166 @@
+import argparse
+import hashlib
+import json
+import marshal
+import mmap
+import re
+import struct
+from collections.abc import Mapping
+from datetime import date, datetime, time
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional
+
+from xds.utils.io import parser
+from xds.utils.logger import log
+
+MAGIC = b'XDSB'
+FORMAT = 2
+_PREAMBLE = struct.Struct('<4sHI')
+_ENV_FILE = re.compile(r'^env\.(?P<name>[^.]+)\.ya?ml$')
+# YAML timestamps are stored as (type, isoformat) tuples, which parsed
+# YAML/JSON never produces, so payloads stay plain marshal data.
+_STAMPS = {'date': date, 'datetime': datetime, 'time': time}
+
+
+def catalogue_entries(blueprints: str, configs: str) -> Dict[str, Any]:
+    entries: Dict[str, Any] = {}
+    for what, dir in [('models', blueprints), ('configs', configs)]:
+        files = parser(dir)
+        if files.get('errors'):
+            raise ValueError(f'Failed to parse {dir}: {files["errors"]}')
+        for cfg in files['contents']:
+            entries[f'{what}/{cfg["kind"]}'.lower()] = cfg
+            envfile = _ENV_FILE.match(Path(cfg.get('path', '')).name)
+            if what == 'configs' and envfile:
+                entries[f'envs/{envfile["name"]}'] = cfg
+    return entries
+
+
+def build_bundle(
+    out: str | Path,
+    blueprints: str,
+    configs: str,
+    version: str = '0',
+) -> Dict[str, Any]:
+    entries = catalogue_entries(blueprints, configs)
+    index: Dict[str, Any] = {}
+    payloads = []
+    offset = 0
+    for key in sorted(entries):
+        payload = _pack(key, entries[key])
+        index[key] = [offset, len(payload)]
+        payloads.append(payload)
+        offset += len(payload)
+    body = b''.join(payloads)
+    header = {
+        'version': version,
+        'hash': hashlib.sha256(body).hexdigest(),
+        'index': index,
+    }
+    hbytes = json.dumps(header, sort_keys=True).encode('utf-8')
+    out = Path(out)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    with open(out, 'wb') as fp:
+        fp.write(_PREAMBLE.pack(MAGIC, FORMAT, len(hbytes)))
+        fp.write(hbytes)
+        fp.write(body)
+    log.info(
+        f'Bundled {len(index)} entries from {blueprints}, {configs} into '
+        f'{out} ({_PREAMBLE.size + len(hbytes) + len(body)} bytes)'
+    )
+    return {k: v for k, v in header.items() if k != 'index'}
+
+
+class Bundle(Mapping):
+    def __init__(self, path: str | Path, verify: bool = True):
+        self.path = Path(path)
+        with open(self.path, 'rb') as fp:
+            self._mm = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(self._mm)
+        magic, fmt, hlen = _PREAMBLE.unpack_from(view)
+        if magic != MAGIC or fmt != FORMAT:
+            raise ValueError(f'{path} is not a format {FORMAT} XDS bundle')
+        start = _PREAMBLE.size
+        header = json.loads(bytes(view[start : start + hlen]))
+        self._body = view[start + hlen :]
+        self.version: str = header['version']
+        self.hash: str = header['hash']
+        self._index: Dict[str, Any] = header['index']
+        if verify and hashlib.sha256(self._body).hexdigest() != self.hash:
+            raise ValueError(f'Bundle {path} content hash mismatch')
+        log.info(f'Loaded bundle {path} v{self.version} ({len(self)} entries)')
+
+    def __getitem__(self, key: str) -> Any:
+        offset, length = self._index[key]
+        return _unpack(self._body[offset : offset + length])
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._index)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+
+def _pack(key: str, entry: Any) -> bytes:
+    try:
+        return marshal.dumps(_encode(entry))
+    except ValueError as e:
+        raise ValueError(f'Bundle entry {key} is not YAML/JSON data') from e
+
+
+def _unpack(payload: memoryview) -> Any:
+    return _decode(marshal.loads(payload))
+
+
+def _encode(data: Any) -> Any:
+    if isinstance(data, dict):
+        return {_encode(k): _encode(v) for k, v in data.items()}
+    if isinstance(data, list):
+        return [_encode(v) for v in data]
+    if type(data) in _STAMPS.values():
+        return (type(data).__name__, data.isoformat())
+    return data
+
+
+def _decode(data: Any) -> Any:
+    if isinstance(data, dict):
+        return {_decode(k): _decode(v) for k, v in data.items()}
+    if isinstance(data, list):
+        return [_decode(v) for v in data]
+    if isinstance(data, tuple):
+        kind, iso = data
+        return _STAMPS[kind].fromisoformat(iso)
+    return data
+
+
+def load_bundle(path: str | Path, verify: bool = True) -> Bundle:
+    return Bundle(path, verify=verify)
+
+
+def main(argv: Optional[list] = None) -> None:
+    from xds.core.dynamo import BLUEPRINTS, CONFIGS  # noqa: PLC0415
+
+    cli = argparse.ArgumentParser(description='Build/inspect XDS bundles')
+    cmds = cli.add_subparsers(dest='cmd', required=True)
+    build = cmds.add_parser('build')
+    build.add_argument('out')
+    build.add_argument('--blueprints', default=BLUEPRINTS)
+    build.add_argument('--configs', default=CONFIGS)
+    build.add_argument('--version', default='0')
+    info = cmds.add_parser('info')
+    info.add_argument('bundle')
+    args = cli.parse_args(argv)
+
+    if args.cmd == 'build':
+        meta = build_bundle(
+            args.out, args.blueprints, args.configs, version=args.version
+        )
+        print(json.dumps(meta))
+    else:
+        bundle = load_bundle(args.bundle)
+        meta = {'version': bundle.version, 'hash': bundle.hash}
+        print(json.dumps({**meta, 'keys': list(bundle)}))
+
+
+if __name__ == '__main__':
+    main()
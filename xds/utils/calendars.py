@@ -0,0 +1,141 @@
+import threading
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from xds.utils.io import parser
+from xds.utils.logger import log
+
+CALENDARS_FILE = 'xds/configs/calendars.yaml'
+DEFAULT_CALENDAR = 'default'
+WEEKMASK = 'Mon Tue Wed Thu Fri'
+SPAN = ('1990-01-01', '2100-01-01')
+
+
+class BusinessCalendar:
+    def __init__(
+        self,
+        name: str,
+        weekmask: str = WEEKMASK,
+        holidays: Optional[List[Any]] = None,
+        start: str = SPAN[0],
+        end: str = SPAN[1],
+    ):
+        self.name = name
+        self.weekmask = weekmask
+        self.holidays = np.unique(np.asarray(holidays or [], dtype='M8[D]'))
+        self.start = np.datetime64(start, 'D')
+        self.end = np.datetime64(end, 'D')
+        days = np.arange(self.start, self.end, dtype='M8[D]')
+        busdays = np.is_busday(days, weekmask=weekmask, holidays=self.holidays)
+        # Sorted business-day ordinals; every lookup is a searchsorted.
+        self.ordinals: np.ndarray = days[busdays].astype(np.int64)
+        log.info(
+            f'Calendar {name} compiled: {len(self.ordinals)} business days, '
+            f'{len(self.holidays)} holidays'
+        )
+
+    def is_busday(self, days: Any) -> Any:
+        ords, nat, scalar = self._ordinals(days)
+        idx = np.searchsorted(self.ordinals, ords)
+        found = self.ordinals[np.minimum(idx, len(self.ordinals) - 1)] == ords
+        return bool(found) if scalar else found & ~nat
+
+    def next(self, days: Any) -> Any:
+        ords, nat, scalar = self._ordinals(days)
+        return self._pick(np.searchsorted(self.ordinals, ords), nat, scalar)
+
+    def prev(self, days: Any) -> Any:
+        ords, nat, scalar = self._ordinals(days)
+        idx = np.searchsorted(self.ordinals, ords, side='right') - 1
+        return self._pick(idx, nat, scalar)
+
+    def add(self, days: Any, n: int) -> Any:
+        # n > 0: the nth business day after each date, n < 0: before it,
+        # n == 0: the date itself rolled forward to a business day.
+        ords, nat, scalar = self._ordinals(days)
+        if n > 0:
+            idx = np.searchsorted(self.ordinals, ords, side='right') + n - 1
+        else:
+            idx = np.searchsorted(self.ordinals, ords) + n
+        return self._pick(idx, nat, scalar)
+
+    def count(self, start: Any, end: Any) -> Any:
+        # Business days in [start, end), negative when end < start.
+        sords, snat, _ = self._ordinals(start)
+        eords, enat, _ = self._ordinals(end)
+        counts = np.searchsorted(self.ordinals, eords) - np.searchsorted(
+            self.ordinals, sords
+        )
+        nat = snat | enat
+        if np.ndim(counts) == 0:
+            return None if nat else int(counts)
+        return np.where(nat, np.nan, counts) if nat.any() else counts
+
+    def _ordinals(self, days: Any) -> Any:
+        arr = np.asarray(days, dtype='M8[D]')
+        nat = np.isnat(arr)
+        live = arr[~nat]
+        if len(live) and (live.min() < self.start or live.max() >= self.end):
+            raise ValueError(
+                f'Dates outside calendar {self.name} span '
+                f'{self.start} - {self.end}'
+            )
+        return arr.astype(np.int64), nat, arr.ndim == 0
+
+    def _pick(self, idx: np.ndarray, nat: np.ndarray, scalar: bool) -> Any:
+        if np.any(((idx < 0) | (idx >= len(self.ordinals))) & ~nat):
+            raise ValueError(f'Result outside calendar {self.name} span')
+        out = self.ordinals[np.clip(idx, 0, len(self.ordinals) - 1)]
+        out = np.where(nat, np.datetime64('NaT', 'D'), out.astype('M8[D]'))
+        return out.item() if scalar else out
+
+
+class Calendars:
+    def __init__(self, path: Optional[str] = CALENDARS_FILE):
+        self.path = path
+        self._specs: Optional[Dict[str, Dict[str, Any]]] = None
+        self._compiled: Dict[str, BusinessCalendar] = {}
+        self._lock = threading.Lock()
+        # Bumped on every load; memoized date results key on it.
+        self.generation = 0
+
+    def load(self, config: Dict[str, Any]) -> None:
+        with self._lock:
+            self._specs = dict(config.get('calendars') or {})
+            self._compiled = {}
+            self.generation += 1
+        log.info(f'Calendars configured: {sorted(self._specs)}')
+
+    @property
+    def names(self) -> List[str]:
+        return sorted(self._spec_map())
+
+    def __getitem__(self, name: Optional[str]) -> BusinessCalendar:
+        name = name or DEFAULT_CALENDAR
+        cal = self._compiled.get(name)
+        if cal is not None:
+            return cal
+        spec = self._spec_map().get(name)
+        if spec is None:
+            raise ValueError(f'Unknown calendar {name}')
+        with self._lock:
+            cal = self._compiled.get(name)
+            if cal is None:
+                cal = BusinessCalendar(name, **spec)
+                self._compiled[name] = cal
+        return cal
+
+    def _spec_map(self) -> Dict[str, Dict[str, Any]]:
+        if self._specs is None:
+            config = parser(self.path) if self.path else {}
+            self.load(config if isinstance(config, dict) else {})
+        return self._specs
+
+
+CALENDARS = Calendars()
+
+
+def calendar(name: Optional[str] = None) -> BusinessCalendar:
+    return CALENDARS[name]
+
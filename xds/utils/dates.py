@@ -1,28 +1,133 @@
 import re
+from contextlib import contextmanager
+from contextvars import ContextVar
 from datetime import date, datetime
-from typing import Optional
+from functools import lru_cache
+from typing import Any, Iterator, NamedTuple, Optional
 
+import numpy as np
+import pandas as pd
 from dateutil.relativedelta import relativedelta
-from icecream import ic
+
+from xds.utils.calendars import CALENDARS
 
 _DATE_MODIFIER = re.compile(r'([TBDWMQY])*([+-])*(\d+)*([DWMQY])*([SE])*')
+_DAY = np.timedelta64(1, 'D')
+_PERIOD_UNITS = 'TDWMQY'
+AS_OF: ContextVar[Optional[date]] = ContextVar('xds_as_of', default=None)
+
+
+class DatePlan(NamedTuple):
+    pattern: str
+    units: str
+    terms: Optional[str]
+    multiplier: int
+    adjust: Optional[str]
+    tail: str
 
 
-def date_modifier(date_pattern: str, dt: Optional[str] = None) -> str:
-    base_date = datetime.strptime(dt, '%Y-%m-%d').date() if dt else date.today()
-    match = re.match(_DATE_MODIFIER, date_pattern.upper())
+@lru_cache(maxsize=1024)
+def date_plan(date_pattern: str) -> DatePlan:
+    pattern = date_pattern.upper()
+    match = re.match(_DATE_MODIFIER, pattern)
     if not match:
         raise ValueError('Invalid date shortcut format')
-
     period_type, sign, terms, units, adjust = match.groups()
-    sign = sign or '+'
     multiplier = -1 if sign == '-' else 1
     units = units if units else period_type or 'D'
+    tail = pattern[match.end() :]
+    return DatePlan(date_pattern, units, terms, multiplier, adjust, tail)
+
+
+class DateExpr(NamedTuple):
+    plan: DatePlan
+    calendar: Optional[str] = None
+
+    @classmethod
+    def compile(
+        cls, date_pattern: str, calendar: Optional[str] = None
+    ) -> 'DateExpr':
+        return _compile(date_pattern, calendar, CALENDARS.generation)
+
+    @property
+    def pattern(self) -> str:
+        return self.plan.pattern
+
+    def __call__(self, base: Optional[date] = None) -> date:
+        base = base or AS_OF.get() or date.today()
+        return _evaluate(self, base, CALENDARS.generation)
+
+    def iso(self, base: Optional[date] = None) -> str:
+        return self(base).strftime('%Y-%m-%d')
+
+    def vec(self, dates: Any) -> Any:
+        return date_modifier_vec(self.pattern, dates, calendar=self.calendar)
+
+
+@lru_cache(maxsize=1024)
+def _compile(
+    date_pattern: str, calendar: Optional[str], generation: int
+) -> DateExpr:
+    plan = date_plan(date_pattern)
+    pattern = date_pattern.upper()
+    if 'E' in pattern and 'S' in pattern:
+        raise ValueError(f'Cannot specify both E and S in {date_pattern}')
+    if plan.units not in _PERIOD_UNITS:
+        raise ValueError(f'Invalid period unit in {date_pattern}')
+    if plan.tail.strip('B'):
+        raise ValueError(f'Unparsed {plan.tail!r} in {date_pattern}')
+    quarter = int(plan.terms or 1) if plan.units == 'Q' else 1
+    if not 1 <= quarter <= 4:  # noqa: PLR2004
+        raise ValueError(f'Invalid quarter in {date_pattern}')
+    if calendar:
+        CALENDARS[calendar]  # unknown names fail here, not on first use
+    return DateExpr(plan, calendar)
+
+
+@lru_cache(maxsize=65536)
+def _evaluate(expr: DateExpr, base: date, generation: int) -> date:
+    # generation ties memoized results to the calendars they were built on.
+    plan = expr.plan
+    day = dated(base, plan.units, plan.terms, plan.multiplier)
+    return move_date(
+        day, plan.pattern.upper(), plan.multiplier, calendar=expr.calendar
+    )
+
+
+@contextmanager
+def as_of(day: date | str) -> Iterator[date]:
+    if isinstance(day, str):
+        day = datetime.strptime(day, '%Y-%m-%d').date()
+    token = AS_OF.set(day)
+    try:
+        yield day
+    finally:
+        AS_OF.reset(token)
+
+
+def date_modifier(
+    date_pattern: str, dt: Optional[str] = None, calendar: Optional[str] = None
+) -> str:
+    base_date = datetime.strptime(dt, '%Y-%m-%d').date() if dt else None
+    return DateExpr.compile(date_pattern, calendar).iso(base_date)
 
-    ic(date_pattern, base_date, sign, multiplier, terms, units, adjust)
-    result_date = dated(base_date, units, terms, multiplier)
-    result_date = move_date(result_date, date_pattern, multiplier)
-    return result_date.strftime('%Y-%m-%d')
+
+def date_modifier_vec(
+    date_pattern: str, dates: Any, calendar: Optional[str] = None
+) -> Any:
+    plan = DateExpr.compile(date_pattern, calendar).plan
+    series = dates if isinstance(dates, pd.Series) else None
+    if series is not None:
+        days = pd.to_datetime(series).to_numpy().astype('M8[D]')
+    else:
+        days = np.asarray(dates, dtype='M8[D]')
+    result = dated_vec(days, plan.units, plan.terms, plan.multiplier)
+    result = move_date_vec(
+        result, plan.pattern.upper(), plan.multiplier, calendar=calendar
+    )
+    if series is not None:
+        return pd.Series(result, index=series.index, name=series.name)
+    return result
 
 
 def dated(
@@ -52,7 +157,45 @@ def dated(
     raise ValueError('Invalid period unit')
 
 
-def move_date(base_date: date, pattern: str, mult: int) -> date:
+def dated_vec(
+    days: np.ndarray, period_unit: str, terms: Optional[str], multiplier: int
+) -> np.ndarray:
+    if period_unit == 'Y':
+        return (days.astype('M8[Y]') + 1).astype('M8[D]') - _DAY
+    if period_unit == 'Q':
+        years = days.astype('M8[Y]').astype('M8[M]')
+        if terms:
+            qtr = int(terms)
+            if not 1 <= qtr <= 4:  # noqa: PLR2004
+                raise ValueError(f'Invalid quarter {terms}')
+        else:
+            months = (days.astype('M8[M]') - years).astype(int)
+            qtr = months // 3 + 1
+        return (years + qtr * 3).astype('M8[D]') - _DAY
+    periods = int(terms or 0) * multiplier
+    if period_unit == 'T':
+        return days
+    if period_unit == 'D':
+        return days + periods * _DAY
+    if period_unit == 'W':
+        return days + periods * 7 * _DAY
+    if period_unit == 'M':
+        return add_months(days, periods)
+    raise ValueError('Invalid period unit')
+
+
+def add_months(days: np.ndarray, months: int) -> np.ndarray:
+    # Same clamping as relativedelta: keep the day, capped at month end.
+    start = days.astype('M8[M]')
+    target = start + months
+    tdays = target.astype('M8[D]')
+    last = (target + 1).astype('M8[D]') - _DAY
+    return np.minimum(tdays + (days - start.astype('M8[D]')), last)
+
+
+def move_date(
+    base_date: date, pattern: str, mult: int, calendar: Optional[str] = None
+) -> date:
     if 'E' in pattern and 'S' in pattern:
         raise ValueError('Cannot specify both E and S')
     if 'S' in pattern:
@@ -61,7 +204,28 @@ def move_date(base_date: date, pattern: str, mult: int) -> date:
         base_date = (base_date + relativedelta(months=1)).replace(
             day=1
         ) - relativedelta(days=1)
+    if 'B' in pattern and calendar:
+        cal = CALENDARS[calendar]
+        return cal.prev(base_date) if mult < 0 else cal.next(base_date)
     if 'B' in pattern:
         while base_date.weekday() >= 5:  # noqa: PLR2004
             base_date += relativedelta(days=mult * 1)
     return base_date
+
+
+def move_date_vec(
+    days: np.ndarray, pattern: str, mult: int, calendar: Optional[str] = None
+) -> np.ndarray:
+    if 'E' in pattern and 'S' in pattern:
+        raise ValueError('Cannot specify both E and S')
+    if 'S' in pattern:
+        days = days.astype('M8[M]').astype('M8[D]')
+    elif 'E' in pattern:
+        days = (days.astype('M8[M]') + 1).astype('M8[D]') - _DAY
+    if 'B' in pattern and calendar:
+        cal = CALENDARS[calendar]
+        return cal.prev(days) if mult < 0 else cal.next(days)
+    if 'B' in pattern:
+        roll = 'backward' if mult < 0 else 'forward'
+        days = np.busday_offset(days, 0, roll=roll)
+    return days
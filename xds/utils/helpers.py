@@ -1,36 +1,51 @@
 from __future__ import annotations
 
+import hashlib
+import os
+import pickle
 import re
-from functools import lru_cache
+import threading
+import types
+import weakref
 from pathlib import Path
 from pprint import pformat
-from typing import Any, ClassVar, Dict, List, Optional, Tuple, TypeAlias
+from typing import (
+    Any,
+    ClassVar,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    TypeAlias,
+)
 from urllib.parse import parse_qs, urlparse
 
 import flatten_dict
+import numpy as np
 import pandas as pd
+import yaml
 from flatten_dict import flatten, unflatten
 from flatten_dict.reducers import make_reducer
 from flatten_dict.splitters import make_splitter
 from icecream import ic
-from jinja2 import Environment, Template
-
-from xds.utils.io import io_buffer
-
-_NO_XLATIONS_SPECIALS = [
-    'LOB',
-    'PL',
-    'FX',
-    'PI',
-    'NS',
-    'NSID',
-    'UID',
-    'UUID',
-    'URI',
-    'ARGS',
-    'KWS',
-    'KWARGS',
-]
+from jinja2 import (
+    Environment,
+    FileSystemBytecodeCache,
+    FileSystemLoader,
+    Template,
+)
+from pydantic import BaseModel
+
+XLATIONS_FILE = Path(__file__).resolve().parents[1] / 'configs/xlations.yaml'
+_XLATE_WORD_SEP = re.compile(r'\W+')
+XLATE_MAPS_MAX = 256
+TEMPLATES = 'xds/catalogue/templates'
+JINJA_SUFFIX = '.jinja2'
+# Unset uses Jinja's own per-user 0700 cache dir; 'off' disables it.
+JINJA_CACHE_DIR = os.getenv('XDS_JINJA_CACHE')
+_JINJA_ENVS: Dict[str, Environment] = {}
+_JINJA_LOCK = threading.Lock()
 
 XlationMap: TypeAlias = Dict[str, Dict[str, str]]
 ic.configureOutput(prefix='DEBUG:', includeContext=True)
@@ -46,42 +61,159 @@ class SingletonMeta(type):
         return cls._instances[cls]
 
 
+PYTYPE_OVERRIDES = {
+    'datetime.date': 'date',
+    'pandas.core.frame.DataFrame': 'pd',
+}
+PYTYPE_SAMPLE = 64
+_DTYPE_KINDS = {
+    'i': 'int',
+    'u': 'int',
+    'f': 'float',
+    'b': 'bool',
+    'c': 'complex',
+    'M': 'pandas._libs.tslibs.timestamps.Timestamp',
+    'm': 'pandas._libs.tslibs.timedeltas.Timedelta',
+}
+_PYTYPES_CACHE: Dict[int, Tuple[Any, Tuple, Dict[str, str]]] = {}
+_PYTYPES_LOCK = threading.Lock()
+
+
 def df_pytypes(df: pd.DataFrame) -> Dict[str, str]:
-    overrides = {
-        'datetime.date': 'date',
-        'pandas.core.frame.DataFrame': 'pd',
-    }
+    sig = (len(df), tuple(df.columns), tuple(map(str, df.dtypes)))
+    key = id(df)
+    with _PYTYPES_LOCK:
+        cached = _PYTYPES_CACHE.get(key)
+    if cached and cached[0]() is df and cached[1] == sig:
+        return dict(cached[2])
     types = {
-        col: str(df[col].apply(type).unique()[0]).split("'")[1]
-        for col in df.columns
+        col: _pytype(df.iloc[:, idx]) for idx, col in enumerate(df.columns)
     }
-    for col, ptype in types.items():
-        if ptype in overrides:
-            types[col] = overrides[ptype]
-    return types
+    with _PYTYPES_LOCK:
+        if key not in _PYTYPES_CACHE:
+            weakref.finalize(df, _PYTYPES_CACHE.pop, key, None)
+        _PYTYPES_CACHE[key] = (weakref.ref(df), sig, types)
+    return dict(types)
+
+
+def _pytype(series: pd.Series) -> str:
+    dtype = series.dtype
+    if isinstance(dtype, pd.CategoricalDtype):
+        series = pd.Series(dtype.categories)
+        dtype = series.dtype
+    if isinstance(dtype, pd.StringDtype):
+        return 'str'
+    kind = getattr(dtype, 'kind', 'O')
+    if kind in _DTYPE_KINDS:
+        return _DTYPE_KINDS[kind]
+    return _probe_pytype(series)
+
+
+def _probe_pytype(series: pd.Series) -> str:
+    # Object columns: only look at a few values from each end of the column
+    # instead of calling type() on every cell.
+    sample = series
+    if len(series) > 2 * PYTYPE_SAMPLE:
+        sample = pd.concat(
+            [series.iloc[:PYTYPE_SAMPLE], series.iloc[-PYTYPE_SAMPLE:]]
+        )
+    values = sample.dropna().to_numpy()
+    if not len(values):
+        valid = series.notna().to_numpy()
+        if not valid.any():
+            return 'NoneType'
+        values = [series.iloc[valid.argmax()]]
+    ptypes = {type(val) for val in values}
+    if len(ptypes) > 1:
+        return 'mixed'
+    ptype = ptypes.pop()
+    name = ptype.__qualname__
+    if ptype.__module__ != 'builtins':
+        name = f'{ptype.__module__}.{name}'
+    return PYTYPE_OVERRIDES.get(name, name)
+
+
+def load_acronyms(path: str | Path = XLATIONS_FILE) -> frozenset:
+    with open(path, encoding='utf-8') as fp:
+        xlations = yaml.safe_load(fp) or {}
+    return frozenset(a.upper() for a in xlations.get('acronyms', []))
+
+
+ACRONYMS = load_acronyms()
+
+
+class Xlator:
+    def __init__(self, acronyms: Iterable[str] = ACRONYMS):
+        self._acronyms = frozenset(a.upper() for a in acronyms)
+        self._words: Dict[str, Tuple[str, str]] = {}
+        self._maps: Dict[Tuple[str, ...], Tuple[XlationMap, List[str]]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def acronyms(self) -> frozenset:
+        return self._acronyms
+
+    def set_acronyms(self, acronyms: Iterable[str], replace: bool = False):
+        acronyms = {a.upper() for a in acronyms}
+        with self._lock:
+            merged = frozenset(
+                acronyms if replace else self._acronyms | acronyms
+            )
+            if merged == self._acronyms:
+                return
+            self._acronyms = merged
+            self._words.clear()
+            self._maps.clear()
+
+    def xlate(self, val: str) -> Tuple[str, str]:
+        hit = self._words.get(val)
+        if hit is None:
+            var = _XLATE_WORD_SEP.sub('_', val).lower()
+            eng = ' '.join(
+                i.upper() if i.upper() in self._acronyms else i.title()
+                for i in var.split('_')
+            )
+            hit = self._words[val] = (var, eng)
+        return hit
+
+    def xlate_index(self, vals: Iterable[str]) -> List[str]:
+        return self._map(vals)[1]
+
+    def xlation_map(self, vals: Iterable[str]) -> XlationMap:
+        xlations = self._map(vals)[0]
+        return {k: dict(v) for k, v in xlations.items()}
+
+    def _map(self, vals: Iterable[str]) -> Tuple[XlationMap, List[str]]:
+        key = tuple(vals)
+        hit = self._maps.get(key)
+        if hit is None:
+            xlations: XlationMap = {'human': {}, 'var': {}}
+            names = []
+            for val in key:
+                var, eng = self.xlate(val)
+                xlations['human'][var] = eng
+                xlations['var'][eng] = var
+                xlations['var'][val] = var
+                names.append(var)
+            if len(self._maps) >= XLATE_MAPS_MAX:
+                self._maps.clear()
+            hit = self._maps[key] = (xlations, names)
+        return hit
+
+
+XLATOR = Xlator()
 
 
 def xlate(val: str) -> Tuple[str, str]:
-    var = re.sub(r'\W+', '_', val).lower()
-    arr: List[str] = [
-        i.upper() if i.upper() in _NO_XLATIONS_SPECIALS else i.title()
-        for i in var.split('_')
-    ]
-    eng = ' '.join(arr)
-    return var, eng
-
-
-def xlation_map(vals: List[str]) -> Dict[str, Dict[str, str]]:
-    xlations: Dict[str, Dict[str, str]] = {
-        'human': {},
-        'var': {},
-    }
-    for val in vals:
-        var, eng = xlate(val)
-        xlations['human'][var] = eng
-        xlations['var'][eng] = var
-        xlations['var'][val] = var
-    return xlations
+    return XLATOR.xlate(val)
+
+
+def xlate_index(vals: Iterable[str]) -> List[str]:
+    return list(XLATOR.xlate_index(vals))
+
+
+def xlation_map(vals: Iterable[str]) -> XlationMap:
+    return XLATOR.xlation_map(vals)
 
 
 def is_pivot(df: pd.DataFrame) -> bool:
@@ -103,13 +235,39 @@ def typed_list(
     return [dtype(v) for v in vals]
 
 
-@lru_cache(maxsize=100)
-def jinja_template(
-    template: str, tdir: str = 'xds/catalogue/templates'
-) -> Template:
-    jtemplate = f'{template}.jinja2'
-    tpath = f'{tdir}/{jtemplate}'
-    return Template(io_buffer(file=tpath), keep_trailing_newline=True)
+def jinja_env(tdir: str = TEMPLATES) -> Environment:
+    key = str(Path(tdir).resolve())
+    with _JINJA_LOCK:
+        env = _JINJA_ENVS.get(key)
+        if env is None:
+            env = Environment(
+                loader=FileSystemLoader(key),
+                bytecode_cache=_jinja_bytecode_cache(),
+                keep_trailing_newline=True,
+                auto_reload=False,
+                cache_size=-1,
+            )
+            _JINJA_ENVS[key] = env
+    return env
+
+
+def _jinja_bytecode_cache() -> Optional[FileSystemBytecodeCache]:
+    if JINJA_CACHE_DIR == 'off':
+        return None
+    if not JINJA_CACHE_DIR:
+        return FileSystemBytecodeCache()
+    Path(JINJA_CACHE_DIR).mkdir(mode=0o700, parents=True, exist_ok=True)
+    return FileSystemBytecodeCache(JINJA_CACHE_DIR)
+
+
+def jinja_preload(tdir: str = TEMPLATES) -> Dict[str, Template]:
+    env = jinja_env(tdir)
+    names = env.list_templates(filter_func=lambda n: n.endswith(JINJA_SUFFIX))
+    return {n[: -len(JINJA_SUFFIX)]: env.get_template(n) for n in names}
+
+
+def jinja_template(template: str, tdir: str = TEMPLATES) -> Template:
+    return jinja_env(tdir).get_template(f'{template}{JINJA_SUFFIX}')
 
 
 def jinja_render(
@@ -143,3 +301,84 @@ def dict_unflatten(
 
 def po(data: Any) -> str:
     return pformat(data)
+
+
+def fingerprint(obj: Any) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    _fingerprint(digest, obj)
+    return digest.hexdigest()
+
+
+def _fingerprint(digest: Any, obj: Any) -> None:
+    # Content hash: equal values hash equal across processes and runs.
+    if isinstance(obj, (pd.DataFrame, pd.Series, np.ndarray)):
+        _fingerprint_array(digest, obj)
+    elif isinstance(obj, dict):
+        digest.update(b'{')
+        for key in sorted(obj, key=repr):
+            _fingerprint(digest, key)
+            _fingerprint(digest, obj[key])
+        digest.update(b'}')
+    elif isinstance(obj, (list, tuple)):
+        digest.update(b'[' if isinstance(obj, list) else b'(')
+        for item in obj:
+            _fingerprint(digest, item)
+        digest.update(b']')
+    elif isinstance(obj, (set, frozenset)):
+        _fingerprint(digest, sorted(fingerprint(i) for i in obj))
+    elif isinstance(obj, BaseModel):
+        digest.update(type(obj).__name__.encode())
+        _fingerprint(digest, obj.model_dump())
+    elif obj is None or isinstance(obj, (str, bytes, int, float, bool)):
+        digest.update(f'{type(obj).__name__}:{obj!r};'.encode())
+    elif isinstance(obj, types.CodeType) or (
+        callable(obj) and hasattr(obj, '__qualname__')
+    ):
+        _fingerprint_code(digest, obj)
+    else:
+        digest.update(pickle.dumps(obj, protocol=5))
+
+
+def _fingerprint_array(digest: Any, obj: Any) -> None:
+    if isinstance(obj, (pd.DataFrame, pd.Series)):
+        digest.update(type(obj).__name__.encode())
+        digest.update(repr(obj.shape).encode())
+        cols = obj.columns if isinstance(obj, pd.DataFrame) else [obj.name]
+        dtypes = obj.dtypes if isinstance(obj, pd.DataFrame) else [obj.dtype]
+        _fingerprint(digest, [str(c) for c in cols])
+        _fingerprint(digest, [str(d) for d in dtypes])
+        try:
+            hashed = pd.util.hash_pandas_object(obj, index=True)
+            digest.update(hashed.to_numpy().tobytes())
+        except TypeError:
+            digest.update(pickle.dumps(obj, protocol=5))
+        return
+    digest.update(f'nd{obj.dtype.str}{obj.shape}'.encode())
+    if obj.dtype.hasobject:
+        _fingerprint(digest, obj.tolist())
+    else:
+        digest.update(np.ascontiguousarray(obj).tobytes())
+
+
+def _fingerprint_code(digest: Any, obj: Any) -> None:
+    if isinstance(obj, types.CodeType):
+        _fingerprint(digest, (obj.co_code, obj.co_names, obj.co_consts))
+        return
+    digest.update(f'fn:{obj.__module__}.{obj.__qualname__};'.encode())
+    code = getattr(obj, '__code__', None)
+    if code is None:
+        return
+    # Closures and lambdas share a qualname; their body, defaults and
+    # captured values are what tell them apart.
+    _fingerprint(digest, code)
+    _fingerprint(digest, obj.__defaults__)
+    _fingerprint(digest, obj.__kwdefaults__)
+    _fingerprint(digest, [_cell(obj, c) for c in obj.__closure__ or ()])
+
+
+def _cell(fn: Any, cell: Any) -> Any:
+    try:
+        value = cell.cell_contents
+    except ValueError:
+        return '<empty cell>'
+    return '<self>' if value is fn else value
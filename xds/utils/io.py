@@ -1,13 +1,83 @@
+import atexit
+import codecs
+import hashlib
 import json
+import marshal
+import os
+import pickle
 import re
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from fnmatch import fnmatch
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import (
+    Any,
+    BinaryIO,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
 from urllib.parse import parse_qs, urlparse
 
 import yaml
-from icecream import ic
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
 
 from xds.utils.logger import log
+from xds.utils.storage import (
+    LOCAL,
+    Buffer,
+    is_local,
+    is_private,
+    join,
+    private_dir,
+    user_dir,
+)
+from xds.utils.storage import resolve as storage_for
+
+PARSE_INCLUDES = ['*.yaml', '*.yml', '*.json']
+PARALLEL_MIN_FILES = 16
+PARSE_CACHE_FILE = os.getenv(
+    'XDS_PARSE_CACHE', str(user_dir(None, 'parse.cache'))
+)
+
+_YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+_YAML_DOC_START = re.compile(r'^---(?:\s|$)', re.MULTILINE)
+_BOMS = ('\ufeff', b'\xef\xbb\xbf')
+_JSONL_SUFFIXES = ('.jsonl', '.ndjson')
+_JSON_SKIP = ' \t\r\n,\ufeff'
+STREAM_CHUNK = 1 << 16
+# Files touched within this window of a stat may still change in the same
+# mtime tick, so they are verified by content hash instead of trusted.
+_RACY_NS = 2_000_000_000
+
+
+class FileSig(NamedTuple):
+    mtime: int
+    size: int
+    digest: str
+
+
+class StreamRecord(NamedTuple):
+    index: int
+    offset: int
+    data: Any
+
+
+class ParsedFile(NamedTuple):
+    file: str
+    data: Any
+    error: Optional[str]
+    sig: Optional[FileSig]
 
 
 def parser(
@@ -26,60 +96,485 @@ def parser(
         return _parse_url(url)
 
     if buffer:
-        return _parse_raw(buffer)
+        return _parse_raw(buffer, mime=kwargs.get('mime'))
 
-    path = Path(path)
-    if not path.exists():
+    path = str(path)
+    storage, spath = storage_for(path)
+    if not storage.exists(spath):
         raise FileNotFoundError(f'FILE/DIR not found: {path}')
 
-    if path.is_file():
-        log.info(f'Reading contents from {path}')
-        mime = 'yaml' if path.suffix == '.yaml' else 'json'
-        return _parse_raw(io_buffer(file=path), mime=mime)
-
-    elif path.is_dir():
-        log.info(f'Processing directory: {path}, Results in contents field')
-        results = {'by': 'dir', 'dir': path.name, 'contents': []}
-        for file in path.iterdir():
-            if file.is_file():
-                f = str(file)
-                res = parser(f)
-                if res:
-                    res['path'] = f
-                    results['contents'].append(res)
-        return results
-
-
-def _parse_raw(buffer: str, mime: str | None = None) -> Dict[str, Any]:
+    if not storage.is_dir(spath):
+        log.info('Reading contents from {}', path)
+        return PARSE_CACHE.parse(path)
+
+    else:
+        return parse_dir(
+            path,
+            include=kwargs.get('include'),
+            exclude=kwargs.get('exclude'),
+            recursive=kwargs.get('recursive', True),
+            workers=kwargs.get('workers'),
+            executor=kwargs.get('executor', 'process'),
+        )
+
+
+def parse_dir(
+    path: str | Path,
+    *,
+    include: Optional[List[str]] = None,
+    exclude: Optional[List[str]] = None,
+    recursive: bool = True,
+    workers: Optional[int] = None,
+    executor: str = 'process',
+) -> Dict[str, Any]:
+    files = dir_files(path, include, exclude, recursive)
+    log.info(
+        f'Processing directory: {path} ({len(files)} files), '
+        'Results in contents field'
+    )
+    if not is_local(path):
+        executor = 'thread'
+    name = str(path).rstrip('/').rsplit('/', 1)[-1]
+    results = {'by': 'dir', 'dir': name, 'contents': [], 'errors': {}}
+    for file, res, err, _ in _parse_files(files, workers, executor):
+        if err:
+            results['errors'][file] = err
+            continue
+        # Multi-document files contribute one entry per document.
+        docs = res if isinstance(res, list) else [res] if res else []
+        if not all(isinstance(doc, dict) for doc in docs):
+            results['errors'][file] = 'Expected mapping documents'
+            continue
+        for doc in docs:
+            doc['path'] = file
+            results['contents'].append(doc)
+    if results['errors']:
+        log.error(
+            f'Failed to parse {len(results["errors"])} file(s) in {path}: '
+            f'{results["errors"]}'
+        )
+    return results
+
+
+def dir_files(
+    path: str | Path,
+    include: Optional[List[str]] = None,
+    exclude: Optional[List[str]] = None,
+    recursive: bool = True,
+) -> List[str]:
+    storage, spath = storage_for(path)
+    include = include or PARSE_INCLUDES
+    exclude = exclude or []
+
+    def matches(rel: str, patterns: List[str]) -> bool:
+        name = rel.rsplit('/', 1)[-1]
+        return any(fnmatch(rel, p) or fnmatch(name, p) for p in patterns)
+
+    return sorted(
+        join(path, rel)
+        for rel in storage.listdir(spath, recursive)
+        if matches(rel, include) and not matches(rel, exclude)
+    )
+
+
+def _parse_files(
+    files: List[str], workers: Optional[int], executor: str
+) -> List[ParsedFile]:
+    parsed: Dict[str, ParsedFile] = {}
+    misses: List[str] = []
+    for file in files:
+        hit, data = PARSE_CACHE.get(file)
+        if hit:
+            parsed[file] = ParsedFile(file, data, None, None)
+        else:
+            misses.append(file)
+
+    for res in _parse_uncached(misses, workers, executor):
+        if not res.error:
+            PARSE_CACHE.put(res.file, res.data, res.sig)
+        parsed[res.file] = res
+    if misses:
+        PARSE_CACHE.save()
+    return [parsed[file] for file in files]
+
+
+def _parse_uncached(
+    files: List[str], workers: Optional[int], executor: str
+) -> Iterator[ParsedFile]:
+    workers = workers or min(len(files), os.cpu_count() or 1)
+    if workers <= 1 or len(files) < PARALLEL_MIN_FILES:
+        return map(_parse_file, files)
+
+    pool_cls = (
+        ProcessPoolExecutor if executor == 'process' else ThreadPoolExecutor
+    )
+    chunksize = max(1, len(files) // (workers * 4))
+    try:
+        with pool_cls(max_workers=workers) as pool:
+            kws = {'chunksize': chunksize} if executor == 'process' else {}
+            return list(pool.map(_parse_file, files, **kws))
+    except (BrokenProcessPool, OSError) as e:
+        log.error(f'Parallel parse failed ({e}), falling back to serial')
+        return map(_parse_file, files)
+
+
+def _parse_file(file: str) -> ParsedFile:
+    try:
+        data, sig = _read_parse(file)
+        return ParsedFile(file, data, None, sig)
+    except Exception as e:
+        return ParsedFile(file, None, f'{type(e).__name__}: {e}', None)
+
+
+def _read_parse(file: str | Path) -> Tuple[Any, Optional[FileSig]]:
+    storage, spath = storage_for(file)
+    stat = storage.stat(spath)
+    buffer = storage.read(spath)
+    sig = None
+    if stat is not None:
+        sig = FileSig(stat.st_mtime_ns, stat.st_size, _digest(buffer))
+    return _parse_raw(buffer, mime=_mime(file)), sig
+
+
+def _digest(buffer: str | Buffer) -> str:
+    if isinstance(buffer, str):
+        buffer = buffer.encode('utf-8')
+    return hashlib.blake2b(buffer, digest_size=16).hexdigest()
+
+
+class ParseCache:
+    VERSION = 2
+
+    def __init__(self, path: Optional[str | Path] = PARSE_CACHE_FILE):
+        self.path = Path(path) if path and path != 'off' else None
+        self._entries: Optional[Dict[str, Tuple[FileSig, bytes]]] = None
+        self._dirty = False
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'rehashed': 0, 'stores': 0}
+
+    @property
+    def entries(self) -> Dict[str, Tuple[FileSig, bytes]]:
+        if self._entries is None:
+            self._entries = self._load()
+        return self._entries
+
+    def parse(self, file: str | Path) -> Any:
+        hit, data = self.get(file)
+        if hit:
+            return data
+        data, sig = _read_parse(file)
+        self.put(file, data, sig)
+        return data
+
+    def get(self, file: str | Path) -> Tuple[bool, Any]:
+        if not is_local(file):
+            return False, None
+        key = _cache_key(file)
+        entry = self.entries.get(key)
+        if entry is None:
+            self._stats['misses'] += 1
+            return False, None
+
+        sig, payload = entry
+        stat = os.stat(key)
+        racy = time.time_ns() - stat.st_mtime_ns < _RACY_NS
+        if (stat.st_mtime_ns, stat.st_size) == sig[:2] and not racy:
+            self._stats['hits'] += 1
+            return True, unpack(payload)
+
+        if stat.st_size == sig.size:
+            with open(key, 'rb') as fp:
+                digest = _digest(fp.read())
+            if digest == sig.digest:
+                sig = sig._replace(mtime=stat.st_mtime_ns)
+                with self._lock:
+                    self.entries[key] = (sig, payload)
+                    self._dirty = True
+                self._stats['rehashed'] += 1
+                return True, unpack(payload)
+
+        self._stats['misses'] += 1
+        return False, None
+
+    def put(self, file: str | Path, data: Any, sig: Optional[FileSig]) -> None:
+        if sig is None:
+            return
+        key = _cache_key(file)
+        with self._lock:
+            self.entries[key] = (sig, pack(data))
+            self._dirty = True
+        self._stats['stores'] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self._stats['hits'] + self._stats['rehashed']
+        total = lookups + self._stats['misses']
+        return {
+            **self._stats,
+            'entries': len(self.entries),
+            'bytes': sum(len(p) for _, p in self.entries.values()),
+            'hit_rate': lookups / total if total else 0.0,
+            'path': str(self.path) if self.path else None,
+        }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries = {}
+            self._dirty = False
+            self._stats = dict.fromkeys(self._stats, 0)
+            if self.path and self.path.exists():
+                self.path.unlink()
+        log.info(f'Parse cache cleared: {self.path}')
+
+    def save(self) -> None:
+        if not self.path or not self._dirty:
+            return
+        with self._lock:
+            if private_dir(self.path.parent) is None:
+                return
+            entries = {
+                k: (tuple(sig), p) for k, (sig, p) in self._entries.items()
+            }
+            try:
+                tmp = self.path.with_suffix(f'.{os.getpid()}.tmp')
+                with open(tmp, 'wb') as fp:
+                    marshal.dump((self.VERSION, entries), fp)
+                os.replace(tmp, self.path)
+                self._dirty = False
+            except OSError as e:
+                log.error(f'Failed to save parse cache {self.path}: {e}')
+
+    def _load(self) -> Dict[str, Tuple[FileSig, bytes]]:
+        # Only a cache this user wrote is trusted: payloads that marshal
+        # cannot hold (e.g. YAML dates) are pickled.
+        if not self.path or not self.path.exists():
+            return {}
+        if not is_private(self.path):
+            log.error(f'Ignoring parse cache {self.path}: not private')
+            return {}
+        try:
+            with open(self.path, 'rb') as fp:
+                version, entries = marshal.load(fp)
+            if version == self.VERSION:
+                return {
+                    k: (FileSig(*sig), p) for k, (sig, p) in entries.items()
+                }
+        except Exception as e:
+            log.error(f'Discarding unreadable parse cache {self.path}: {e}')
+        return {}
+
+
+def _cache_key(file: str | Path) -> str:
+    return str(Path(storage_for(file)[1]).resolve())
+
+
+def pack(data: Any) -> bytes:
+    try:
+        return b'm' + marshal.dumps(data)
+    except ValueError:
+        return b'p' + pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def unpack(payload: Buffer) -> Any:
+    if payload[:1] == b'm':
+        return marshal.loads(payload[1:])
+    return pickle.loads(payload[1:])
+
+
+PARSE_CACHE = ParseCache()
+atexit.register(PARSE_CACHE.save)
+
+
+def _mime(path: str | Path) -> str:
+    return 'yaml' if Path(path).suffix in ('.yaml', '.yml') else 'json'
+
+
+def _parse_raw(buffer: str | Buffer, mime: str | None = None) -> Any:
     if not buffer:
         log.error('No buffer to parse')
         return {}
 
-    def try_parse(parser, content, mime):
+    sniffed = sniff_mime(buffer)
+    mimes = [mime] if mime else [sniffed, *({'json', 'yaml'} - {sniffed})]
+    errors = []
+    for mtype in mimes:
         try:
-            data = parser(content)
-            return data
+            meta = _LOADERS[mtype](buffer)
         except Exception as e:
-            log.error(f'Failed to parse as {mime}: {e}')
-
-    mimes = [mime] if mime else ['yaml', 'json']
-    for mtype in mimes:
-        meta = try_parse(
-            yaml.safe_load if mtype == 'yaml' else json.loads,
-            buffer,
-            mtype,
-        )
+            errors.append(f'{mtype}: {e}')
+            log.debug('Buffer is not {}, trying next: {}', mtype, e)
+            continue
         if meta:
             return meta
-    raise ValueError(f'Failed to parse {buffer[:100]} as {mimes}')
+    log.error(f'Failed to parse buffer as {mimes}: {errors}')
+    raise ValueError(f'Failed to parse {_head(buffer, 100)} as {mimes}')
+
+
+def sniff_mime(buffer: str | Buffer) -> str:
+    head = _head(buffer, 256)
+    for bom in _BOMS:
+        if type(head) is type(bom) and head.startswith(bom):
+            head = head[len(bom) :]
+    head = head.lstrip()
+    first = head[:1]
+    if first in ('{', '[', b'{', b'['):
+        return 'json'
+    return 'yaml'
+
+
+def _head(buffer: str | Buffer, size: int) -> str | bytes:
+    head = buffer[:size]
+    return bytes(head) if isinstance(head, memoryview) else head
+
+
+def _json_load(buffer: str | Buffer) -> Any:
+    if orjson is not None:
+        return orjson.loads(buffer)
+    if isinstance(buffer, memoryview):
+        buffer = bytes(buffer)
+    return json.loads(buffer)
+
+
+def _yaml_load(buffer: str | Buffer) -> Any:
+    text = buffer if isinstance(buffer, str) else str(buffer, 'utf-8')
+    if _YAML_DOC_START.search(text, 1):
+        docs = [
+            doc
+            for doc in yaml.load_all(text, Loader=_YAML_LOADER)
+            if doc is not None
+        ]
+        return docs[0] if len(docs) == 1 else docs
+    return yaml.load(text, Loader=_YAML_LOADER)
+
+
+_LOADERS = {
+    'json': _json_load,
+    'yaml': _yaml_load,
+}
+
+
+def parse_stream(
+    path: str | Path,
+    *,
+    fmt: Optional[str] = None,
+    offset: int = 0,
+    chunk_size: int = STREAM_CHUNK,
+    progress: Optional[Callable[[int, int], None]] = None,
+    progress_every: int = 1000,
+) -> Iterator[StreamRecord]:
+    # StreamRecord.offset is the byte position just past the record; pass
+    # it back as offset= to resume after the last record consumed.
+    path = Path(path)
+    if not path.is_file():
+        raise FileNotFoundError(f'FILE not found: {path}')
+    fmt = fmt or _stream_format(path)
+    if fmt not in _STREAMERS:
+        raise ValueError(f'Unsupported stream format {fmt} for {path}')
+
+    log.info(f'Streaming {fmt} records from {path} at offset {offset}')
+    count = 0
+    with open(path, 'rb') as fp:
+        fp.seek(offset)
+        for end, data in _STREAMERS[fmt](fp, offset, chunk_size):
+            yield StreamRecord(count, end, data)
+            count += 1
+            if progress and count % progress_every == 0:
+                progress(count, end)
+            offset = end
+    if progress:
+        progress(count, offset)
+
+
+def _stream_format(path: Path) -> str:
+    if path.suffix in _JSONL_SUFFIXES:
+        return 'jsonl'
+    if path.suffix in ('.yaml', '.yml'):
+        return 'yaml'
+    with open(path, 'rb') as fp:
+        return sniff_mime(fp.read(256))
+
+
+def _stream_jsonl(
+    fp: BinaryIO, offset: int, chunk_size: int
+) -> Iterator[Tuple[int, Any]]:
+    for line in fp:
+        offset += len(line)
+        if line.strip():
+            yield offset, _json_load(line)
+
+
+def _stream_json(
+    fp: BinaryIO, offset: int, chunk_size: int
+) -> Iterator[Tuple[int, Any]]:
+    # Yields the elements of a top level array, or each value of a stream
+    # of concatenated JSON values, holding at most one value plus a chunk.
+    scan = json.JSONDecoder().raw_decode
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    buf, pos, eof, started = '', 0, False, offset > 0
+    while True:
+        while pos < len(buf) and buf[pos] in _JSON_SKIP:
+            offset += len(buf[pos].encode('utf-8'))
+            pos += 1
+        if pos < len(buf) and buf[pos] in '[]' and not started:
+            started = buf[pos] == '['
+            offset, pos = offset + 1, pos + 1
+            continue
+        if pos < len(buf) and buf[pos] == ']':
+            offset, pos = offset + 1, pos + 1
+            continue
+        if pos < len(buf):
+            started = True
+            try:
+                data, end = scan(buf, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                end = None
+            if end is not None and (end < len(buf) or eof):
+                offset += len(buf[pos:end].encode('utf-8'))
+                pos = end
+                yield offset, data
+                continue
+        if eof:
+            return
+        chunk = fp.read(chunk_size)
+        eof = not chunk
+        buf = buf[pos:] + decoder.decode(chunk, final=eof)
+        pos = 0
+
+
+def _stream_yaml(
+    fp: BinaryIO, offset: int, chunk_size: int
+) -> Iterator[Tuple[int, Any]]:
+    lines: List[bytes] = []
+
+    def flush() -> Iterator[Tuple[int, Any]]:
+        text = b''.join(lines).strip()
+        lines.clear()
+        if text and text != b'...':
+            doc = yaml.load(text, Loader=_YAML_LOADER)
+            if doc is not None:
+                yield offset, doc
+
+    for line in fp:
+        if _YAML_DOC_START.match(line.decode('utf-8', 'replace')):
+            yield from flush()
+        lines.append(line)
+        offset += len(line)
+    yield from flush()
+
+
+_STREAMERS = {
+    'jsonl': _stream_jsonl,
+    'json': _stream_json,
+    'yaml': _stream_yaml,
+}
 
 
 def _parse_url(url: str) -> Dict[str, Any]:
     parsed_url = urlparse(url)
-    ic(parsed_url)
     path = parsed_url.path
     query = parsed_url.query
-    ic(path, query)
+    log.debug('Parsed URL {}: path={} query={}', url, path, query)
     if not path or re.search(r'&', path):
         raise ValueError(f'Invalid URL Path {path} in {url}')
     qs = parse_qs(query)
@@ -95,7 +590,7 @@ def _parse_url(url: str) -> Dict[str, Any]:
         return result
 
     parsed = parse_nested_qs(qs) or {}
-    log.info(f'Parsed URL: {parsed}')
+    log.info('Parsed URL: {}', parsed)
     return parsed
 
 
@@ -122,13 +617,32 @@ def io_path_os(**kwargs: Dict[str, Any]) -> Path:
     raise FileNotFoundError(f'File Not found for {dir}/{file}')
 
 
+def io_bytes(**kwargs: Dict[str, Any]) -> Optional[Buffer]:
+    path = io_path(**kwargs)
+    storage, spath = storage_for(path)
+    try:
+        return storage.read(spath)
+    except Exception as e:
+        log.error(f'Error: An I/O reading the file {path}: {e}')
+    return None
+
+
 def io_buffer_fs(**kwargs: Dict[str, Any]) -> Optional[str]:
-    raise NotImplementedError('Not implemented for FS')
+    data = io_bytes(**kwargs)
+    return None if data is None else str(data, 'utf-8')
 
 
-def io_path_fs(**kwargs: Dict[str, Any]) -> Path:
-    raise NotImplementedError('Not implemented for FS')
+def io_path_fs(**kwargs: Dict[str, Any]) -> Path | str:
+    file: str = str(kwargs.get('file'))
+    dir: str = kwargs.get('dir')
+    for cpath in [file, join(dir, file) if dir else None]:
+        if cpath is None:
+            continue
+        storage, spath = storage_for(cpath)
+        if storage.exists(spath):
+            return Path(cpath) if storage is LOCAL else cpath
+    raise FileNotFoundError(f'File Not found for {dir}/{file}')
 
 
-io_buffer = io_buffer_os
-io_path = io_path_os
+io_buffer = io_buffer_fs
+io_path = io_path_fs
@@ -1,12 +1,10 @@
 import os
 import sys
-from pprint import pp
-from typing import Any, Optional
+from typing import Any, ClassVar
 
 from icecream import ic
 from loguru import logger
 from pydantic import BaseModel
-from pprint import pformat
 
 ic.configureOutput(
     prefix='DEBUG:\n',
@@ -14,10 +12,13 @@ ic.configureOutput(
     #outputFunction=pformat,
 )
 
+
 class AppLogger(BaseModel):
     level: str = 'WARNING'
     format: str = '{time:YYYY-MM-DD HH:mm:ss} | {level:<8} | {message}'
     stream: Any = None
+    enqueue: bool = True
+    levelno: ClassVar[int] = 0
 
     def __init__(self, **kwargs: Any):
         super().__init__(**kwargs)
@@ -27,11 +28,19 @@ class AppLogger(BaseModel):
     def configure_logger(self) -> None:
         logger.remove()
         environment = os.getenv('env', 'development')
+        self.enqueue = os.getenv('XDS_LOG_ENQUEUE', str(self.enqueue)) in (
+            'True',
+            'true',
+            '1',
+        )
         self.set_logging_level(environment)
+        if environment == 'production' or os.getenv('XDS_IC') == 'off':
+            ic.disable()
 
     def set_logging_level(self, environment: str) -> None:
         level = self.level if environment == 'production' else 'DEBUG'
-        level = 'DEBUG'
+        level = os.getenv('XDS_LOG_LEVEL', level).upper()
+        AppLogger.levelno = logger.level(level).no
         self._add_handler(self.stream, level)
 
     def _add_handler(self, stream: Any, level: str) -> None:
@@ -39,25 +48,44 @@ class AppLogger(BaseModel):
             self.stream,
             level=level,
             format=self.format,
+            enqueue=self.enqueue,
         )
 
-    def info(self, message: str) -> None:
-        logger.info(message)
+    def enabled(self, level: str) -> bool:
+        return logger.level(level).no >= self.levelno
+
+    def _log(self, level: str, message: str, args: Any, lazy: bool) -> None:
+        # Arguments are only formatted (and, with lazy=True, only computed
+        # by calling them) when the level passes the threshold.
+        if _LEVELS[level] < self.levelno:
+            return
+        logger.opt(depth=2, lazy=lazy).log(level, message, *args)
+
+    def info(self, message: str, *args: Any, lazy: bool = False) -> None:
+        self._log('INFO', message, args, lazy)
+
+    def debug(self, message: str, *args: Any, lazy: bool = False) -> None:
+        self._log('DEBUG', message, args, lazy)
+
+    def error(self, message: str, *args: Any, lazy: bool = False) -> None:
+        self._log('ERROR', message, args, lazy)
 
-    def debug(self, message: str) -> None:
-        logger.debug(message)
+    def warn(self, message: str, *args: Any, lazy: bool = False) -> None:
+        self._log('WARNING', message, args, lazy)
 
-    def error(self, message: str) -> None:
-        logger.error(message)
+    def trace(self, message: str, *args: Any, lazy: bool = False) -> None:
+        self._log('TRACE', message, args, lazy)
 
-    def warn(self, message: str) -> None:
-        logger.warning(message)
+    def critical(self, message: str, *args: Any, lazy: bool = False) -> None:
+        self._log('CRITICAL', message, args, lazy)
 
-    def trace(self, message: str) -> None:
-        logger.trace(message)
+    def complete(self) -> None:
+        logger.complete()
 
-    def critical(self, message: str) -> None:
-        logger.critical(message)
 
+_LEVELS = {
+    name: logger.level(name).no
+    for name in ('TRACE', 'DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL')
+}
 
 log = AppLogger()
@@ -0,0 +1,244 @@
+import math
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+DEFAULT_BUCKETS = (
+    0.0005,
+    0.001,
+    0.005,
+    0.01,
+    0.05,
+    0.1,
+    0.5,
+    1.0,
+    5.0,
+    10.0,
+)
+
+Labels = Tuple[str, ...]
+
+
+class _Value:
+    __slots__ = ('_lock', 'value')
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.value = 0.0
+
+    def inc(self, amount: float = 1) -> None:
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1) -> None:
+        with self._lock:
+            self.value -= amount
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+    def sample(self) -> float:
+        return self.value
+
+
+class _Buckets:
+    __slots__ = ('_lock', 'bounds', 'count', 'counts', 'sum')
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self._lock = threading.Lock()
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        idx = bisect_left(self.bounds, value)
+        with self._lock:
+            self.counts[idx] += 1
+            self.count += 1
+            self.sum += value
+
+    @contextmanager
+    def time(self) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start)
+
+    def sample(self) -> Dict[str, Any]:
+        with self._lock:
+            counts, total, count = list(self.counts), self.sum, self.count
+        cumulative, buckets = 0, {}
+        for bound, n in zip([*self.bounds, math.inf], counts):
+            cumulative += n
+            buckets[_fmt(bound)] = cumulative
+        return {'count': count, 'sum': total, 'buckets': buckets}
+
+
+class Metric:
+    kind = ''
+
+    def __init__(self, name: str, help: str = '', labelnames: Labels = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Labels, Any] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values: Any) -> Any:
+        key = tuple(str(v) for v in values)
+        child = self._children.get(key)
+        if child is None:
+            if len(key) != len(self.labelnames):
+                raise ValueError(f'{self.name} expects {self.labelnames}')
+            with self._lock:
+                child = self._children.setdefault(key, self._child())
+        return child
+
+    def _child(self) -> Any:
+        return _Value()
+
+    def samples(self) -> Dict[Labels, Any]:
+        return {k: c.sample() for k, c in list(self._children.items())}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._children.clear()
+
+
+class Counter(Metric):
+    kind = 'counter'
+
+    def inc(self, amount: float = 1) -> None:
+        self.labels().inc(amount)
+
+
+class Gauge(Metric):
+    kind = 'gauge'
+
+    def inc(self, amount: float = 1) -> None:
+        self.labels().inc(amount)
+
+    def dec(self, amount: float = 1) -> None:
+        self.labels().dec(amount)
+
+    def set(self, value: float) -> None:
+        self.labels().set(value)
+
+
+class Histogram(Metric):
+    kind = 'histogram'
+
+    def __init__(
+        self,
+        name: str,
+        help: str = '',
+        labelnames: Labels = (),
+        buckets: Tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _child(self) -> Any:
+        return _Buckets(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self.labels().observe(value)
+
+    def time(self) -> Any:
+        return self.labels().time()
+
+
+class Metrics:
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, cls: Any, name: str, *args: Any, **kwargs: Any) -> Any:
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, *args, **kwargs)
+        if not isinstance(metric, cls):
+            raise ValueError(f'{name} is already a {metric.kind}')
+        return metric
+
+    def counter(
+        self, name: str, help: str = '', labelnames: Labels = ()
+    ) -> Counter:
+        return self._get(Counter, name, help, labelnames)
+
+    def gauge(
+        self, name: str, help: str = '', labelnames: Labels = ()
+    ) -> Gauge:
+        return self._get(Gauge, name, help, labelnames)
+
+    def histogram(
+        self,
+        name: str,
+        help: str = '',
+        labelnames: Labels = (),
+        buckets: Tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._get(Histogram, name, help, labelnames, buckets=buckets)
+
+    def get(self, name: str) -> Optional[Metric]:
+        return self._metrics.get(name)
+
+    def snapshot(self) -> Dict[str, Any]:
+        snap = {}
+        for name, metric in sorted(self._metrics.items()):
+            snap[name] = {
+                'type': metric.kind,
+                'help': metric.help,
+                'samples': {
+                    ','.join(_pairs(metric.labelnames, k)): v
+                    for k, v in metric.samples().items()
+                },
+            }
+        return snap
+
+    def prometheus(self) -> str:
+        lines: List[str] = []
+        for name, metric in sorted(self._metrics.items()):
+            lines.append(f'# HELP {name} {metric.help}'.rstrip())
+            lines.append(f'# TYPE {name} {metric.kind}')
+            for key, val in sorted(metric.samples().items()):
+                pairs = _pairs(metric.labelnames, key)
+                if metric.kind != 'histogram':
+                    lines.append(f'{name}{_labels(pairs)} {_fmt(val)}')
+                    continue
+                for bound, count in val['buckets'].items():
+                    le = _labels([*pairs, f'le="{bound}"'])
+                    lines.append(f'{name}_bucket{le} {count}')
+                lines.append(f'{name}_sum{_labels(pairs)} {_fmt(val["sum"])}')
+                lines.append(f'{name}_count{_labels(pairs)} {val["count"]}')
+        return '\n'.join(lines) + '\n'
+
+    def reset(self) -> None:
+        for metric in list(self._metrics.values()):
+            metric.reset()
+
+
+def _pairs(names: Labels, values: Labels) -> List[str]:
+    return [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+
+
+def _labels(pairs: List[str]) -> str:
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _fmt(value: float) -> str:
+    if value == math.inf:
+        return '+Inf'
+    return repr(int(value)) if float(value).is_integer() else repr(value)
+
+
+METRICS = Metrics()
@@ -0,0 +1,270 @@
+import json
+import operator
+import re
+from datetime import date
+from functools import lru_cache
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+)
+
+import pandas as pd
+from pandas.api.types import is_bool_dtype
+
+from xds.utils.helpers import df_pytypes
+
+Mask = Callable[[pd.DataFrame], pd.Series]
+Tree = Tuple[Any, ...]
+
+_COMPARE = {
+    'eq': operator.eq,
+    'ne': operator.ne,
+    'gt': operator.gt,
+    'lt': operator.lt,
+    'ge': operator.ge,
+    'le': operator.le,
+}
+TEXT_PATTERNS = {
+    'has': '{}',
+    'start': '^{}',
+    'end': '{}$',
+}
+_MEMBER = ('in', 'enum', 'range')
+OPS = frozenset([*_COMPARE, *TEXT_PATTERNS, *_MEMBER])
+
+_TOKENS = re.compile(
+    r'`(?P<col>[^`]+)`|"(?P<dq>[^"]*)"|\'(?P<sq>[^\']*)\''
+    r'|(?P<paren>[()])|(?P<word>[^\s()]+)'
+)
+_NUMBER = re.compile(r'-?\d+(\.\d*)?([eE][-+]?\d+)?')
+_COERCE = {
+    'date': date.fromisoformat,
+    'datetime.datetime': pd.Timestamp,
+    'pandas._libs.tslibs.timestamps.Timestamp': pd.Timestamp,
+}
+
+
+class Predicate(NamedTuple):
+    source: str
+    mask: Mask
+    columns: FrozenSet[str]
+    tree: Optional[Tree] = None
+
+    def __call__(self, df: pd.DataFrame) -> pd.Series:
+        missing = self.columns - set(df.columns)
+        if missing:
+            raise ValueError(f'Unknown columns {sorted(missing)} in {self}')
+        mask = self.mask(df)
+        if not isinstance(mask, pd.Series) or not is_bool_dtype(mask):
+            raise ValueError(f'{self} does not evaluate to a boolean mask')
+        return mask.fillna(False).astype(bool)
+
+    def __str__(self) -> str:
+        return f'predicate {self.source!r}'
+
+
+def predicate(expr: str | Dict[str, Any] | Predicate) -> Predicate:
+    if isinstance(expr, Predicate):
+        return expr
+    if isinstance(expr, str):
+        return _compile_text(expr.strip())
+    if isinstance(expr, dict):
+        return _compile_dict(json.dumps(expr, sort_keys=True, default=str))
+    raise ValueError(f'Unsupported predicate {expr!r}')
+
+
+def compile_cache_info() -> Any:
+    return _compile_text.cache_info(), _compile_dict.cache_info()
+
+
+@lru_cache(maxsize=256)
+def _compile_dict(source: str) -> Predicate:
+    return _compiled(source, _from_dict(json.loads(source)))
+
+
+@lru_cache(maxsize=256)
+def _compile_text(source: str) -> Predicate:
+    # Clauses read `<column> <op> <value>` joined by and/or/not and
+    # parentheses; anything else is handed to DataFrame.eval as is.
+    tokens = _tokenize(source)
+    try:
+        tree, pos = _parse_or(tokens, 0)
+        if pos != len(tokens):
+            raise SyntaxError(f'Unexpected {tokens[pos][1]!r}')
+    except SyntaxError:
+        return Predicate(source, _evaluated(source), frozenset())
+    return _compiled(source, tree)
+
+
+def _compiled(source: str, tree: Tree) -> Predicate:
+    return Predicate(source, _build(tree), frozenset(_columns(tree)), tree)
+
+
+def _build(tree: Tree) -> Mask:
+    kind, *args = tree
+    if kind == 'clause':
+        return _clause(*args)
+    if kind == 'not':
+        return _negate(_build(args[0]))
+    return _join(kind, [_build(part) for part in args[0]])
+
+
+def _columns(tree: Tree) -> Set[str]:
+    kind, *args = tree
+    if kind == 'clause':
+        return {args[0]}
+    if kind == 'not':
+        return _columns(args[0])
+    return set().union(*(_columns(part) for part in args[0]))
+
+
+def _from_dict(spec: Dict[str, Any]) -> Tree:
+    if not spec:
+        raise ValueError('Empty predicate')
+    nodes: List[Tree] = []
+    for key, cond in spec.items():
+        if key in ('and', 'or'):
+            nodes.append((key, [_from_dict(part) for part in cond]))
+        elif key == 'not':
+            nodes.append(('not', _from_dict(cond)))
+        else:
+            ops = cond
+            if not isinstance(cond, dict):
+                ops = {'in' if isinstance(cond, list) else 'eq': cond}
+            nodes += [('clause', key, op, val) for op, val in ops.items()]
+    return nodes[0] if len(nodes) == 1 else ('and', nodes)
+
+
+def _clause(column: str, op: str, value: Any) -> Mask:
+    if op not in OPS:
+        raise ValueError(f'Invalid operation {op} for {column}')
+    pair = isinstance(value, list) and len(value) == 2  # noqa: PLR2004
+    if op == 'range' and not pair:
+        raise ValueError(f'Range on {column} requires two values')
+
+    def mask(df: pd.DataFrame) -> pd.Series:
+        series = df[column]
+        val = _coerce(df_pytypes(df).get(column), value)
+        if op in _COMPARE:
+            return _COMPARE[op](series, val)
+        if op == 'range':
+            return series.between(val[0], val[1])
+        if op in TEXT_PATTERNS:
+            text = series if series.dtype == object else series.astype(str)
+            return text.str.contains(TEXT_PATTERNS[op].format(val), na=False)
+        return series.isin(val if isinstance(val, list) else [val])
+
+    return mask
+
+
+def _coerce(pytype: Any, value: Any) -> Any:
+    if isinstance(value, list):
+        return [_coerce(pytype, v) for v in value]
+    if not isinstance(value, str) or pytype not in _COERCE:
+        return value
+    try:
+        return _COERCE[pytype](value)
+    except ValueError:
+        return value
+
+
+def _join(how: str, masks: List[Mask]) -> Mask:
+    if len(masks) == 1:
+        return masks[0]
+    combine = operator.and_ if how == 'and' else operator.or_
+
+    def mask(df: pd.DataFrame) -> pd.Series:
+        result = masks[0](df)
+        for other in masks[1:]:
+            result = combine(result, other(df))
+        return result
+
+    return mask
+
+
+def _negate(inner: Mask) -> Mask:
+    return lambda df: ~inner(df)
+
+
+def _evaluated(source: str) -> Mask:
+    def mask(df: pd.DataFrame) -> pd.Series:
+        try:
+            return df.eval(source)
+        except Exception as e:
+            raise ValueError(f'Cannot evaluate {source!r}: {e}') from e
+
+    return mask
+
+
+def _tokenize(source: str) -> List[Tuple[str, Any]]:
+    tokens = []
+    for match in _TOKENS.finditer(source):
+        kind, text = match.lastgroup, match.group(match.lastgroup)
+        if kind in ('dq', 'sq'):
+            kind = 'str'
+        elif kind == 'paren':
+            kind = text
+        tokens.append((kind, text))
+    return tokens
+
+
+def _parse_or(tokens: List[Tuple[str, Any]], pos: int) -> Tuple[Tree, int]:
+    tree, pos = _parse_and(tokens, pos)
+    trees = [tree]
+    while _keyword(tokens, pos, 'or'):
+        tree, pos = _parse_and(tokens, pos + 1)
+        trees.append(tree)
+    return (trees[0] if len(trees) == 1 else ('or', trees)), pos
+
+
+def _parse_and(tokens: List[Tuple[str, Any]], pos: int) -> Tuple[Tree, int]:
+    tree, pos = _parse_not(tokens, pos)
+    trees = [tree]
+    while _keyword(tokens, pos, 'and'):
+        tree, pos = _parse_not(tokens, pos + 1)
+        trees.append(tree)
+    return (trees[0] if len(trees) == 1 else ('and', trees)), pos
+
+
+def _parse_not(tokens: List[Tuple[str, Any]], pos: int) -> Tuple[Tree, int]:
+    if _keyword(tokens, pos, 'not'):
+        tree, pos = _parse_not(tokens, pos + 1)
+        return ('not', tree), pos
+    if pos < len(tokens) and tokens[pos][0] == '(':
+        tree, pos = _parse_or(tokens, pos + 1)
+        if pos >= len(tokens) or tokens[pos][0] != ')':
+            raise SyntaxError('Unbalanced parentheses')
+        return tree, pos + 1
+    if pos + 3 > len(tokens):
+        raise SyntaxError('Incomplete clause')
+    (ckind, column), (okind, op), (vkind, raw) = tokens[pos : pos + 3]
+    if ckind not in ('col', 'word') or okind != 'word' or op not in OPS:
+        raise SyntaxError(f'Not a clause at {column!r}')
+    if vkind not in ('str', 'word'):
+        raise SyntaxError(f'Missing value for {column} {op}')
+    return ('clause', column, op, _literal(raw, vkind, op)), pos + 3
+
+
+def _keyword(tokens: List[Tuple[str, Any]], pos: int, word: str) -> bool:
+    return pos < len(tokens) and tokens[pos] == ('word', word)
+
+
+def _literal(raw: str, kind: str, op: str) -> Any:
+    if kind == 'str':
+        return raw
+    if op in _MEMBER:
+        return [_literal(part, kind, 'eq') for part in raw.split(',')]
+    if op in TEXT_PATTERNS:
+        return raw
+    if raw in ('true', 'false'):
+        return raw == 'true'
+    if _NUMBER.fullmatch(raw):
+        return float(raw) if set(raw) & set('.eE') else int(raw)
+    return raw
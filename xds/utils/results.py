@@ -0,0 +1,218 @@
+import os
+import pickle
+import sys
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+
+import pandas as pd
+
+from xds.utils.logger import log
+from xds.utils.metrics import METRICS
+from xds.utils.storage import private_dir, user_dir
+
+RESULT_CACHE_DIR = os.getenv('XDS_RESULT_CACHE')
+MEMORY_BYTES = 256 << 20
+DISK_BYTES = 1 << 30
+SUFFIX = '.xres'
+
+LOOKUPS = METRICS.counter(
+    'xds_result_cache_total', 'XCallable result cache lookups', ('tier',)
+)
+
+
+class _Entry(NamedTuple):
+    value: Any
+    size: int
+    expires: Optional[float]
+
+
+class ResultCache:
+    # Two tiers: an in-memory LRU bounded by estimated bytes, and a pickle
+    # directory bounded by file bytes (LRU by mtime, touched on every hit).
+    def __init__(
+        self,
+        directory: Optional[str | Path] = RESULT_CACHE_DIR,
+        memory_bytes: int = MEMORY_BYTES,
+        disk_bytes: int = DISK_BYTES,
+        ttl: Optional[float] = None,
+    ):
+        self.pinned = directory is not None
+        self.directory = _dir(directory)
+        self._verified: Optional[Path] = None
+        self.memory_bytes = memory_bytes
+        self.disk_bytes = disk_bytes
+        self.ttl = ttl
+        self._memory: OrderedDict[str, _Entry] = OrderedDict()
+        self._resident = 0
+        self._lock = threading.RLock()
+        self._stats = dict.fromkeys(
+            ('memory', 'disk', 'miss', 'expired', 'evicted'), 0
+        )
+
+    def attach(self, tmp: str | Path) -> None:
+        if not self.pinned:
+            self.directory = user_dir(tmp, 'results')
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry and _live(entry, now):
+                self._memory.move_to_end(key)
+                return self._hit('memory', entry.value)
+            self._drop(key)
+        expired = entry is not None
+        entry = self._load(key)
+        if entry and not _live(entry, now):
+            self._path(key).unlink(missing_ok=True)
+            entry, expired = None, True
+        if expired:
+            with self._lock:
+                self._stats['expired'] += 1
+        if entry is None:
+            return self._hit('miss', None)
+        with self._lock:
+            self._remember(key, entry)
+        return self._hit('disk', entry.value)
+
+    def put(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        ttl = self.ttl if ttl is None else ttl
+        expires = time.time() + ttl if ttl else None
+        blob = None
+        if self.directory:
+            blob = pickle.dumps(
+                (expires, value), protocol=pickle.HIGHEST_PROTOCOL
+            )
+        entry = _Entry(value, _sizeof(value, blob), expires)
+        with self._lock:
+            self._remember(key, entry)
+        if blob is not None:
+            self._store(key, blob)
+
+    def invalidate(self, key: str) -> None:
+        with self._lock:
+            self._drop(key)
+        if self.directory:
+            self._path(key).unlink(missing_ok=True)
+
+    def clear(self, disk: bool = True) -> None:
+        with self._lock:
+            self._memory.clear()
+            self._resident = 0
+            for stat in self._stats:
+                self._stats[stat] = 0
+        if disk and self.directory and self.directory.exists():
+            for file in self.directory.glob(f'*{SUFFIX}'):
+                file.unlink(missing_ok=True)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats.update(entries=len(self._memory), bytes=self._resident)
+        hits = stats['memory'] + stats['disk']
+        lookups = hits + stats['miss']
+        stats['hit_rate'] = hits / lookups if lookups else 0.0
+        return stats
+
+    def _hit(self, tier: str, value: Any) -> Tuple[bool, Any]:
+        with self._lock:
+            self._stats[tier] += 1
+        LOOKUPS.labels(tier).inc()
+        return tier != 'miss', value
+
+    def _remember(self, key: str, entry: _Entry) -> None:
+        self._drop(key)
+        if entry.size > self.memory_bytes:
+            return
+        self._memory[key] = entry
+        self._resident += entry.size
+        while self._resident > self.memory_bytes:
+            self._drop(next(iter(self._memory)))
+            self._stats['evicted'] += 1
+
+    def _drop(self, key: str) -> None:
+        entry = self._memory.pop(key, None)
+        if entry:
+            self._resident -= entry.size
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f'{key}{SUFFIX}'
+
+    def _private(self) -> bool:
+        # Cached results are unpickled, so the directory must be one only
+        # this user can write; otherwise the disk tier is switched off.
+        if self.directory and self._verified != self.directory:
+            self.directory = private_dir(self.directory)
+            self._verified = self.directory
+        return self.directory is not None
+
+    def _load(self, key: str) -> Optional[_Entry]:
+        if not self._private():
+            return None
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as fp:
+                blob = fp.read()
+            os.utime(path)
+            expires, value = pickle.loads(blob)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            log.error('Discarding unreadable cached result {}: {}', path, e)
+            path.unlink(missing_ok=True)
+            return None
+        return _Entry(value, _sizeof(value, blob), expires)
+
+    def _store(self, key: str, blob: bytes) -> None:
+        if not self._private():
+            return
+        path = self._path(key)
+        try:
+            tmp = path.with_suffix(f'.{os.getpid()}.tmp')
+            with open(tmp, 'wb') as fp:
+                fp.write(blob)
+            os.replace(tmp, path)
+            self._evict_disk()
+        except OSError as e:
+            log.error('Failed to store cached result {}: {}', path, e)
+
+    def _evict_disk(self) -> None:
+        files = []
+        for file in self.directory.glob(f'*{SUFFIX}'):
+            try:
+                st = file.stat()
+            except FileNotFoundError:
+                continue
+            files.append((st.st_mtime, st.st_size, file))
+        total = sum(size for _, size, _ in files)
+        for _, size, file in sorted(files, key=lambda f: f[0]):
+            if total <= self.disk_bytes:
+                break
+            file.unlink(missing_ok=True)
+            total -= size
+            with self._lock:
+                self._stats['evicted'] += 1
+
+
+def _dir(directory: Optional[str | Path]) -> Optional[Path]:
+    return Path(directory) if directory and directory != 'off' else None
+
+
+def _live(entry: _Entry, now: float) -> bool:
+    return entry.expires is None or entry.expires > now
+
+
+def _sizeof(value: Any, blob: Optional[bytes]) -> int:
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(deep=True))
+    if blob is not None:
+        return len(blob)
+    return sys.getsizeof(value)
+
+
+RESULTS = ResultCache()
@@ -0,0 +1,295 @@
+import mmap
+import os
+import stat
+import tarfile
+import tempfile
+import threading
+import zipfile
+from functools import lru_cache
+from pathlib import Path, PurePosixPath
+from typing import Any, Dict, List, Optional, Tuple
+
+from xds.utils.logger import log
+
+MMAP_MIN_BYTES = 1 << 16
+ARCHIVE_SEP = '!'
+USER_DIR = f'xds-{os.getuid()}' if hasattr(os, 'getuid') else 'xds'
+_OPEN_WRITE = stat.S_IWGRP | stat.S_IWOTH
+
+Buffer = bytes | memoryview
+
+
+class Storage:
+    scheme: str = ''
+
+    def exists(self, path: str) -> bool:
+        raise NotImplementedError
+
+    def is_dir(self, path: str) -> bool:
+        raise NotImplementedError
+
+    def read(self, path: str) -> Buffer:
+        raise NotImplementedError
+
+    def listdir(self, path: str, recursive: bool = True) -> List[str]:
+        raise NotImplementedError
+
+    def stat(self, path: str) -> Optional[os.stat_result]:
+        return None
+
+
+class LocalStorage(Storage):
+    scheme = 'file'
+
+    def exists(self, path: str) -> bool:
+        return Path(path).exists()
+
+    def is_dir(self, path: str) -> bool:
+        return Path(path).is_dir()
+
+    def read(self, path: str) -> Buffer:
+        with open(path, 'rb') as fp:
+            size = os.fstat(fp.fileno()).st_size
+            if size < MMAP_MIN_BYTES:
+                return fp.read()
+            return memoryview(
+                mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+            )
+
+    def listdir(self, path: str, recursive: bool = True) -> List[str]:
+        root = Path(path)
+        walk = root.rglob('*') if recursive else root.iterdir()
+        return [f.relative_to(root).as_posix() for f in walk if f.is_file()]
+
+    def stat(self, path: str) -> Optional[os.stat_result]:
+        return os.stat(path)
+
+
+class _TreeStorage(Storage):
+    # Shared lookups for backends holding a flat {posix path: entry} index.
+    def _index(self) -> Dict[str, Any]:
+        raise NotImplementedError
+
+    def exists(self, path: str) -> bool:
+        return self.is_dir(path) or _norm(path) in self._index()
+
+    def is_dir(self, path: str) -> bool:
+        prefix = _dir_prefix(path)
+        return any(p.startswith(prefix) for p in self._index())
+
+    def listdir(self, path: str, recursive: bool = True) -> List[str]:
+        prefix = _dir_prefix(path)
+        rels = [p[len(prefix) :] for p in self._index() if p.startswith(prefix)]
+        return [r for r in rels if recursive or '/' not in r]
+
+
+class MemoryStorage(_TreeStorage):
+    scheme = 'memory'
+
+    def __init__(self, files: Optional[Dict[str, str | bytes]] = None):
+        self._files: Dict[str, bytes] = {}
+        self._lock = threading.Lock()
+        for path, data in (files or {}).items():
+            self.put(path, data)
+
+    def put(self, path: str, data: str | bytes) -> None:
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        with self._lock:
+            self._files[_norm(path)] = bytes(data)
+
+    def remove(self, path: str) -> None:
+        with self._lock:
+            self._files.pop(_norm(path), None)
+
+    def read(self, path: str) -> Buffer:
+        try:
+            return memoryview(self._files[_norm(path)])
+        except KeyError:
+            raise FileNotFoundError(f'memory://{path} not found') from None
+
+    def _index(self) -> Dict[str, Any]:
+        return self._files
+
+
+class ArchiveStorage(_TreeStorage):
+    # Read-only view over a zip or tar archive. Members of uncompressed tar
+    # archives are served as slices of a single mmap of the archive.
+    def __init__(self, archive: str | Path):
+        self.archive = Path(archive)
+        self._lock = threading.Lock()
+        self._mmap: Optional[mmap.mmap] = None
+        self._members: Dict[str, Any] = {}
+        if zipfile.is_zipfile(self.archive):
+            self.scheme = 'zip'
+            self._zip = zipfile.ZipFile(self.archive)
+            self._members = {
+                _norm(i.filename): i
+                for i in self._zip.infolist()
+                if not i.is_dir()
+            }
+        elif tarfile.is_tarfile(self.archive):
+            self.scheme = 'tar'
+            self._tar = tarfile.open(self.archive)
+            self._members = {
+                _norm(i.name): i for i in self._tar.getmembers() if i.isfile()
+            }
+            if _uncompressed_tar(self.archive):
+                with open(self.archive, 'rb') as fp:
+                    self._mmap = mmap.mmap(
+                        fp.fileno(), 0, access=mmap.ACCESS_READ
+                    )
+        else:
+            raise ValueError(f'Unsupported archive {self.archive}')
+        log.info(f'Opened {self.scheme} archive {self.archive}')
+
+    def read(self, path: str) -> Buffer:
+        member = self._members.get(_norm(path))
+        if member is None:
+            raise FileNotFoundError(f'{path} not found in {self.archive}')
+        if self._mmap is not None:
+            start = member.offset_data
+            return memoryview(self._mmap)[start : start + member.size]
+        with self._lock:
+            if self.scheme == 'zip':
+                return self._zip.read(member)
+            return self._tar.extractfile(member).read()
+
+    def _index(self) -> Dict[str, Any]:
+        return self._members
+
+
+class OverlayStorage(Storage):
+    # Layers are ordered base first; later layers override earlier ones.
+    def __init__(self, layers: List[str]):
+        self.layers = list(layers)
+
+    def _find(self, path: str) -> Optional[Tuple[Storage, str]]:
+        for layer in reversed(self.layers):
+            storage, spath = resolve(_join(layer, path))
+            if storage.exists(spath):
+                return storage, spath
+        return None
+
+    def exists(self, path: str) -> bool:
+        return self._find(path) is not None
+
+    def is_dir(self, path: str) -> bool:
+        found = self._find(path)
+        return bool(found) and found[0].is_dir(found[1])
+
+    def read(self, path: str) -> Buffer:
+        found = self._find(path)
+        if not found:
+            raise FileNotFoundError(f'{path} not found in {self.layers}')
+        return found[0].read(found[1])
+
+    def listdir(self, path: str, recursive: bool = True) -> List[str]:
+        rels: Dict[str, None] = {}
+        for layer in self.layers:
+            storage, spath = resolve(_join(layer, path))
+            if storage.exists(spath) and storage.is_dir(spath):
+                rels.update(dict.fromkeys(storage.listdir(spath, recursive)))
+        return list(rels)
+
+
+LOCAL = LocalStorage()
+STORAGES: Dict[str, Storage] = {
+    'file': LOCAL,
+    'memory': MemoryStorage(),
+}
+
+
+def register_storage(scheme: str, storage: Storage) -> Storage:
+    STORAGES[scheme] = storage
+    log.info(f'Storage registered for {scheme}://')
+    return storage
+
+
+def resolve(uri: str | Path) -> Tuple[Storage, str]:
+    uri = str(uri)
+    if '://' not in uri:
+        return LOCAL, uri
+    scheme, path = uri.split('://', 1)
+    if scheme in ('zip', 'tar'):
+        archive, _, inner = path.partition(ARCHIVE_SEP)
+        return _archive(str(Path(archive).resolve())), _norm(inner)
+    storage = STORAGES.get(scheme)
+    if storage is None:
+        raise ValueError(f'No storage registered for {scheme}:// in {uri}')
+    return storage, path
+
+
+def is_local(uri: str | Path) -> bool:
+    return resolve(uri)[0] is LOCAL
+
+
+def user_dir(tmp: Optional[str | Path] = None, *parts: str) -> Path:
+    return Path(tmp or tempfile.gettempdir(), USER_DIR, *parts)
+
+
+def is_private(path: str | Path) -> bool:
+    # Owned by this user (or root), not a symlink, writable by nobody else.
+    # Caches read back with pickle/marshal must pass this before loading.
+    try:
+        st = os.lstat(path)
+    except OSError:
+        return False
+    if stat.S_ISLNK(st.st_mode) or not _trusted_owner(st.st_uid):
+        return False
+    return not st.st_mode & _OPEN_WRITE
+
+
+def private_dir(path: str | Path) -> Optional[Path]:
+    # Creates path 0700 and returns it only if neither it nor any parent up
+    # to a sticky directory (e.g. /tmp) could be swapped out by another user.
+    path = Path(path).absolute()
+    try:
+        path.mkdir(mode=0o700, parents=True, exist_ok=True)
+        if not is_private(path) or not stat.S_ISDIR(os.lstat(path).st_mode):
+            raise PermissionError(f'{path} is not a private directory')
+        for parent in path.parents:
+            st = os.stat(parent)
+            if st.st_mode & stat.S_ISVTX:
+                break
+            if not _trusted_owner(st.st_uid) or st.st_mode & _OPEN_WRITE:
+                raise PermissionError(f'{parent} is writable by other users')
+    except OSError as e:
+        log.error(f'Not caching under {path}: {e}')
+        return None
+    return path
+
+
+def join(base: str | Path, rel: str) -> str:
+    return _join(str(base), rel)
+
+
+@lru_cache(maxsize=32)
+def _archive(archive: str) -> ArchiveStorage:
+    return ArchiveStorage(archive)
+
+
+def _uncompressed_tar(archive: Path) -> bool:
+    with open(archive, 'rb') as fp:
+        magic = fp.read(6)
+    return not magic.startswith((b'\x1f\x8b', b'BZh', b'\xfd7zXZ'))
+
+
+def _norm(path: str) -> str:
+    return str(PurePosixPath('/', path or '/'))[1:]
+
+
+def _dir_prefix(path: str) -> str:
+    norm = _norm(path)
+    return f'{norm}/' if norm else ''
+
+
+def _join(base: str, rel: str) -> str:
+    if not rel:
+        return base
+    sep = '' if base.endswith(('/', ARCHIVE_SEP)) else '/'
+    return f'{base}{sep}{rel.lstrip("/")}'
+
+
+def _trusted_owner(uid: int) -> bool:
+    return not hasattr(os, 'getuid') or uid in (0, os.getuid())
@@ -0,0 +1,297 @@
+import atexit
+import json
+import os
+import random
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+from functools import wraps
+from pathlib import Path
+from types import TracebackType
+from typing import Any, Callable, Dict, List, Optional, Self
+
+from xds.utils.logger import log
+
+SERVICE = 'xds'
+RING_SIZE = int(os.getenv('XDS_TRACE_RING', '0'))
+TRACE_FILE = os.getenv('XDS_TRACE_FILE')
+TRACE_SAMPLE = float(os.getenv('XDS_TRACE_SAMPLE', '1.0'))
+FLUSH_EVERY = 256
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        etype: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        return None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def set_attributes(self, **attributes: Any) -> None:
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+_CURRENT: ContextVar[Any] = ContextVar('xds_span', default=None)
+
+
+class Span:
+    __slots__ = (
+        '_token',
+        '_tracer',
+        'attributes',
+        'end_ns',
+        'error',
+        'name',
+        'parent_id',
+        'span_id',
+        'start_ns',
+        'trace_id',
+    )
+
+    def __init__(
+        self,
+        tracer: 'Tracer',
+        name: str,
+        parent: Optional['Span'],
+        attributes: Dict[str, Any],
+    ):
+        self.name = name
+        self.trace_id = parent.trace_id if parent else _hexid(16)
+        self.span_id = _hexid(8)
+        self.parent_id = parent.span_id if parent else None
+        self.attributes = attributes
+        self.error: Optional[str] = None
+        self.start_ns = 0
+        self.end_ns = 0
+        self._tracer = tracer
+        self._token = None
+
+    def __enter__(self) -> Self:
+        self.start_ns = time.time_ns()
+        self._token = _CURRENT.set(self)
+        return self
+
+    def __exit__(
+        self,
+        etype: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.end_ns = time.time_ns()
+        if exc is not None:
+            self.error = f'{etype.__name__}: {exc}'
+        _CURRENT.reset(self._token)
+        self._tracer.export(self)
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def set_attributes(self, **attributes: Any) -> None:
+        self.attributes.update(attributes)
+
+    @property
+    def duration_ms(self) -> float:
+        return (self.end_ns - self.start_ns) / 1e6
+
+    def to_otel(self) -> Dict[str, Any]:
+        span = {
+            'traceId': self.trace_id,
+            'spanId': self.span_id,
+            'name': self.name,
+            'kind': 1,
+            'startTimeUnixNano': str(self.start_ns),
+            'endTimeUnixNano': str(self.end_ns),
+            'attributes': [
+                {'key': k, 'value': _otel_value(v)}
+                for k, v in self.attributes.items()
+            ],
+            'status': {'code': 2, 'message': self.error}
+            if self.error
+            else {'code': 1},
+        }
+        if self.parent_id:
+            span['parentSpanId'] = self.parent_id
+        return span
+
+
+class RingExporter:
+    def __init__(self, size: int = 1024):
+        self.spans: deque = deque(maxlen=size)
+
+    def export(self, span: Span) -> None:
+        self.spans.append(span)
+
+    def flush(self) -> None:
+        pass
+
+
+class FileExporter:
+    # Appends OTLP/JSON ExportTraceServiceRequest documents, one per line.
+    def __init__(self, path: str | Path, flush_every: int = FLUSH_EVERY):
+        self.path = Path(path)
+        self.flush_every = flush_every
+        self._pending: List[Span] = []
+        self._lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        with self._lock:
+            self._pending.append(span)
+            full = len(self._pending) >= self.flush_every
+        if full:
+            self.flush()
+
+    def flush(self) -> None:
+        with self._lock:
+            spans, self._pending = self._pending, []
+        if not spans:
+            return
+        doc = {
+            'resourceSpans': [
+                {
+                    'resource': {
+                        'attributes': [
+                            {
+                                'key': 'service.name',
+                                'value': {'stringValue': SERVICE},
+                            }
+                        ]
+                    },
+                    'scopeSpans': [
+                        {
+                            'scope': {'name': 'xds.utils.tracing'},
+                            'spans': [s.to_otel() for s in spans],
+                        }
+                    ],
+                }
+            ]
+        }
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, 'a', encoding='utf-8') as fp:
+                fp.write(json.dumps(doc, default=str) + '\n')
+        except OSError as e:
+            log.error(
+                f'Failed to export {len(spans)} spans to {self.path}: {e}'
+            )
+
+
+class Tracer:
+    def __init__(
+        self, exporters: Optional[List[Any]] = None, sample: float = 1.0
+    ):
+        self.exporters: List[Any] = list(exporters or [])
+        self.sample = sample
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.exporters)
+
+    def configure(
+        self,
+        ring: int = 0,
+        file: Optional[str | Path] = None,
+        sample: float = 1.0,
+    ) -> 'Tracer':
+        self.flush()
+        exporters: List[Any] = []
+        if ring:
+            exporters.append(RingExporter(ring))
+        if file:
+            exporters.append(FileExporter(file))
+        self.exporters, self.sample = exporters, sample
+        if exporters:
+            log.info(
+                f'Tracing to {[type(e).__name__ for e in exporters]}, '
+                f'sample={sample}'
+            )
+        return self
+
+    def span(self, name: str, **attributes: Any) -> Any:
+        if not self.exporters:
+            return NOOP_SPAN
+        parent = _CURRENT.get()
+        if parent is NOOP_SPAN:
+            return NOOP_SPAN
+        if parent is None and random.random() >= self.sample:
+            return _Unsampled()
+        return Span(self, name, parent, attributes)
+
+    def current(self) -> Any:
+        return _CURRENT.get() or NOOP_SPAN
+
+    @property
+    def ring(self) -> List[Span]:
+        rings = [e for e in self.exporters if isinstance(e, RingExporter)]
+        return list(rings[0].spans) if rings else []
+
+    def export(self, span: Span) -> None:
+        for exporter in self.exporters:
+            exporter.export(span)
+
+    def flush(self) -> None:
+        for exporter in self.exporters:
+            exporter.flush()
+
+
+class _Unsampled(_NoopSpan):
+    # Marks the whole trace as dropped so descendants stay no-ops.
+    __slots__ = ('_token',)
+
+    def __enter__(self) -> _NoopSpan:
+        self._token = _CURRENT.set(NOOP_SPAN)
+        return NOOP_SPAN
+
+    def __exit__(
+        self,
+        etype: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        _CURRENT.reset(self._token)
+
+
+def traced(name: Optional[str] = None) -> Callable:
+    def decorator(fn: Callable) -> Callable:
+        sname = name or fn.__qualname__
+
+        @wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with TRACER.span(sname):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def current_span() -> Any:
+    return TRACER.current()
+
+
+def _hexid(nbytes: int) -> str:
+    return f'{random.getrandbits(nbytes * 8):0{nbytes * 2}x}'
+
+
+def _otel_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {'boolValue': value}
+    if isinstance(value, int):
+        return {'intValue': str(value)}
+    if isinstance(value, float):
+        return {'doubleValue': value}
+    return {'stringValue': str(value)}
+
+
+TRACER = Tracer().configure(RING_SIZE, TRACE_FILE, TRACE_SAMPLE)
+atexit.register(TRACER.flush)